@@ -0,0 +1,267 @@
+/**
+ * @module scripts/benchDecodeGlb
+ *
+ * Decode-time half of the GLB compression benchmark (bench_compression.py).
+ * Times what the browser has to do before a model's first frame, per GLB:
+ *
+ *   - Draco primitives (KHR_draco_mesh_compression) with the same wasm
+ *     decoder the game ships in public/wasm/draco (repo root), down to
+ *     index and float attribute arrays
+ *   - meshopt buffer views (EXT_meshopt_compression) with meshopt_decoder
+ *   - embedded images, decoded to raw pixels with sharp
+ *
+ * Each file is decoded --repeat times and the median kept; decoder
+ * start-up (wasm compile) is reported once, separately. A decoder passed
+ * on the command line must exist; one that isn't passed leaves its times
+ * null.
+ *
+ * Usage (normally launched by bench_compression.py):
+ *   tsx scripts/benchDecodeGlb.ts --draco ../public/wasm/draco \
+ *     --meshopt path/to/meshopt_decoder.mjs --repeat 5 a.glb b.glb
+ *
+ * Prints one JSON object: { init: {...}, files: { [path]: {...} } }.
+ */
+
+import { existsSync, readFileSync } from 'node:fs';
+import { createRequire } from 'node:module';
+import * as path from 'node:path';
+import { pathToFileURL } from 'node:url';
+
+const require = createRequire(import.meta.url);
+
+const GLB_MAGIC = 0x46546c67;
+const CHUNK_JSON = 0x4e4f534a;
+const CHUNK_BIN = 0x004e4942;
+
+// Draco attribute data types (draco::DataType)
+const DT_FLOAT32 = 9;
+
+interface Options {
+  dracoDir: string | null;
+  meshoptDecoder: string | null;
+  repeat: number;
+  files: string[];
+}
+
+// biome-ignore lint/suspicious/noExplicitAny: glTF JSON and emscripten modules are untyped
+type Json = any;
+
+interface FileTimes {
+  bytes: number;
+  draco_primitives: number;
+  meshopt_views: number;
+  images: number;
+  draco_ms: number | null;
+  meshopt_ms: number | null;
+  image_ms: number | null;
+}
+
+function parseArgs(): Options {
+  const args = process.argv.slice(2);
+  const options: Options = { dracoDir: null, meshoptDecoder: null, repeat: 3, files: [] };
+  for (let i = 0; i < args.length; i++) {
+    if (args[i] === '--draco' && args[i + 1]) {
+      options.dracoDir = args[++i]!;
+    } else if (args[i] === '--meshopt' && args[i + 1]) {
+      options.meshoptDecoder = args[++i]!;
+    } else if (args[i] === '--repeat' && args[i + 1]) {
+      options.repeat = Math.max(1, Number.parseInt(args[++i]!, 10));
+    } else {
+      options.files.push(args[i]!);
+    }
+  }
+  return options;
+}
+
+function readGlb(file: string): { gltf: Json; bin: Uint8Array } {
+  const data = readFileSync(file);
+  const view = new DataView(data.buffer, data.byteOffset, data.byteLength);
+  if (view.getUint32(0, true) !== GLB_MAGIC) throw new Error(`${file}: not a GLB`);
+  let gltf: Json = null;
+  let bin = new Uint8Array(0);
+  let offset = 12;
+  while (offset < view.getUint32(8, true)) {
+    const length = view.getUint32(offset, true);
+    const type = view.getUint32(offset + 4, true);
+    const chunk = new Uint8Array(data.buffer, data.byteOffset + offset + 8, length);
+    if (type === CHUNK_JSON) gltf = JSON.parse(new TextDecoder().decode(chunk));
+    else if (type === CHUNK_BIN) bin = chunk;
+    offset += 8 + length;
+  }
+  return { gltf, bin };
+}
+
+function viewBytes(gltf: Json, bin: Uint8Array, index: number): Uint8Array {
+  const view = gltf.bufferViews[index];
+  return bin.subarray(view.byteOffset ?? 0, (view.byteOffset ?? 0) + view.byteLength);
+}
+
+function median(values: number[]): number {
+  const sorted = [...values].sort((a, b) => a - b);
+  return sorted[Math.floor(sorted.length / 2)]!;
+}
+
+async function timed(fn: () => Promise<void> | void): Promise<number> {
+  const start = performance.now();
+  await fn();
+  return performance.now() - start;
+}
+
+// ── Decoders ────────────────────────────────────────────────────────────────
+
+function requireFile(file: string): string {
+  if (!existsSync(file)) throw new Error(`Decoder not found: ${path.resolve(file)}`);
+  return file;
+}
+
+async function loadDraco(dir: string | null): Promise<Json> {
+  if (!dir) return null;
+  const wrapper = requireFile(path.join(dir, 'draco_wasm_wrapper.js'));
+  const wasm = requireFile(path.join(dir, 'draco_decoder.wasm'));
+  const factory = require(path.resolve(wrapper));
+  return new Promise((resolve) => {
+    factory({ wasmBinary: readFileSync(wasm) }).then((module: Json) => {
+      // Older Emscripten builds make the module itself a thenable; drop it
+      delete module.then;
+      resolve(module);
+    });
+  });
+}
+
+function decodeDraco(draco: Json, data: Uint8Array, attributes: Record<string, number>) {
+  const decoder = new draco.Decoder();
+  const buffer = new draco.DecoderBuffer();
+  const mesh = new draco.Mesh();
+  try {
+    buffer.Init(new Int8Array(data.buffer, data.byteOffset, data.byteLength), data.byteLength);
+    const status = decoder.DecodeBufferToMesh(buffer, mesh);
+    if (!status.ok()) throw new Error(`Draco: ${status.error_msg()}`);
+
+    const indexBytes = mesh.num_faces() * 3 * 4;
+    const indexPtr = draco._malloc(indexBytes);
+    decoder.GetTrianglesUInt32Array(mesh, indexBytes, indexPtr);
+    draco._free(indexPtr);
+
+    for (const uniqueId of Object.values(attributes)) {
+      const attribute = decoder.GetAttributeByUniqueId(mesh, uniqueId);
+      const bytes = mesh.num_points() * attribute.num_components() * 4;
+      const ptr = draco._malloc(bytes);
+      decoder.GetAttributeDataArrayForAllPoints(mesh, attribute, DT_FLOAT32, bytes, ptr);
+      draco._free(ptr);
+    }
+  } finally {
+    draco.destroy(mesh);
+    draco.destroy(buffer);
+    draco.destroy(decoder);
+  }
+}
+
+async function loadMeshopt(file: string | null): Promise<Json> {
+  if (!file) return null;
+  const { MeshoptDecoder } = await import(pathToFileURL(path.resolve(requireFile(file))).href);
+  await MeshoptDecoder.ready;
+  return MeshoptDecoder;
+}
+
+async function loadSharp(): Promise<Json> {
+  try {
+    return (await import('sharp')).default;
+  } catch {
+    return null;
+  }
+}
+
+// ── Benchmark ───────────────────────────────────────────────────────────────
+
+async function benchFile(
+  file: string,
+  repeat: number,
+  draco: Json,
+  meshopt: Json,
+  sharp: Json,
+): Promise<FileTimes> {
+  const { gltf, bin } = readGlb(file);
+
+  const dracoPrims: [Uint8Array, Record<string, number>][] = [];
+  for (const mesh of gltf.meshes ?? []) {
+    for (const prim of mesh.primitives) {
+      const ext = prim.extensions?.KHR_draco_mesh_compression;
+      if (ext) dracoPrims.push([viewBytes(gltf, bin, ext.bufferView), ext.attributes]);
+    }
+  }
+  const meshoptViews = (gltf.bufferViews ?? [])
+    .map((view: Json) => view.extensions?.EXT_meshopt_compression)
+    .filter(Boolean);
+  const images = (gltf.images ?? [])
+    .filter((image: Json) => image.bufferView !== undefined)
+    .map((image: Json) => viewBytes(gltf, bin, image.bufferView));
+
+  const runs = { draco: [] as number[], meshopt: [] as number[], image: [] as number[] };
+  for (let r = 0; r < repeat; r++) {
+    if (draco) {
+      runs.draco.push(
+        await timed(() => {
+          for (const [data, attributes] of dracoPrims) decodeDraco(draco, data, attributes);
+        }),
+      );
+    }
+    if (meshopt) {
+      runs.meshopt.push(
+        await timed(() => {
+          for (const ext of meshoptViews) {
+            // gltfpack stores the compressed stream in the GLB's own buffer
+            const source = bin.subarray(ext.byteOffset ?? 0, (ext.byteOffset ?? 0) + ext.byteLength);
+            const target = new Uint8Array(ext.count * ext.byteStride);
+            meshopt.decodeGltfBuffer(target, ext.count, ext.byteStride, source, ext.mode, ext.filter);
+          }
+        }),
+      );
+    }
+    if (sharp) {
+      runs.image.push(
+        await timed(async () => {
+          for (const data of images) await sharp(data).raw().toBuffer();
+        }),
+      );
+    }
+  }
+
+  return {
+    bytes: readFileSync(file).byteLength,
+    draco_primitives: dracoPrims.length,
+    meshopt_views: meshoptViews.length,
+    images: images.length,
+    draco_ms: dracoPrims.length === 0 ? 0 : draco ? median(runs.draco) : null,
+    meshopt_ms: meshoptViews.length === 0 ? 0 : meshopt ? median(runs.meshopt) : null,
+    image_ms: images.length === 0 ? 0 : sharp ? median(runs.image) : null,
+  };
+}
+
+async function main() {
+  const options = parseArgs();
+
+  let draco: Json = null;
+  let meshopt: Json = null;
+  const init = {
+    draco_ms: await timed(async () => {
+      draco = await loadDraco(options.dracoDir);
+    }),
+    meshopt_ms: await timed(async () => {
+      meshopt = await loadMeshopt(options.meshoptDecoder);
+    }),
+    draco: draco !== null,
+    meshopt: meshopt !== null,
+  };
+  const sharp = await loadSharp();
+
+  const files: Record<string, FileTimes> = {};
+  for (const file of options.files) {
+    files[file] = await benchFile(file, options.repeat, draco, meshopt, sharp);
+  }
+  process.stdout.write(`${JSON.stringify({ init: { ...init, sharp: sharp !== null }, files })}\n`);
+}
+
+main().catch((err) => {
+  console.error(err);
+  process.exit(1);
+});
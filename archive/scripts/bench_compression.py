@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline: GLB Compression Benchmark
+===================================================
+
+Blender Python script that exports every Stage 1 model under a matrix of
+compression settings and measures what each costs the game at load time:
+bytes over the wire, export time in the build, and decode time in the
+browser. Used to choose EXPORT_SETTINGS in sovietize_kenney.py.
+
+Usage:
+    blender --background --python scripts/bench_compression.py
+
+    # A few models / settings, or a slower link for the time-to-first-frame
+    # estimate (default 10 Mbps)
+    blender --background --python scripts/bench_compression.py -- --assets school,warehouse
+    blender --background --python scripts/bench_compression.py -- --settings none,draco-6-q14,meshopt
+    blender --background --python scripts/bench_compression.py -- --bandwidth 4
+
+Settings (SETTINGS below):
+  - none          plain GLB, no mesh compression
+  - draco-L-qN    KHR_draco_mesh_compression at level L with N-bit positions
+  - jpeg-Q        the Stage 1 Draco settings with JPEG quality Q
+  - meshopt[-cc]  EXT_meshopt_compression, made by running gltfpack (-c or
+                  -cc) over the "none" export — Blender's exporter can't
+                  write it. Skipped when gltfpack isn't on PATH.
+
+Each model is imported and retextured once, then exported under every
+setting to .cache/bench/compression/<setting>/<name>.glb. Decoding is
+timed by benchDecodeGlb.ts under node with the Draco wasm decoder the
+game ships (public/wasm/draco at the repo root); the run stops up front
+if it's missing. meshopt decoding needs MESHOPT_DECODER, which isn't
+shipped yet — without it the meshopt rows have no decode time or
+estimate.
+
+Time to first frame, per setting, for loading the whole set:
+
+    bytes * 8 / bandwidth  +  decoder start-up  +  mesh + image decode
+
+Writes .cache/reports/compression_bench.{json,csv} and prints the
+settings fastest first.
+"""
+
+import bpy
+import csv
+import json
+import shutil
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import sovietize_kenney as sk  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+BENCH_DIR = sk.PROJECT_ROOT / ".cache" / "bench" / "compression"
+# The game's own Draco decoder (the app lives one level above archive/)
+DRACO_DIR = sk.PROJECT_ROOT.parent / "public" / "wasm" / "draco"
+DRACO_FILES = ("draco_wasm_wrapper.js", "draco_decoder.wasm")
+MESHOPT_DECODER = sk.PROJECT_ROOT / "public" / "wasm" / "meshopt" / "meshopt_decoder.mjs"
+DECODE_SCRIPT = sk.SCRIPT_DIR / "benchDecodeGlb.ts"
+
+BANDWIDTH_MBPS = 10.0
+DECODE_REPEAT = 3
+
+NO_DRACO = {
+    "export_draco_mesh_compression_enable": False,
+    "export_image_format": "JPEG",
+    "export_jpeg_quality": sk.EXPORT_SETTINGS["export_jpeg_quality"],
+}
+
+
+def draco(level: int, position_bits: int) -> dict:
+    """Stage 1 settings with another Draco level / position quantization."""
+    return {**sk.EXPORT_SETTINGS,
+            "export_draco_mesh_compression_level": level,
+            "export_draco_position_quantization": position_bits}
+
+
+# setting name -> glTF exporter kwargs
+SETTINGS = {"none": NO_DRACO}
+for _level in (1, 6, 10):
+    for _bits in (11, 14):
+        SETTINGS[f"draco-{_level}-q{_bits}"] = draco(_level, _bits)
+for _quality in (75, 95):
+    SETTINGS[f"jpeg-{_quality}"] = {**sk.EXPORT_SETTINGS, "export_jpeg_quality": _quality}
+
+# setting name -> gltfpack flags, applied to the "none" export
+GLTFPACK_SETTINGS = {"meshopt": ["-c"], "meshopt-cc": ["-cc"]}
+
+
+# ---------------------------------------------------------------------------
+# Export
+# ---------------------------------------------------------------------------
+
+def bench_path(setting: str, soviet_name: str) -> Path:
+    return BENCH_DIR / setting / f"{soviet_name}.glb"
+
+
+def gltfpack(source: Path, output: Path, flags) -> float:
+    """Run gltfpack over `source`; returns seconds taken."""
+    output.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    subprocess.run(["gltfpack", "-i", str(source), "-o", str(output), *flags],
+                   check=True, capture_output=True)
+    return time.perf_counter() - start
+
+
+def export_model(source_glb: Path, profile, soviet_name: str, settings, packs) -> dict:
+    """Import one model and export it under every setting.
+
+    Returns {setting: export seconds}; gltfpack settings add their own
+    time to the "none" export they start from.
+    """
+    sk.clear_scene()
+    bpy.ops.import_scene.gltf(filepath=str(source_glb))
+    sk.apply_soviet_materials(bpy.context.scene.objects, profile)
+
+    times = {}
+    for setting in settings:
+        start = time.perf_counter()
+        sk.export_glb(bench_path(setting, soviet_name), settings=SETTINGS[setting])
+        times[setting] = time.perf_counter() - start
+    for setting in packs:
+        times[setting] = times["none"] + gltfpack(
+            bench_path("none", soviet_name), bench_path(setting, soviet_name),
+            GLTFPACK_SETTINGS[setting])
+    return times
+
+
+# ---------------------------------------------------------------------------
+# Decode
+# ---------------------------------------------------------------------------
+
+def decode_times(paths) -> dict:
+    """Run benchDecodeGlb.ts over `paths`; None if node/tsx isn't available."""
+    npx = shutil.which("npx")
+    if npx is None:
+        print("  WARNING: npx not found; decode times skipped")
+        return None
+    cmd = [npx, "tsx", str(DECODE_SCRIPT), "--draco", str(DRACO_DIR),
+           "--repeat", str(DECODE_REPEAT)]
+    if MESHOPT_DECODER.exists():
+        cmd += ["--meshopt", str(MESHOPT_DECODER)]
+    cmd += map(str, paths)
+    proc = subprocess.run(cmd, cwd=sk.PROJECT_ROOT, capture_output=True, text=True)
+    if proc.returncode != 0:
+        print(f"  WARNING: decode benchmark failed; decode times skipped\n{proc.stderr}")
+        return None
+    return json.loads(proc.stdout)
+
+
+# ---------------------------------------------------------------------------
+# Report
+# ---------------------------------------------------------------------------
+
+def summarize(setting: str, names, export_s: dict, decoded, bandwidth_mbps: float) -> dict:
+    """Totals for one setting over every model it was exported for."""
+    paths = [bench_path(setting, name) for name in names]
+    row = {
+        "setting": setting,
+        "models": len(paths),
+        "bytes": sum(p.stat().st_size for p in paths),
+        "export_s": round(sum(export_s[name][setting] for name in names), 3),
+        "init_ms": None, "mesh_ms": None, "image_ms": None, "ttff_s": None,
+    }
+    row["download_s"] = round(row["bytes"] * 8 / (bandwidth_mbps * 1e6), 3)
+    if decoded is None:
+        return row
+
+    files = [decoded["files"][str(p)] for p in paths]
+    mesh = [f["draco_ms"] + f["meshopt_ms"] if None not in (f["draco_ms"], f["meshopt_ms"])
+            else None for f in files]
+    image = [f["image_ms"] for f in files]
+    init = decoded["init"]
+    row["init_ms"] = round((init["draco_ms"] if any(f["draco_primitives"] for f in files) else 0)
+                           + (init["meshopt_ms"] if any(f["meshopt_views"] for f in files) else 0), 1)
+    if None not in mesh:
+        row["mesh_ms"] = round(sum(mesh), 1)
+    if None not in image:
+        row["image_ms"] = round(sum(image), 1)
+    if row["mesh_ms"] is not None and row["image_ms"] is not None:
+        row["ttff_s"] = round(row["download_s"]
+                              + (row["init_ms"] + row["mesh_ms"] + row["image_ms"]) / 1000, 3)
+    return row
+
+
+COLUMNS = ("setting", "models", "bytes", "export_s", "download_s", "init_ms",
+           "mesh_ms", "image_ms", "ttff_s")
+
+
+def write_report(rows, bandwidth_mbps: float):
+    """Write compression_bench.json + .csv; returns the JSON path."""
+    sk.REPORT_DIR.mkdir(parents=True, exist_ok=True)
+    json_path = sk.REPORT_DIR / "compression_bench.json"
+    manifest_io.write_json_atomic(json_path, {
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "bandwidth_mbps": bandwidth_mbps,
+        "settings": {row["setting"]: SETTINGS.get(row["setting"])
+                     or {"gltfpack": GLTFPACK_SETTINGS[row["setting"]]} for row in rows},
+        "results": rows,
+    })
+    with open(sk.REPORT_DIR / "compression_bench.csv", "w", newline="") as f:
+        writer = csv.DictWriter(f, fieldnames=COLUMNS)
+        writer.writeheader()
+        writer.writerows(rows)
+    return json_path
+
+
+def print_table(rows):
+    def cell(value):
+        return "-" if value is None else value
+
+    print(f"\n  {'setting':<14}{'KB':>9}{'export s':>10}{'init ms':>9}"
+          f"{'mesh ms':>9}{'image ms':>10}{'TTFF s':>9}")
+    for row in rows:
+        print(f"  {row['setting']:<14}{row['bytes'] / 1024:>9.0f}{row['export_s']:>10}"
+              f"{cell(row['init_ms']):>9}{cell(row['mesh_ms']):>9}"
+              f"{cell(row['image_ms']):>10}{cell(row['ttff_s']):>9}")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    """Parse args after Blender's `--`: --assets a,b, --settings a,b, --bandwidth MBPS."""
+    args = {"assets": None, "settings": None, "bandwidth": BANDWIDTH_MBPS}
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--assets" and i + 1 < len(custom):
+                args["assets"] = set(custom[i + 1].split(","))
+                i += 2
+            elif custom[i] == "--settings" and i + 1 < len(custom):
+                args["settings"] = custom[i + 1].split(",")
+                i += 2
+            elif custom[i] == "--bandwidth" and i + 1 < len(custom):
+                args["bandwidth"] = float(custom[i + 1])
+                i += 2
+            else:
+                i += 1
+    return args
+
+
+def main():
+    args = parse_args()
+
+    names = args["settings"] or [*SETTINGS, *GLTFPACK_SETTINGS]
+    unknown = [s for s in names if s not in SETTINGS and s not in GLTFPACK_SETTINGS]
+    if unknown:
+        print(f"ERROR: unknown settings {', '.join(unknown)}; "
+              f"choose from {', '.join([*SETTINGS, *GLTFPACK_SETTINGS])}")
+        sys.exit(1)
+    packs = [s for s in names if s in GLTFPACK_SETTINGS]
+    if packs and shutil.which("gltfpack") is None:
+        print(f"WARNING: gltfpack not found; skipping {', '.join(packs)}")
+        packs = []
+    settings = [s for s in names if s in SETTINGS]
+    if packs and "none" not in settings:
+        settings.insert(0, "none")  # gltfpack's input
+
+    missing = [DRACO_DIR / name for name in DRACO_FILES if not (DRACO_DIR / name).exists()]
+    if missing:
+        print(f"ERROR: Draco decoder not found: {', '.join(map(str, missing))}")
+        sys.exit(1)
+    if packs and not MESHOPT_DECODER.exists():
+        print(f"WARNING: meshopt decoder not found at {MESHOPT_DECODER}; "
+              f"{', '.join(packs)} get no decode time")
+
+    models = sk.model_list()
+    if args["assets"]:
+        models = [m for m in models if m[3] in args["assets"]]
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline: GLB Compression Benchmark")
+    print(f"  Models:    {len(models)}")
+    print(f"  Settings:  {', '.join(settings + packs)}")
+    print(f"  Bandwidth: {args['bandwidth']} Mbps")
+    print(f"  Draco:     {DRACO_DIR}")
+    print("=" * 60)
+
+    export_s = {}
+    for _label, source, _filename, soviet_name, profile, _role, _miss in models:
+        if not source.exists():
+            print(f"  SKIP: Source not found: {source}")
+            continue
+        export_s[soviet_name] = export_model(source, profile, soviet_name, settings, packs)
+        print(f"  OK: {soviet_name}")
+
+    if not export_s:
+        print("\nERROR: no models exported")
+        sys.exit(1)
+
+    benched = settings + packs
+    print("\nDecoding...")
+    decoded = decode_times([bench_path(s, n) for s in benched for n in export_s])
+
+    rows = [summarize(s, list(export_s), export_s, decoded, args["bandwidth"]) for s in benched]
+    # Fastest first; settings without a full estimate last, smallest first
+    rows.sort(key=lambda r: (r["ttff_s"] is None, r["ttff_s"] or 0, r["bytes"]))
+    report_path = write_report(rows, args["bandwidth"])
+
+    print("\n" + "=" * 60)
+    print("Benchmark Complete")
+    print_table(rows)
+    print(f"\n  Report: {report_path}")
+    print("=" * 60)
+
+
+if __name__ == "__main__":
+    main()
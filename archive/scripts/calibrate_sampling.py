@@ -0,0 +1,286 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline: Sample Budget Calibration
+===================================================
+
+Finds, per sprite or hex tile, the cheapest Cycles sampling budget whose
+render matches a high-sample reference, and records it in
+sampling_calibration.json, which render_sprites.py, render_hex_tiles.py
+and render_server.py then use instead of the category default (see
+sampling_profiles.py).
+
+For each asset the scene is set up once (same camera, framing and
+lights as the real stage), a reference is rendered at
+--reference-samples without adaptive sampling, then the LADDER budgets
+are rendered cheapest first. The first one reaching both --target-psnr
+and --target-ssim against the reference wins; if none does, the most
+expensive rung is recorded. The category's time limit is kept as a
+safety net.
+
+Usage:
+    # Calibrate every building sprite
+    blender --background --python scripts/calibrate_sampling.py
+
+    # Hex tiles (winter colormap), or a comma-separated subset
+    blender --background --python scripts/calibrate_sampling.py -- --kind tiles
+    blender --background --python scripts/calibrate_sampling.py -- --only school,barracks
+
+    # Stricter targets / cheaper reference
+    blender --background --python scripts/calibrate_sampling.py -- \\
+        --target-psnr 42 --target-ssim 0.99 --reference-samples 512
+
+Output:
+    scripts/sampling_calibration.json   (merged; other entries are kept)
+
+Calibrated budgets are part of the render cache key, so the next Stage 2
+and Stage 3 runs re-render the assets whose budget changed.
+"""
+
+import bpy
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import pixel_math  # noqa: E402
+import render_hex_tiles as rt  # noqa: E402
+import render_sprites as rs  # noqa: E402
+import sampling_profiles  # noqa: E402
+from pixel_buffers import read_pixels  # noqa: E402
+from sampling_profiles import SampleBudget  # noqa: E402
+
+
+# Candidate (samples, noise_threshold), cheapest first
+LADDER = [
+    (4, 0.05),
+    (8, 0.05),
+    (8, 0.02),
+    (16, 0.02),
+    (16, 0.01),
+    (32, 0.01),
+    (64, 0.01),
+    (128, 0.005),
+]
+
+DEFAULT_TARGET_PSNR = 40.0
+DEFAULT_TARGET_SSIM = 0.98
+DEFAULT_REFERENCE_SAMPLES = 1024
+
+
+# ---------------------------------------------------------------------------
+# CLI argument parsing (Blender passes custom args after --)
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    args = {
+        "kind": "sprites",
+        "only": None,
+        "target_psnr": DEFAULT_TARGET_PSNR,
+        "target_ssim": DEFAULT_TARGET_SSIM,
+        "reference_samples": DEFAULT_REFERENCE_SAMPLES,
+    }
+
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--kind" and i + 1 < len(custom):
+                args["kind"] = custom[i + 1].lower()
+                i += 2
+            elif custom[i] == "--only" and i + 1 < len(custom):
+                args["only"] = set(custom[i + 1].split(","))
+                i += 2
+            elif custom[i] == "--target-psnr" and i + 1 < len(custom):
+                args["target_psnr"] = float(custom[i + 1])
+                i += 2
+            elif custom[i] == "--target-ssim" and i + 1 < len(custom):
+                args["target_ssim"] = float(custom[i + 1])
+                i += 2
+            elif custom[i] == "--reference-samples" and i + 1 < len(custom):
+                args["reference_samples"] = int(custom[i + 1])
+                i += 2
+            else:
+                i += 1
+
+    if args["kind"] not in sampling_profiles.CATEGORY_BUDGETS:
+        print(f"ERROR: --kind must be one of {sorted(sampling_profiles.CATEGORY_BUDGETS)}")
+        sys.exit(1)
+    return args
+
+
+# ---------------------------------------------------------------------------
+# Asset lists + scene setup
+# ---------------------------------------------------------------------------
+
+def sprite_assets():
+    """(name, role, glb_path, source) for every renderable Stage 1 model."""
+    manifest = manifest_io.read_json(rs.MANIFEST_PATH, default={})
+    return [
+        (name, info.get("role", ""), rs.PROJECT_ROOT / "public" / info["file"], info.get("source"))
+        for name, info in sorted(manifest.get("assets", {}).items())
+        if info.get("role", "") not in rs.SKIP_ROLES
+    ]
+
+
+def tile_assets():
+    """(name, category, glb_path, None) for every hex tile."""
+    return [
+        (name, rt.TILE_TO_CATEGORY[name], rt.HEX_KIT_DIR / f"{name}.glb", None)
+        for name in sorted(rt.TILE_TO_CATEGORY)
+    ]
+
+
+def setup_sprite(glb_path, source):
+    """Stage 2 scene for one model, border set to its silhouette. False if no mesh."""
+    rs.clear_scene()
+    bounds = rs.import_model(glb_path, source)
+    if bounds is None:
+        return False
+    cam_obj = rs.create_camera()
+    world_co = rs.get_world_vertices()
+    res_x, res_y = rs.frame_model(cam_obj, *bounds, world_co, rs.RENDER_PIXELS_PER_UNIT)
+    rs.setup_lighting()
+    rs.configure_render("cycles")
+    scene = bpy.context.scene
+    rs.set_render_border(scene, rs.silhouette_border(
+        world_co, cam_obj, res_x, res_y, filter_px=scene.cycles.filter_width
+    ))
+    return True
+
+
+def setup_tile(glb_path, colormap):
+    """Stage 3 scene for one hex tile (winter colormap). False if no mesh."""
+    return rt.setup_tile_scene(glb_path, colormap, "cycles") is not None
+
+
+# ---------------------------------------------------------------------------
+# Render + compare
+# ---------------------------------------------------------------------------
+
+def render_to_array(budget, path):
+    """Render the current scene with `budget`; returns (pixels, seconds)."""
+    scene = bpy.context.scene
+    sampling_profiles.apply_budget(scene, budget)
+    scene.render.filepath = str(path)
+    start = time.perf_counter()
+    bpy.ops.render.render(write_still=True)
+    seconds = time.perf_counter() - start
+
+    img = bpy.data.images.load(str(path))
+    try:
+        pixels = read_pixels(img).copy()
+    finally:
+        bpy.data.images.remove(img)
+    return pixels, seconds
+
+
+def calibrate_asset(default, args, tmp_dir):
+    """Walk LADDER against a reference render. Returns the calibration entry."""
+    reference, ref_s = render_to_array(
+        SampleBudget(args["reference_samples"], 0.0), tmp_dir / "reference.png"
+    )
+    print(f"    reference: {args['reference_samples']} samples, {ref_s:.1f}s")
+
+    entry = None
+    for samples, threshold in LADDER:
+        budget = SampleBudget(
+            samples, threshold, min(default.min_samples, samples), default.time_limit
+        )
+        pixels, seconds = render_to_array(budget, tmp_dir / "candidate.png")
+        p = pixel_math.psnr(pixels, reference)
+        s = pixel_math.ssim(pixels, reference)
+        print(f"    {samples:4d} @ {threshold:<5}  PSNR {p:6.2f} dB  SSIM {s:.4f}  {seconds:.1f}s")
+        entry = {
+            **budget._asdict(),
+            "psnr": round(min(p, 99.0), 2),
+            "ssim": round(s, 5),
+            "render_s": round(seconds, 2),
+            "reference_s": round(ref_s, 2),
+        }
+        if p >= args["target_psnr"] and s >= args["target_ssim"]:
+            return entry
+
+    print("    WARNING: no budget reached the targets, keeping the most expensive")
+    return entry
+
+
+# ---------------------------------------------------------------------------
+# Main
+# ---------------------------------------------------------------------------
+
+def run_calibration():
+    args = parse_args()
+    kind = args["kind"]
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline: Sample Budget Calibration")
+    print(f"  Kind:      {kind}")
+    print(f"  Targets:   PSNR >= {args['target_psnr']} dB, SSIM >= {args['target_ssim']}")
+    print(f"  Reference: {args['reference_samples']} samples")
+    print("=" * 60)
+
+    assets = sprite_assets() if kind == "sprites" else tile_assets()
+    if args["only"]:
+        assets = [a for a in assets if a[0] in args["only"]]
+
+    colormap = None
+    if kind == "tiles":
+        rt.clear_scene()
+        colormap = rt.load_and_remap_colormap("winter")
+
+    calibrated = {}
+    failed = []
+    with tempfile.TemporaryDirectory(prefix="calibrate_") as tmp:
+        tmp_dir = Path(tmp)
+        for i, (name, category, glb_path, source) in enumerate(assets, 1):
+            print(f"\n  [{i}/{len(assets)}] {name} ({category})")
+            if not glb_path.exists():
+                print(f"    MISS: {glb_path}")
+                failed.append(name)
+                continue
+            try:
+                ok = (setup_sprite(glb_path, source) if kind == "sprites"
+                      else setup_tile(glb_path, colormap))
+                if not ok:
+                    print("    SKIP: no mesh")
+                    continue
+                default = sampling_profiles.CATEGORY_BUDGETS[kind].get(
+                    category, sampling_profiles.DEFAULT_BUDGET
+                )
+                calibrated[name] = calibrate_asset(default, args, tmp_dir)
+            except Exception as e:
+                print(f"    FAIL: {e}")
+                import traceback
+                traceback.print_exc()
+                failed.append(name)
+
+    path = sampling_profiles.CALIBRATION_PATH
+    with manifest_io.locked(path):
+        data = manifest_io.read_json(path, default={})
+        data.setdefault(kind, {}).update(calibrated)
+        data[kind] = dict(sorted(data[kind].items()))
+        data["targets"] = {
+            "psnr": args["target_psnr"],
+            "ssim": args["target_ssim"],
+            "reference_samples": args["reference_samples"],
+        }
+        manifest_io.write_json_atomic(path, data)
+
+    print("\n" + "=" * 60)
+    print(f"Calibrated: {len(calibrated)}   Failed: {len(failed)}")
+    if calibrated:
+        mean = sum(e["samples"] for e in calibrated.values()) / len(calibrated)
+        print(f"  Mean sample ceiling: {mean:.1f}")
+    print(f"  Written:  {path}")
+    print("=" * 60)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_calibration()
@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline Stage 5: Sprite Encoder (WebP / AVIF / KTX2)
+=====================================================================
+
+Sprites dominate the game's download size, and Stages 2-4 only write
+PNG. This stage encodes every PNG listed in the sprite and tile
+manifests (every density, plus the Stage 4 atlases) into additional
+formats with external encoders:
+
+    webp_lossless  cwebp -lossless            <name>.lossless.webp
+    webp           cwebp -q 85 (lossy)        <name>.webp
+    avif           avifenc -q 70              <name>.avif
+    ktx2           ktx create, UASTC + zstd   <name>.ktx2  (direct GPU upload)
+
+Each output is decoded again with the matching decoder (dwebp, avifdec,
+ktx extract) and compared to the source PNG, in premultiplied alpha so
+colour under fully transparent pixels doesn't count. The manifest entry
+gains, next to the PNG's own size:
+
+    "encodings": {"png":  {"file": ".../school.png", "bytes": 18342},
+                  "webp": {"file": ".../school.webp", "bytes": 6120,
+                           "psnr": 41.8, "ssim": 0.9931, ...}, ...}
+
+so the client can pick the smallest format it supports whose quality it
+accepts. PSNR is capped at 99.0 (= bit-exact). Encoders that aren't
+installed are skipped with a warning.
+
+An encoding is reused while its source PNG hash and encoder settings
+are unchanged. The record lives in .cache/encode_sprites.json as well
+as the manifest, so it survives Stages 2-3 replacing the entry (a
+cache hit re-render writes identical bytes); only a PNG that actually
+changed is re-encoded. Re-rendering a sprite drops its encodings from
+the manifest, and Stage 4 drops the atlas encodings; run this stage
+again afterwards.
+
+This is Stage 5 of the asset pipeline:
+  Stage 1: sovietize_kenney.py  (Kenney GLB -> Soviet retextured GLB)
+  Stage 2: render_sprites.py    (Soviet GLB -> Isometric building sprites)
+  Stage 3: render_hex_tiles.py  (Kenney Hex -> Soviet seasonal tile sprites)
+  Stage 4: pack_atlases.py      (Sprites -> Packed atlas sheets)
+  Stage 5: encode_sprites.py    (PNG -> WebP / AVIF / KTX2)
+
+Usage:
+    blender --background --python scripts/encode_sprites.py
+
+    # Only buildings / only tiles, a subset of formats, more encoder processes
+    blender --background --python scripts/encode_sprites.py -- --only sprites
+    blender --background --python scripts/encode_sprites.py -- --formats webp,avif --jobs 8
+
+    # Re-encode everything
+    blender --background --python scripts/encode_sprites.py -- --force
+"""
+
+import bpy
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import pixel_math  # noqa: E402
+import render_cache  # noqa: E402
+from pixel_buffers import read_pixels  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PUBLIC_DIR = PROJECT_ROOT / "app" / "public"
+SPRITE_DIR = PUBLIC_DIR / "sprites" / "soviet"
+TILE_DIR = SPRITE_DIR / "tiles"
+
+# Encoding records by encoded file, kept across Stage 2-4 manifest rewrites
+ENCODE_CACHE = PROJECT_ROOT / ".cache" / "encode_sprites.json"
+
+# name -> (file suffix, encode argv, decode argv). {src} is the PNG,
+# {dst} the encoded file, {png} the decoded copy used for the metrics.
+FORMATS = {
+    "webp_lossless": (
+        ".lossless.webp",
+        ["cwebp", "-quiet", "-lossless", "-z", "9", "-exact", "{src}", "-o", "{dst}"],
+        ["dwebp", "-quiet", "{dst}", "-o", "{png}"],
+    ),
+    "webp": (
+        ".webp",
+        ["cwebp", "-quiet", "-q", "85", "-alpha_q", "100", "-m", "6", "-sharp_yuv",
+         "{src}", "-o", "{dst}"],
+        ["dwebp", "-quiet", "{dst}", "-o", "{png}"],
+    ),
+    "avif": (
+        ".avif",
+        ["avifenc", "--speed", "4", "-q", "70", "--qalpha", "90", "--jobs", "1",
+         "{src}", "{dst}"],
+        ["avifdec", "{dst}", "{png}"],
+    ),
+    "ktx2": (
+        ".ktx2",
+        ["ktx", "create", "--format", "R8G8B8A8_SRGB", "--encode", "uastc",
+         "--uastc-quality", "2", "--zstd", "18", "{src}", "{dst}"],
+        ["ktx", "extract", "--transcode", "rgba8", "{dst}", "{png}"],
+    ),
+}
+
+# Reported for lossless round trips (PSNR is infinite)
+PSNR_CAP = 99.0
+
+
+# ---------------------------------------------------------------------------
+# CLI argument parsing (Blender passes custom args after --)
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    args = {
+        "only": None,
+        "formats": list(FORMATS),
+        "jobs": os.cpu_count() or 1,
+        "force": False,
+    }
+
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--only" and i + 1 < len(custom):
+                args["only"] = custom[i + 1].lower()
+                i += 2
+            elif custom[i] == "--formats" and i + 1 < len(custom):
+                args["formats"] = custom[i + 1].lower().split(",")
+                i += 2
+            elif custom[i] == "--jobs" and i + 1 < len(custom):
+                args["jobs"] = max(1, int(custom[i + 1]))
+                i += 2
+            elif custom[i] == "--force":
+                args["force"] = True
+                i += 1
+            else:
+                i += 1
+
+    unknown = [f for f in args["formats"] if f not in FORMATS]
+    if unknown:
+        print(f"ERROR: unknown format(s) {', '.join(unknown)}; "
+              f"available: {', '.join(FORMATS)}")
+        sys.exit(1)
+    return args
+
+
+def available_formats(formats):
+    """Formats whose encoder and decoder are both on PATH."""
+    usable = []
+    for name in formats:
+        _, encode, decode = FORMATS[name]
+        missing = sorted({t for t in (encode[0], decode[0]) if not shutil.which(t)})
+        if missing:
+            print(f"  WARNING: skipping {name}: {', '.join(missing)} not found")
+        else:
+            usable.append(name)
+    return usable
+
+
+# ---------------------------------------------------------------------------
+# Manifest walking
+# ---------------------------------------------------------------------------
+
+def image_entries(manifest, kind):
+    """Every manifest dict that describes one PNG.
+
+    Sprite/tile entries (the base density), their "densities" entries
+    and atlas descriptors. All have the PNG's public path under "sprite"
+    (entries) or "file" (atlases).
+    """
+    if kind == "sprites":
+        groups = [manifest.get("sprites", {})]
+    else:
+        groups = list(manifest.get("seasons", {}).values())
+
+    found = []
+    for entries in groups:
+        for entry in entries.values():
+            found.append(entry)
+            found.extend(entry.get("densities", {}).values())
+    found.extend(manifest.get("atlases", []))
+    return found
+
+
+def png_of(entry):
+    return entry.get("sprite") or entry["file"]
+
+
+def encoded_path(rel_png, fmt):
+    """sprites/soviet/school.png -> sprites/soviet/school.webp"""
+    rel = Path(rel_png)
+    return rel.with_name(rel.stem + FORMATS[fmt][0]).as_posix()
+
+
+def settings(fmt):
+    """Encoder argv as a string — a change re-encodes."""
+    return " ".join(FORMATS[fmt][1])
+
+
+# ---------------------------------------------------------------------------
+# Encoding + quality
+# ---------------------------------------------------------------------------
+
+def run_codec(fmt, rel_png, tmp_dir):
+    """Encode one PNG and decode it back. Returns the decoded PNG path."""
+    _, encode, decode = FORMATS[fmt]
+    paths = {
+        "src": str(PUBLIC_DIR / rel_png),
+        "dst": str(PUBLIC_DIR / encoded_path(rel_png, fmt)),
+        "png": str(tmp_dir / f"{encoded_path(rel_png, fmt).replace('/', '_')}.png"),
+    }
+    for argv in (encode, decode):
+        subprocess.run([a.format(**paths) for a in argv], check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.PIPE)
+    return Path(paths["png"])
+
+
+def load_premultiplied(path):
+    """PNG -> (H, W, 4) float32, RGB premultiplied by alpha."""
+    img = bpy.data.images.load(str(path))
+    try:
+        pixels = read_pixels(img).copy()
+    finally:
+        bpy.data.images.remove(img)
+    pixels[:, :, :3] *= pixels[:, :, 3:4]
+    return pixels
+
+
+def quality(decoded_path, reference):
+    """(psnr, ssim) of a decoded image against the source pixels."""
+    decoded = load_premultiplied(decoded_path)
+    if decoded.shape != reference.shape:
+        raise ValueError(f"decoded size {decoded.shape[:2]} != source {reference.shape[:2]}")
+    return (
+        round(min(pixel_math.psnr(decoded, reference), PSNR_CAP), 2),
+        round(pixel_math.ssim(decoded, reference), 5),
+    )
+
+
+def load_encode_cache():
+    """encoded file (public path) -> its last encoding record."""
+    return manifest_io.read_json(ENCODE_CACHE, default={})
+
+
+def save_encode_cache(records):
+    """Merge this run's encoding records into ENCODE_CACHE."""
+    with manifest_io.locked(ENCODE_CACHE):
+        cache = manifest_io.read_json(ENCODE_CACHE, default={})
+        cache.update(records)
+        manifest_io.write_json_atomic(ENCODE_CACHE, dict(sorted(cache.items())))
+
+
+def png_groups(manifest, kind):
+    """Public PNG path -> every manifest dict describing it.
+
+    One PNG may be listed twice (base entry + its "2" density).
+    """
+    by_png = {}
+    for entry in image_entries(manifest, kind):
+        by_png.setdefault(png_of(entry), []).append(entry)
+    return by_png
+
+
+def encode_manifest(manifest_path, kind, formats, jobs, force, cache):
+    """Encode every PNG in one manifest and record the results in it.
+
+    The manifest is locked only to snapshot it and, afterwards, to merge
+    the "encodings" back, so Stage 2-4 merges aren't held up by the
+    encoders. `cache` is load_encode_cache(); new records are added to it.
+
+    Returns (encoded, reused, failed) counts.
+    """
+    counts = {"encoded": 0, "reused": 0, "failed": 0}
+    with manifest_io.locked(manifest_path):
+        manifest = manifest_io.read_json(manifest_path)
+    if manifest is None:
+        print(f"  SKIP: {manifest_path} not found")
+        return counts
+
+    by_png = png_groups(manifest, kind)
+    print(f"\n--- {kind.capitalize()}: {len(by_png)} PNGs ---")
+
+    results = {}
+    source_hashes = {}
+    todo = []
+    for rel_png, entries in sorted(by_png.items()):
+        src = PUBLIC_DIR / rel_png
+        if not src.exists():
+            print(f"  MISS: {rel_png}")
+            counts["failed"] += 1
+            continue
+        source_hash = source_hashes[rel_png] = render_cache.hash_file(src)[:16]
+        previous = entries[0].get("encodings", {})
+        results[rel_png] = {"png": {"file": rel_png, "bytes": src.stat().st_size}}
+        for fmt in formats:
+            # The cache survives re-renders (Stages 2-3 replace the entry)
+            old = cache.get(encoded_path(rel_png, fmt)) or previous.get(fmt)
+            if (not force and old and old.get("source_hash") == source_hash
+                    and old.get("settings") == settings(fmt)
+                    and (PUBLIC_DIR / old["file"]).exists()):
+                results[rel_png][fmt] = old
+                counts["reused"] += 1
+            else:
+                todo.append((rel_png, fmt, source_hash))
+
+    records = {}
+    with tempfile.TemporaryDirectory(prefix="encode_") as tmp, \
+            ThreadPoolExecutor(max_workers=jobs) as pool:
+        futures = [(task, pool.submit(run_codec, task[1], task[0], Path(tmp)))
+                   for task in todo]
+        # Tasks are grouped by PNG, so only the current source is held
+        reference = {}
+        for (rel_png, fmt, source_hash), future in futures:
+            try:
+                decoded = future.result()
+                if rel_png not in reference:
+                    reference = {rel_png: load_premultiplied(PUBLIC_DIR / rel_png)}
+                psnr, ssim = quality(decoded, reference[rel_png])
+            except (subprocess.CalledProcessError, ValueError, RuntimeError) as e:
+                detail = getattr(e, "stderr", b"") or b""
+                print(f"  FAIL {fmt}: {rel_png}: {e} {detail.decode(errors='replace').strip()}")
+                counts["failed"] += 1
+                continue
+            rel_out = encoded_path(rel_png, fmt)
+            results[rel_png][fmt] = records[rel_out] = {
+                "file": rel_out,
+                "bytes": (PUBLIC_DIR / rel_out).stat().st_size,
+                "psnr": psnr,
+                "ssim": ssim,
+                "source_hash": source_hash,
+                "settings": settings(fmt),
+            }
+            counts["encoded"] += 1
+            png_bytes = results[rel_png]["png"]["bytes"]
+            print(f"  {fmt:14s} {rel_png}: {png_bytes} -> "
+                  f"{results[rel_png][fmt]['bytes']} B  PSNR {psnr}  SSIM {ssim}")
+
+    cache.update(records)
+    save_encode_cache(records)
+
+    # Merge into the manifest as it is now; a PNG re-rendered while we
+    # were encoding keeps its fresh entry (the next run encodes it)
+    with manifest_io.locked(manifest_path):
+        manifest = manifest_io.read_json(manifest_path, default={})
+        current = png_groups(manifest, kind)
+        for rel_png, encodings in results.items():
+            src = PUBLIC_DIR / rel_png
+            if rel_png not in current or not src.exists():
+                continue
+            if render_cache.hash_file(src)[:16] != source_hashes[rel_png]:
+                print(f"  CHANGED: {rel_png} was re-rendered during encoding; run again")
+                continue
+            for entry in current[rel_png]:
+                entry["encodings"] = encodings
+        manifest_io.write_json_atomic(manifest_path, manifest)
+
+    totals = {"png": 0, **{fmt: 0 for fmt in formats}}
+    for encodings in results.values():
+        for fmt in totals:
+            if fmt in encodings:
+                totals[fmt] += encodings[fmt]["bytes"]
+    print(f"  Total bytes ({kind}): "
+          + "  ".join(f"{fmt} {n / 1024:.0f} KB" for fmt, n in totals.items()))
+    return counts
+
+
+# ---------------------------------------------------------------------------
+# Pipeline orchestration
+# ---------------------------------------------------------------------------
+
+def run_encode_pipeline():
+    args = parse_args()
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline Stage 5: Sprite Encoder")
+    print(f"  Formats:  {', '.join(args['formats'])}")
+    print(f"  Jobs:     {args['jobs']}")
+    if args["only"]:
+        print(f"  Only:     {args['only']}")
+    print("=" * 60)
+
+    formats = available_formats(args["formats"])
+    if not formats:
+        print("\nERROR: no encoders available (install libwebp, libavif and/or KTX-Software)")
+        sys.exit(1)
+
+    totals = {"encoded": 0, "reused": 0, "failed": 0}
+    cache = {} if args["force"] else load_encode_cache()
+    for kind, manifest_path in (("sprites", SPRITE_DIR / "manifest.json"),
+                                ("tiles", TILE_DIR / "manifest.json")):
+        if args["only"] in (None, kind):
+            counts = encode_manifest(manifest_path, kind, formats, args["jobs"], args["force"],
+                                    cache)
+            for k, n in counts.items():
+                totals[k] += n
+
+    print("\n" + "=" * 60)
+    print("Encoding Complete")
+    print(f"  Encoded:  {totals['encoded']}")
+    print(f"  Reused:   {totals['reused']}")
+    print(f"  Failed:   {totals['failed']}")
+    print("=" * 60)
+
+    if totals["failed"]:
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_encode_pipeline()
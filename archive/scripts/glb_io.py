@@ -0,0 +1,157 @@
+"""
+SimSoviet Asset Pipeline: GLB Container Rewrites
+================================================
+
+Shared by sovietize_kenney.py.
+
+Blender's glTF exporter either embeds every image in the GLB or writes a
+.gltf with loose files; it can't write a GLB whose images live outside
+it. So shared textures are a post-export rewrite of the GLB itself:
+
+  - read_glb() / write_glb() split and re-assemble the container
+    (12-byte header, JSON chunk, optional BIN chunk)
+  - externalize_images() swaps chosen embedded images for URIs and
+    compacts the BIN chunk, renumbering every "bufferView" reference
+    (accessors, sparse accessors, Draco primitives, remaining images)
+
+Externalized images keep their SHA-256 in the image's "extras", so a GLB
+still changes bytes whenever a texture it points at does (render caches
+and the DAG key on the GLB alone).
+
+Plain Python — no bpy.
+"""
+
+import hashlib
+import json
+import os
+import struct
+import tempfile
+from pathlib import Path
+
+GLB_MAGIC = 0x46546C67     # "glTF"
+CHUNK_JSON = 0x4E4F534A    # "JSON"
+CHUNK_BIN = 0x004E4942     # "BIN\0"
+
+
+def _pad4(data, fill):
+    return data + fill * (-len(data) % 4)
+
+
+def read_glb(path):
+    """Return (gltf dict, BIN chunk bytes or b"") of a GLB file."""
+    data = Path(path).read_bytes()
+    magic, version, length = struct.unpack_from("<III", data, 0)
+    if magic != GLB_MAGIC or version != 2:
+        raise ValueError(f"{path}: not a glTF 2.0 binary")
+
+    gltf, binary = None, b""
+    offset = 12
+    while offset < length:
+        chunk_len, chunk_type = struct.unpack_from("<II", data, offset)
+        chunk = data[offset + 8:offset + 8 + chunk_len]
+        if chunk_type == CHUNK_JSON:
+            gltf = json.loads(chunk)
+        elif chunk_type == CHUNK_BIN:
+            binary = bytes(chunk)
+        offset += 8 + chunk_len
+    if gltf is None:
+        raise ValueError(f"{path}: GLB has no JSON chunk")
+    return gltf, binary
+
+
+def write_atomic(path, data):
+    """Write bytes via temp file + rename in the target directory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+def write_glb(path, gltf, binary=b""):
+    """Assemble and atomically write a GLB."""
+    json_chunk = _pad4(json.dumps(gltf, separators=(",", ":")).encode(), b" ")
+    chunks = struct.pack("<II", len(json_chunk), CHUNK_JSON) + json_chunk
+    if binary:
+        bin_chunk = _pad4(binary, b"\0")
+        chunks += struct.pack("<II", len(bin_chunk), CHUNK_BIN) + bin_chunk
+    header = struct.pack("<III", GLB_MAGIC, 2, 12 + len(chunks))
+    write_atomic(path, header + chunks)
+
+
+def _renumber_buffer_views(node, mapping):
+    """Rewrite every integer "bufferView" in a glTF JSON tree via `mapping`."""
+    if isinstance(node, dict):
+        for key, value in node.items():
+            if key == "bufferView" and isinstance(value, int):
+                node[key] = mapping[value]
+            else:
+                _renumber_buffer_views(value, mapping)
+    elif isinstance(node, list):
+        for item in node:
+            _renumber_buffer_views(item, mapping)
+
+
+def externalize_images(gltf, binary, uri_for):
+    """Move embedded images out of a GLB, referenced by URI instead.
+
+    Args:
+        gltf: parsed JSON chunk (modified in place)
+        binary: BIN chunk bytes
+        uri_for: image dict -> URI (relative to the GLB), or None to keep
+            that image embedded
+
+    Returns:
+        (binary, {uri: image bytes}) — the compacted BIN chunk and the
+        extracted images, to be written next to the GLB by the caller
+    """
+    views = gltf.get("bufferViews", [])
+    extracted = {}
+    dropped = set()
+    for image in gltf.get("images", []):
+        if "bufferView" not in image:
+            continue
+        uri = uri_for(image)
+        if uri is None:
+            continue
+        view = views[image["bufferView"]]
+        start = view.get("byteOffset", 0)
+        data = binary[start:start + view["byteLength"]]
+        dropped.add(image.pop("bufferView"))
+        image["uri"] = uri
+        image.setdefault("extras", {})["sha256"] = hashlib.sha256(data).hexdigest()
+        extracted[uri] = data
+
+    if not dropped:
+        return binary, extracted
+
+    # Re-pack the surviving views, 4-byte aligned, in their original order
+    packed = bytearray()
+    mapping = {}
+    kept = []
+    for index, view in enumerate(views):
+        if index in dropped:
+            continue
+        start = view.get("byteOffset", 0)
+        data = binary[start:start + view["byteLength"]]
+        packed += b"\0" * (-len(packed) % 4)
+        view["byteOffset"] = len(packed)
+        packed += data
+        mapping[index] = len(kept)
+        kept.append(view)
+    gltf["bufferViews"] = kept
+    _renumber_buffer_views({k: v for k, v in gltf.items() if k != "bufferViews"}, mapping)
+
+    if not kept:
+        # Nothing but images was in the buffer
+        gltf.pop("bufferViews")
+        gltf.pop("buffers", None)
+    elif gltf.get("buffers"):
+        gltf["buffers"][0]["byteLength"] = len(packed)
+    return bytes(packed), extracted
@@ -0,0 +1,101 @@
+"""
+SimSoviet Asset Pipeline: Manifest Merge + Atomic Writes
+========================================================
+
+Shared by render_sprites.py, render_sprites_parallel.py,
+render_hex_tiles.py and pack_atlases.py.
+
+Renders that only touch some assets (--only, --season, a worker's
+subset) must not clobber the rest of the manifest, and a killed or
+concurrent run must never leave a truncated manifest.json behind:
+
+  - merge_entries() keeps existing entries, replaces the ones rendered
+    this run and prunes names whose source asset no longer exists
+  - locked() serializes read-merge-write between processes (flock on
+    a file under .cache/locks/, never next to the published manifest)
+  - write_json_atomic() writes a temp file in the same directory,
+    fsyncs it, then renames over the target
+
+Plain Python — no bpy.
+"""
+
+import fcntl
+import hashlib
+import json
+import os
+import tempfile
+from contextlib import contextmanager
+from pathlib import Path
+
+# Lock files live here rather than in app/public or public/models
+LOCK_DIR = Path(__file__).parent.parent / ".cache" / "locks"
+
+
+def read_json(path, default=None):
+    """Load a JSON file, or return `default` if it's missing or unreadable."""
+    path = Path(path)
+    if not path.exists():
+        return default
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        print(f"  WARNING: ignoring unreadable {path}: {e}")
+        return default
+
+
+def write_json_atomic(path, data):
+    """Write JSON via temp file + fsync + rename in the target directory."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=f".{path.name}.", suffix=".tmp", dir=path.parent)
+    try:
+        with os.fdopen(fd, "w") as f:
+            json.dump(data, f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        if os.path.exists(tmp):
+            os.unlink(tmp)
+        raise
+
+
+@contextmanager
+def locked(path):
+    """Hold an exclusive lock on `path` for a read-merge-write cycle.
+
+    The lock file is LOCK_DIR/<dir>-<name>-<hash of the absolute path>.lock.
+    """
+    path = Path(path).resolve()
+    path.parent.mkdir(parents=True, exist_ok=True)
+    digest = hashlib.sha1(str(path).encode()).hexdigest()[:12]
+    LOCK_DIR.mkdir(parents=True, exist_ok=True)
+    with open(LOCK_DIR / f"{path.parent.name}-{path.name}-{digest}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock, fcntl.LOCK_UN)
+
+
+def merge_entries(existing, rendered, valid_names):
+    """Merge this run's entries into the previous ones.
+
+    Args:
+        existing: name -> entry from the manifest on disk
+        rendered: name -> entry rendered in this run (replaces existing,
+                  including any Stage 4 "atlas" rect, which no longer
+                  matches the new PNG)
+        valid_names: names whose source asset still exists; anything
+                     else is pruned
+
+    Returns:
+        name -> entry, sorted by name
+    """
+    merged = {}
+    for name, entry in (existing or {}).items():
+        if name in valid_names:
+            merged[name] = entry
+    merged.update(rendered)
+    return dict(sorted(merged.items()))
@@ -0,0 +1,148 @@
+"""
+SimSoviet Asset Pipeline: MaxRects Bin Packer
+=============================================
+
+Pure-Python rectangle packer used by pack_atlases.py (Stage 4).
+
+Implements the MaxRects algorithm (Jukka Jylänki, "A Thousand Ways to
+Pack the Bin") with the Best Short Side Fit heuristic. Rotation is
+disabled — sprites are drawn upright with a fixed anchor.
+
+No bpy dependency, so it can run (and be tested) outside Blender.
+"""
+
+
+class MaxRectsBin:
+    """One fixed-size bin that rectangles are inserted into.
+
+    Coordinates are top-left origin, matching PNG/Canvas space.
+    `padding` transparent pixels are reserved right of and below every
+    placed rect so neighbours never bleed under bilinear filtering.
+    """
+
+    def __init__(self, width, height, padding=0):
+        self.width = width
+        self.height = height
+        self.padding = padding
+        self.free = [(0, 0, width, height)]
+        self.used = []
+
+    def insert(self, w, h):
+        """Place a w x h rect. Returns (x, y) or None if it doesn't fit."""
+        pw, ph = w + self.padding, h + self.padding
+        best = None
+        best_score = None
+        for fx, fy, fw, fh in self.free:
+            # A rect touching the bin edge doesn't need trailing padding
+            need_w = w if fx + fw == self.width and fx + pw > self.width else pw
+            need_h = h if fy + fh == self.height and fy + ph > self.height else ph
+            if need_w > fw or need_h > fh:
+                continue
+            short_side = min(fw - need_w, fh - need_h)
+            long_side = max(fw - need_w, fh - need_h)
+            score = (short_side, long_side)
+            if best_score is None or score < best_score:
+                best_score = score
+                best = (fx, fy, need_w, need_h)
+
+        if best is None:
+            return None
+
+        x, y, bw, bh = best
+        self._split_free(x, y, bw, bh)
+        self._prune_free()
+        self.used.append((x, y, w, h))
+        return x, y
+
+    def _split_free(self, x, y, w, h):
+        """Subtract the placed rect from every overlapping free rect."""
+        new_free = []
+        for fx, fy, fw, fh in self.free:
+            if x >= fx + fw or x + w <= fx or y >= fy + fh or y + h <= fy:
+                new_free.append((fx, fy, fw, fh))
+                continue
+            if x > fx:
+                new_free.append((fx, fy, x - fx, fh))
+            if x + w < fx + fw:
+                new_free.append((x + w, fy, fx + fw - (x + w), fh))
+            if y > fy:
+                new_free.append((fx, fy, fw, y - fy))
+            if y + h < fy + fh:
+                new_free.append((fx, y + h, fw, fy + fh - (y + h)))
+        self.free = new_free
+
+    def _prune_free(self):
+        """Drop free rects fully contained in another free rect."""
+        pruned = []
+        for i, a in enumerate(self.free):
+            contained = False
+            for j, b in enumerate(self.free):
+                if i == j:
+                    continue
+                if (a[0] >= b[0] and a[1] >= b[1]
+                        and a[0] + a[2] <= b[0] + b[2]
+                        and a[1] + a[3] <= b[1] + b[3]):
+                    # Keep one of two identical rects
+                    if a == b and i < j:
+                        continue
+                    contained = True
+                    break
+            if not contained:
+                pruned.append(a)
+        self.free = pruned
+
+    def used_extent(self):
+        """(width, height) actually covered by placed rects."""
+        if not self.used:
+            return 0, 0
+        return (max(x + w for x, _, w, _ in self.used),
+                max(y + h for _, y, _, h in self.used))
+
+
+def next_pow2(n):
+    """Smallest power of two >= n (and >= 1)."""
+    p = 1
+    while p < n:
+        p <<= 1
+    return p
+
+
+def pack(sizes, max_size=2048, padding=2):
+    """Pack named rects into as few power-of-two atlases as needed.
+
+    Args:
+        sizes: dict name -> (width, height)
+        max_size: largest atlas edge in pixels (power of two)
+        padding: transparent gap between rects
+
+    Returns:
+        (atlases, placements) where atlases is a list of (width, height)
+        power-of-two sizes and placements maps name -> (index, x, y, w, h).
+
+    Raises:
+        ValueError if a single rect is larger than max_size.
+    """
+    for name, (w, h) in sizes.items():
+        if w > max_size or h > max_size:
+            raise ValueError(f"{name} ({w}x{h}) exceeds atlas size {max_size}")
+
+    # Big-first ordering gives MaxRects its best results
+    remaining = sorted(sizes, key=lambda n: (-max(sizes[n]), -sizes[n][0] * sizes[n][1], n))
+    atlases = []
+    placements = {}
+
+    while remaining:
+        bin_ = MaxRectsBin(max_size, max_size, padding)
+        leftover = []
+        for name in remaining:
+            w, h = sizes[name]
+            pos = bin_.insert(w, h)
+            if pos is None:
+                leftover.append(name)
+            else:
+                placements[name] = (len(atlases), pos[0], pos[1], w, h)
+        used_w, used_h = bin_.used_extent()
+        atlases.append((next_pow2(used_w), next_pow2(used_h)))
+        remaining = leftover
+
+    return atlases, placements
@@ -0,0 +1,120 @@
+"""
+SimSoviet Asset Pipeline: Mesh Primitive Deduplication
+======================================================
+
+Shared by sovietize_kenney.py (--dedup-report / --instanced).
+
+Kenney kits reuse geometry heavily: the sample towers and houses share
+wall sections, and the same sub-meshes appear across modular pieces.
+Each mesh primitive (one object's triangles with one material slot) is
+reduced to a canonical form and hashed, so identical geometry is found
+regardless of where it sits or how the exporter ordered it:
+
+  - positions are world-space and made relative to the primitive's
+    bounding-box minimum (that minimum becomes the instance translation)
+  - positions and UVs are quantized to QUANTUM
+  - vertices are the unique (position, UV) corners in sorted order
+  - each triangle starts at its lowest index (winding is kept) and the
+    triangles are sorted
+
+Rotated or mirrored copies hash differently; they'd need a rotation on
+the instance as well, and Kenney pieces are authored axis-aligned.
+
+Plain Python + NumPy — no bpy.
+"""
+
+import hashlib
+
+import numpy as np
+
+# Position / UV quantization (world units / UV units)
+QUANTUM = 1e-4
+
+
+def canonical_primitive(positions, uvs=None, quantum=QUANTUM):
+    """Canonical form and hash of one triangle primitive.
+
+    Args:
+        positions: (M, 3, 3) world-space corner positions per triangle
+        uvs: (M, 3, 2) corner UVs, or None
+
+    Returns dict with
+        "hash"      SHA-256 hex of the canonical buffers
+        "origin"    (3,) bounding-box minimum (the instance translation)
+        "vertices"  (V, 3) float32 positions relative to origin
+        "uvs"       (V, 2) float32, or None
+        "indices"   (M, 3) int32
+    """
+    corners = np.asarray(positions, np.float64).reshape(-1, 3)
+    origin = corners.min(axis=0) if len(corners) else np.zeros(3)
+    keys = np.round((corners - origin) / quantum).astype(np.int64)
+    if uvs is not None:
+        uv_keys = np.round(np.asarray(uvs, np.float64).reshape(-1, 2) / quantum).astype(np.int64)
+        keys = np.concatenate([keys, uv_keys], axis=1)
+
+    unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+    tris = inverse.reshape(-1, 3)
+
+    # Rotate each triangle to start at its lowest index (keeps winding), then sort
+    start = tris.argmin(axis=1)
+    tris = np.take_along_axis(tris, (start[:, None] + np.arange(3)) % 3, axis=1)
+    tris = tris[np.lexsort(tris.T[::-1])].astype(np.int32)
+
+    h = hashlib.sha256()
+    h.update(np.array([len(unique), unique.shape[1], len(tris)], "<i8").tobytes())
+    h.update(unique.astype("<i8").tobytes())
+    h.update(tris.astype("<i4").tobytes())
+
+    return {
+        "hash": h.hexdigest(),
+        "origin": origin,
+        "vertices": (unique[:, :3] * quantum).astype(np.float32),
+        "uvs": (unique[:, 3:5] * quantum).astype(np.float32) if uvs is not None else None,
+        "indices": tris,
+    }
+
+
+def primitive_bytes(primitive):
+    """Uncompressed vertex + index buffer size of a canonical primitive."""
+    size = primitive["vertices"].nbytes + primitive["indices"].nbytes
+    if primitive["uvs"] is not None:
+        size += primitive["uvs"].nbytes
+    return size
+
+
+def build_report(records):
+    """Duplicate report over primitive records.
+
+    `records` are dicts with at least "hash", "asset", "object",
+    "material", "triangles" and "bytes". Returns totals plus every hash
+    seen more than once, most wasted bytes first.
+    """
+    groups = {}
+    for record in records:
+        groups.setdefault(record["hash"], []).append(record)
+
+    duplicates = []
+    for digest, group in groups.items():
+        if len(group) < 2:
+            continue
+        duplicates.append({
+            "hash": digest,
+            "count": len(group),
+            "triangles": group[0]["triangles"],
+            "bytes": group[0]["bytes"],
+            "wasted_bytes": group[0]["bytes"] * (len(group) - 1),
+            "assets": sorted({r["asset"] for r in group}),
+            "uses": [{k: r[k] for k in ("asset", "object", "material")} for r in group],
+        })
+    duplicates.sort(key=lambda d: (-d["wasted_bytes"], d["hash"]))
+
+    unique = [group[0] for group in groups.values()]
+    return {
+        "primitives": len(records),
+        "unique_primitives": len(groups),
+        "triangles": sum(r["triangles"] for r in records),
+        "unique_triangles": sum(r["triangles"] for r in unique),
+        "bytes": sum(r["bytes"] for r in records),
+        "unique_bytes": sum(r["bytes"] for r in unique),
+        "duplicates": duplicates,
+    }
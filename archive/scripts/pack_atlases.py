@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline Stage 4: Sprite Atlas Packer
+=====================================================
+
+Packs the cropped sprites from Stages 2 and 3 into a small number of
+power-of-two atlas sheets, so the game makes a handful of image requests
+and texture uploads at load time instead of one per building/tile.
+
+This is Stage 4 of the asset pipeline:
+  Stage 1: sovietize_kenney.py  (Kenney GLB -> Soviet retextured GLB)
+  Stage 2: render_sprites.py    (Soviet GLB -> Isometric building sprites)
+  Stage 3: render_hex_tiles.py  (Kenney Hex -> Soviet seasonal tile sprites)
+  Stage 4: pack_atlases.py      (Sprites -> Packed atlas sheets)
+
+Packing uses MaxRects (maxrects.py). The individual PNGs are left in
+place; both manifests are extended in place (under the same lock and
+atomic write as the Stage 2/3 merges, see manifest_io.py):
+
+    "atlases": [{"file": "sprites/soviet/atlas-0.png", "width": 2048, "height": 1024}]
+    "sprites": {"school": {..., "atlas": {"index": 0, "x": 0, "y": 0,
+                                          "w": 126, "h": 236,
+                                          "anchor_x": 59, "anchor_y": 207}}}
+
+Tiles are packed per season (tiles/<season>/atlas-N.png) since the game
+only ever draws one season at a time. The tile manifest uses the same
+"atlases" list, each descriptor tagged with its "season"; an entry's
+atlas "index" always points into that list. Rects are never rotated, so
+the atlas anchor equals the sprite anchor measured from the rect's
+top-left. Sheets left over from a run that needed more of them are
+deleted.
+
+Usage:
+    blender --background --python scripts/pack_atlases.py
+
+    # Only buildings / only tiles
+    blender --background --python scripts/pack_atlases.py -- --only sprites
+    blender --background --python scripts/pack_atlases.py -- --only tiles
+
+    # Smaller sheets for low-end GPUs
+    blender --background --python scripts/pack_atlases.py -- --max-size 1024
+"""
+
+import bpy
+import sys
+import numpy as np
+from pathlib import Path
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import maxrects  # noqa: E402
+from pixel_buffers import read_pixels, write_pixels  # noqa: E402
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+PUBLIC_DIR = PROJECT_ROOT / "app" / "public"
+SPRITE_DIR = PUBLIC_DIR / "sprites" / "soviet"
+TILE_DIR = SPRITE_DIR / "tiles"
+
+# WebGL 1 / older mobile GPUs guarantee 2048; 4096 is common but not universal
+MAX_ATLAS_SIZE = 2048
+
+# Transparent gap between packed sprites (prevents bilinear bleeding)
+ATLAS_PADDING = 2
+
+
+# ---------------------------------------------------------------------------
+# CLI argument parsing
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    args = {"only": None, "max_size": MAX_ATLAS_SIZE, "padding": ATLAS_PADDING}
+
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--only" and i + 1 < len(custom):
+                args["only"] = custom[i + 1].lower()
+                i += 2
+            elif custom[i] == "--max-size" and i + 1 < len(custom):
+                args["max_size"] = int(custom[i + 1])
+                i += 2
+            elif custom[i] == "--padding" and i + 1 < len(custom):
+                args["padding"] = int(custom[i + 1])
+                i += 2
+            else:
+                i += 1
+
+    return args
+
+
+# ---------------------------------------------------------------------------
+# Atlas building
+# ---------------------------------------------------------------------------
+
+def atlas_path(atlas_prefix, index):
+    """Public-relative path of sheet `index`, e.g. "sprites/soviet/atlas-0.png"."""
+    return f"{atlas_prefix}-{index}.png"
+
+
+def pack_entries(entries, atlas_prefix, max_size, padding, first_index=0, season=None):
+    """Pack manifest sprite entries into atlas PNGs.
+
+    Args:
+        entries: dict name -> manifest entry (with "sprite", "width",
+                 "height", "anchor_x", "anchor_y"); gains an "atlas" key
+        atlas_prefix: public-relative path prefix, e.g. "sprites/soviet/atlas"
+        first_index: position of this group's first sheet in the
+                     manifest's "atlases" list
+        season: tag for the descriptors (tile manifests)
+
+    Returns:
+        list of atlas descriptors for the manifest's "atlases" field
+    """
+    sizes = {name: (e["width"], e["height"]) for name, e in entries.items()}
+    atlas_sizes, placements = maxrects.pack(sizes, max_size, padding)
+
+    # Atlases are assembled top-down (PNG row order) and flipped once on save
+    sheets = [np.zeros((h, w, 4), dtype=np.float32) for w, h in atlas_sizes]
+
+    for name, (index, x, y, w, h) in placements.items():
+        entry = entries[name]
+        img = bpy.data.images.load(str(PUBLIC_DIR / entry["sprite"]))
+        pixels = read_pixels(img)[::-1]  # Blender rows are bottom-up
+        bpy.data.images.remove(img)
+
+        if pixels.shape[:2] != (h, w):
+            raise ValueError(
+                f"{name}: PNG is {pixels.shape[1]}x{pixels.shape[0]}, "
+                f"manifest says {w}x{h}"
+            )
+        sheets[index][y:y + h, x:x + w] = pixels
+
+        entry["atlas"] = {
+            "index": first_index + index,
+            "x": x,
+            "y": y,
+            "w": w,
+            "h": h,
+            "anchor_x": entry["anchor_x"],
+            "anchor_y": entry["anchor_y"],
+        }
+
+    atlases = []
+    for index, sheet in enumerate(sheets):
+        h, w = sheet.shape[:2]
+        rel_path = atlas_path(atlas_prefix, index)
+        out_path = PUBLIC_DIR / rel_path
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+
+        img = bpy.data.images.new(f"atlas-{index}", w, h, alpha=True)
+        write_pixels(img, sheet[::-1])
+        img.filepath_raw = str(out_path)
+        img.file_format = 'PNG'
+        img.save()
+        bpy.data.images.remove(img)
+
+        count = sum(1 for p in placements.values() if p[0] == index)
+        print(f"    {rel_path}: {w}x{h}, {count} sprites")
+        descriptor = {"file": rel_path, "width": w, "height": h}
+        if season is not None:
+            descriptor["season"] = season
+        atlases.append(descriptor)
+
+    # Sheets left over from a run that needed more of them, with their
+    # Stage 5 encodings (atlas-N.webp, atlas-N.ktx2, ...)
+    stale = len(sheets)
+    while (PUBLIC_DIR / atlas_path(atlas_prefix, stale)).exists():
+        png = PUBLIC_DIR / atlas_path(atlas_prefix, stale)
+        for path in png.parent.glob(f"{png.stem}.*"):
+            path.unlink()
+        print(f"    removed stale {atlas_path(atlas_prefix, stale)}")
+        stale += 1
+    return atlases
+
+
+def pack_building_sprites(max_size, padding):
+    manifest_path = SPRITE_DIR / "manifest.json"
+    if not manifest_path.exists():
+        print(f"  SKIP: {manifest_path} not found (run Stage 2 first)")
+        return 0
+
+    with manifest_io.locked(manifest_path):
+        manifest = manifest_io.read_json(manifest_path, default={})
+
+        sprites = manifest.get("sprites", {})
+        print(f"\n--- Buildings ({len(sprites)} sprites) ---")
+        manifest["atlases"] = pack_entries(
+            sprites, "sprites/soviet/atlas", max_size, padding
+        )
+
+        manifest_io.write_json_atomic(manifest_path, manifest)
+    return len(manifest["atlases"])
+
+
+def pack_tile_sprites(max_size, padding):
+    manifest_path = TILE_DIR / "manifest.json"
+    if not manifest_path.exists():
+        print(f"  SKIP: {manifest_path} not found (run Stage 3 first)")
+        return 0
+
+    with manifest_io.locked(manifest_path):
+        manifest = manifest_io.read_json(manifest_path, default={})
+
+        atlases = []
+        for season, tiles in manifest.get("seasons", {}).items():
+            print(f"\n--- Tiles: {season} ({len(tiles)} sprites) ---")
+            atlases += pack_entries(
+                tiles, f"sprites/soviet/tiles/{season}/atlas", max_size, padding,
+                first_index=len(atlases), season=season,
+            )
+        manifest["atlases"] = atlases
+
+        manifest_io.write_json_atomic(manifest_path, manifest)
+    return len(atlases)
+
+
+# ---------------------------------------------------------------------------
+# Pipeline orchestration
+# ---------------------------------------------------------------------------
+
+def run_atlas_pipeline():
+    args = parse_args()
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline Stage 4: Sprite Atlas Packer")
+    print(f"  Max size: {args['max_size']}")
+    print(f"  Padding:  {args['padding']}")
+    if args["only"]:
+        print(f"  Only:     {args['only']}")
+    print("=" * 60)
+
+    counts = {}
+    if args["only"] in (None, "sprites"):
+        counts["sprites"] = pack_building_sprites(args["max_size"], args["padding"])
+    if args["only"] in (None, "tiles"):
+        counts["tiles"] = pack_tile_sprites(args["max_size"], args["padding"])
+
+    print("\n" + "=" * 60)
+    print("Atlas Packing Complete")
+    for kind, n in counts.items():
+        print(f"  {kind.capitalize():9s} {n} atlases")
+    print("=" * 60)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_atlas_pipeline()
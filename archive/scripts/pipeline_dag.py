@@ -0,0 +1,534 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline: Incremental Build Driver
+==================================================
+
+Make-style driver for the whole asset pipeline. Every asset is a node in
+a dependency graph with explicit inputs and outputs:
+
+    model/<name>          Stage 1  Kenney GLB + TextureProfile + AmbientCG JPEGs
+                                   + sovietize_kenney.py code  -> soviet GLB
+    sprite/<name>         Stage 2  soviet GLB + render_sprites.py  -> sprite PNG
+    tile/<season>/<tile>  Stage 3  hex GLB + colormap source GLB
+                                   + render_hex_tiles.py  -> tile PNG
+    atlas                 Stage 4  every sprite/tile PNG + pack_atlases.py
+
+A node is stale when the fingerprint of its inputs differs from the one
+recorded after its last successful build, or an output is missing. Only
+stale nodes are rebuilt, by launching the usual stage scripts on just
+those assets (--assets / --only / --season). Editing CONCRETE_INDUSTRIAL
+therefore rebuilds the industrial GLBs, then only the sprites whose GLB
+bytes actually changed. A model whose Kenney source isn't on this machine
+is an up-to-date leaf: its exported GLB (from the Stage 1 manifest) still
+feeds Stage 2.
+
+Stage configuration (TextureProfiles, kit manifests, tile lists, paths)
+is read from the stage scripts with `ast` — they import bpy, so they
+can't be imported here. For Stage 1 those constants are fingerprinted
+per model and stripped from the code fingerprint, so a profile edit
+doesn't look like a code edit. Any other code change (comments aside)
+invalidates every node of that stage.
+
+Runs under plain Python (no bpy) — it only launches Blender.
+
+Usage:
+    # Rebuild whatever is stale
+    python3 scripts/pipeline_dag.py
+
+    # Show stale nodes and why, without building
+    python3 scripts/pipeline_dag.py --dry-run
+
+    # Forget recorded state and rebuild everything
+    python3 scripts/pipeline_dag.py --force
+
+    # Stage 1 with shared texture files, the modular bundle, LODs and/or
+    # the instance library (the sovietize_kenney.py flags of the same name)
+    python3 scripts/pipeline_dag.py --shared-textures --bundle-modular --lods --instanced
+
+State:
+    .cache/pipeline-dag.json   node -> input digests of its last good build
+"""
+
+import argparse
+import ast
+import hashlib
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import manifest_io
+import render_cache
+
+
+# ---------------------------------------------------------------------------
+# Configuration
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+MODEL_DIR = PROJECT_ROOT / "public" / "models" / "soviet"
+SPRITE_DIR = PROJECT_ROOT / "app" / "public" / "sprites" / "soviet"
+TILE_DIR = SPRITE_DIR / "tiles"
+STATE_PATH = PROJECT_ROOT / ".cache" / "pipeline-dag.json"
+
+STAGE1_SCRIPT = SCRIPT_DIR / "sovietize_kenney.py"
+STAGE2_SCRIPT = SCRIPT_DIR / "render_sprites.py"
+STAGE3_SCRIPT = SCRIPT_DIR / "render_hex_tiles.py"
+STAGE4_SCRIPT = SCRIPT_DIR / "pack_atlases.py"
+
+# Helper modules whose code changes a stage's output pixels/bytes
+# (bookkeeping helpers — cache, journal, manifest IO, metrics — don't)
+STAGE_HELPERS = {
+    STAGE1_SCRIPT: ["glb_io.py", "mesh_dedup.py"],
+    STAGE2_SCRIPT: ["pixel_buffers.py", "pixel_math.py", "render_helpers.py", "sampling_profiles.py",
+                    "sprite_densities.py"],
+    STAGE3_SCRIPT: ["pixel_buffers.py", "pixel_math.py", "render_helpers.py", "sampling_profiles.py",
+                    "sprite_densities.py"],
+    STAGE4_SCRIPT: ["maxrects.py", "pixel_buffers.py"],
+}
+
+# Top-level constants that describe *which* assets exist rather than how
+# they're built; they're fingerprinted per node, not as stage code
+STAGE1_CONFIG = {
+    "KENNEY_BASE", "MODULAR_BUILDINGS", "CITY_KIT_SUBURBAN", "BUILDING_KIT",
+    "AMBIENTCG_BASE", "BUILDING_MANIFEST", "SUBURBAN_MANIFEST",
+}
+STAGE3_CONFIG = {"HEX_KIT_DIR", "SEASONS", "TILE_CATEGORIES"}
+
+# Per-asset sample budgets from calibrate_sampling.py (sampling_profiles.py)
+SAMPLING_CALIBRATION = SCRIPT_DIR / "sampling_calibration.json"
+BUDGET_FIELDS = ("samples", "noise_threshold", "min_samples", "time_limit")
+
+# Mirrors render_sprites.SKIP_ROLES
+SKIP_ROLES = {"modular"}
+
+# Mirrors sovietize_kenney.LOD_SKIP_ROLES
+LOD_SKIP_ROLES = {"modular"}
+
+# Mirrors render_hex_tiles.load_and_remap_colormap: the Kenney colormap is
+# unpacked from this tile
+COLORMAP_SOURCE_TILE = "grass"
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Rebuild only the stale assets of the Blender asset pipeline.",
+    )
+    parser.add_argument(
+        "--blender", default=os.environ.get("BLENDER", "blender"),
+        help="Blender executable (default: $BLENDER or 'blender')",
+    )
+    parser.add_argument("--engine", default="cycles", help="cycles or eevee")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="List stale nodes and why, without building anything",
+    )
+    parser.add_argument(
+        "--force", action="store_true",
+        help="Ignore recorded state and rebuild every node",
+    )
+    parser.add_argument(
+        "--shared-textures", action="store_true",
+        help="Stage 1 writes shared texture files instead of embedding them",
+    )
+    parser.add_argument(
+        "--bundle-modular", action="store_true",
+        help="Stage 1 also bundles the modular pieces into one GLB",
+    )
+    parser.add_argument(
+        "--lods", action="store_true",
+        help="Stage 1 also exports decimated LODs (LOD_SETTINGS)",
+    )
+    parser.add_argument(
+        "--instanced", action="store_true",
+        help="Stage 1 also writes the deduplicated instance library",
+    )
+    return parser.parse_args()
+
+
+# ---------------------------------------------------------------------------
+# Reading stage configuration without bpy
+# ---------------------------------------------------------------------------
+
+def _eval_node(node, env):
+    """Evaluate the small subset of Python the stage config is written in."""
+    if isinstance(node, ast.Constant):
+        return node.value
+    if isinstance(node, ast.Name):
+        return env[node.id]
+    if isinstance(node, (ast.Tuple, ast.List)):
+        return [_eval_node(n, env) for n in node.elts]
+    if isinstance(node, ast.Dict):
+        return {_eval_node(k, env): _eval_node(v, env)
+                for k, v in zip(node.keys, node.values)}
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, ast.USub):
+        return -_eval_node(node.operand, env)
+    if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Div):
+        return Path(_eval_node(node.left, env)) / _eval_node(node.right, env)
+    if isinstance(node, ast.Call) and isinstance(node.func, ast.Name):
+        if node.func.id == "Path" and len(node.args) == 1:
+            return Path(_eval_node(node.args[0], env))
+        if node.func.id == "TextureProfile" and not node.args:
+            return {kw.arg: _eval_node(kw.value, env) for kw in node.keywords}
+    raise ValueError(f"unsupported expression: {ast.dump(node)[:60]}")
+
+
+def read_constants(script):
+    """Top-level NAME = <literal-ish> assignments of a stage script.
+
+    Assignments outside the supported subset (Euler(...), math calls,
+    anything derived from __file__) are skipped.
+    """
+    tree = ast.parse(Path(script).read_text())
+    env = {}
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign) and len(stmt.targets) == 1:
+            target, value = stmt.targets[0], stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and stmt.value is not None:
+            target, value = stmt.target, stmt.value
+        else:
+            continue
+        if not isinstance(target, ast.Name):
+            continue
+        try:
+            env[target.id] = _eval_node(value, env)
+        except (ValueError, KeyError):
+            continue
+    return env
+
+
+def code_fingerprint(script, exclude=()):
+    """Hash of a stage script's AST plus its helper modules.
+
+    Working on the AST means comment and formatting edits don't rebuild
+    anything. Top-level assignments named in `exclude` are left out.
+    """
+    tree = ast.parse(Path(script).read_text())
+    tree.body = [
+        stmt for stmt in tree.body
+        if not (isinstance(stmt, (ast.Assign, ast.AnnAssign))
+                and any(isinstance(t, ast.Name) and t.id in exclude
+                        for t in getattr(stmt, "targets", [getattr(stmt, "target", None)])))
+    ]
+    h = hashlib.sha256(ast.dump(tree).encode())
+    for helper in STAGE_HELPERS.get(Path(script), []):
+        h.update(ast.dump(ast.parse((SCRIPT_DIR / helper).read_text())).encode())
+    return h.hexdigest()
+
+
+_file_hashes = {}
+
+
+def file_hash(path):
+    """Content hash of a file (None if missing), memoized per (path, mtime, size)."""
+    path = Path(path)
+    if not path.exists():
+        return None
+    st = path.stat()
+    memo = (str(path), st.st_mtime_ns, st.st_size)
+    if memo not in _file_hashes:
+        _file_hashes[memo] = render_cache.hash_file(path)
+    return _file_hashes[memo]
+
+
+def fingerprint(inputs):
+    return hashlib.sha256(json.dumps(inputs, sort_keys=True, default=str).encode()).hexdigest()
+
+
+# ---------------------------------------------------------------------------
+# Graph
+# ---------------------------------------------------------------------------
+
+def model_nodes(shared_textures=False, bundle_modular=False, lods=False, instanced=False):
+    """Stage 1 nodes: soviet_name -> (inputs, outputs, info)."""
+    cfg = read_constants(STAGE1_SCRIPT)
+    code = code_fingerprint(STAGE1_SCRIPT, exclude=STAGE1_CONFIG | {
+        name for name, value in cfg.items()
+        if isinstance(value, dict) and {"name", "roughness"} <= set(value)
+    })
+    kits = [
+        (cfg["MODULAR_BUILDINGS"], cfg["BUILDING_MANIFEST"]),
+        (cfg["CITY_KIT_SUBURBAN"], cfg["SUBURBAN_MANIFEST"]),
+    ]
+
+    nodes = {}
+    for source_dir, kit_manifest in kits:
+        for filename, (soviet_name, profile, role) in kit_manifest.items():
+            tex_dir = Path(cfg["AMBIENTCG_BASE"]) / profile["name"]
+            source = Path(source_dir) / filename
+            inputs = {
+                "source": file_hash(source),
+                "profile": profile,
+                "color": file_hash(tex_dir / f"{profile['name']}_1K-JPG_Color.jpg"),
+                "normal": file_hash(tex_dir / f"{profile['name']}_1K-JPG_NormalGL.jpg"),
+                "role": role,
+                "code": code,
+            }
+            # Only present when on, so existing builds without them stay fresh
+            if shared_textures:
+                inputs["shared_textures"] = True
+            if bundle_modular and role == "modular":
+                inputs["bundle"] = True
+            if lods and role not in LOD_SKIP_ROLES:
+                inputs["lods"] = True
+            if instanced:
+                inputs["instanced"] = True
+            nodes[soviet_name] = {
+                "inputs": inputs,
+                "outputs": [MODEL_DIR / f"{soviet_name}.glb"],
+                "source": source,
+                "filename": filename,
+                "role": role,
+            }
+    return nodes
+
+
+def calibrated_budgets(kind):
+    """name -> calibrated budget fields (timings and scores don't change pixels)."""
+    entries = manifest_io.read_json(SAMPLING_CALIBRATION, default={}).get(kind, {})
+    return {name: [e[f] for f in BUDGET_FIELDS] for name, e in entries.items()}
+
+
+def sprite_sources(models):
+    """name -> {"glb", "filename", "role"} for every model Stage 2 could render.
+
+    Starts from the Stage 1 manifest — what was actually exported, even
+    when the Kenney source is no longer on this machine — and adds the
+    model nodes, which know what this run is about to build.
+    """
+    manifest = manifest_io.read_json(MODEL_DIR / "manifest.json", default={})
+    sources = {
+        name: {"glb": PROJECT_ROOT / "public" / info["file"],
+               "filename": info.get("source"), "role": info.get("role", "")}
+        for name, info in manifest.get("assets", {}).items()
+    }
+    for name, model in models.items():
+        sources[name] = {"glb": model["outputs"][0], "filename": model["filename"],
+                         "role": model["role"]}
+    return sources
+
+
+def sprite_nodes(sources, engine):
+    """Stage 2 nodes, hashed against the Stage 1 GLBs as they are *now*."""
+    code = code_fingerprint(STAGE2_SCRIPT)
+    calibrated = calibrated_budgets("sprites")
+    nodes = {}
+    for name, model in sources.items():
+        if model["role"] in SKIP_ROLES:
+            continue
+        nodes[name] = {
+            "inputs": {
+                "glb": file_hash(model["glb"]),
+                "source": model["filename"],
+                "engine": engine,
+                "sampling": calibrated.get(name),
+                "code": code,
+            },
+            "outputs": [SPRITE_DIR / f"{name}.png"],
+        }
+    return nodes
+
+
+def tile_nodes(engine):
+    """Stage 3 nodes keyed "<season>/<tile>"."""
+    cfg = read_constants(STAGE3_SCRIPT)
+    code = code_fingerprint(STAGE3_SCRIPT, exclude=STAGE3_CONFIG)
+    hex_dir = Path(cfg["HEX_KIT_DIR"])
+    colormap = file_hash(hex_dir / f"{COLORMAP_SOURCE_TILE}.glb")
+    calibrated = calibrated_budgets("tiles")
+
+    nodes = {}
+    for season in cfg["SEASONS"]:
+        for tiles in cfg["TILE_CATEGORIES"].values():
+            for tile in tiles:
+                nodes[f"{season}/{tile}"] = {
+                    "inputs": {
+                        "glb": file_hash(hex_dir / f"{tile}.glb"),
+                        "colormap": colormap,
+                        "season": season,
+                        "engine": engine,
+                        "sampling": calibrated.get(tile),
+                        "code": code,
+                    },
+                    "outputs": [TILE_DIR / season / f"{tile}.png"],
+                    "season": season,
+                    "tile": tile,
+                }
+    return nodes
+
+
+def atlas_node(sprites, tiles):
+    """Stage 4: one node over every sprite and tile PNG."""
+    pngs = [n["outputs"][0] for n in (*sprites.values(), *tiles.values())]
+    return {
+        "inputs": {
+            "pngs": {str(p.relative_to(PROJECT_ROOT)): file_hash(p) for p in pngs},
+            "code": code_fingerprint(STAGE4_SCRIPT),
+        },
+        "outputs": [SPRITE_DIR / "atlas-0.png"],
+    }
+
+
+def input_digests(inputs):
+    """Per-input digests, kept in the state so we can say *what* changed."""
+    return {k: fingerprint(v) for k, v in inputs.items()}
+
+
+def stale_reason(key, node, state):
+    """Why `key` needs a rebuild, or None if it's up to date."""
+    recorded = state.get(key)
+    if recorded is None:
+        return "never built"
+    missing = [p for p in node["outputs"] if not p.exists()]
+    if missing:
+        return f"missing {missing[0].name}"
+    current = input_digests(node["inputs"])
+    changed = sorted(k for k in current.keys() | recorded.keys()
+                     if current.get(k) != recorded.get(k))
+    return f"changed {', '.join(changed)}" if changed else None
+
+
+def record(state, key, node):
+    state[key] = input_digests(node["inputs"])
+
+
+def stale_nodes(prefix, nodes, state, force):
+    """Print and return the stale keys of one stage."""
+    stale = []
+    for key, node in nodes.items():
+        reason = "forced" if force else stale_reason(f"{prefix}/{key}", node, state)
+        if reason:
+            stale.append(key)
+            print(f"  {prefix}/{key}: {reason}")
+    return stale
+
+
+# ---------------------------------------------------------------------------
+# Building
+# ---------------------------------------------------------------------------
+
+def run_blender(args, script, extra):
+    """Run one stage script in background Blender. Returns the exit code."""
+    cmd = [args.blender, "--background", "--factory-startup",
+           "--python", str(script), "--", *extra]
+    print(f"\n  $ {' '.join(cmd)}")
+    return subprocess.run(cmd).returncode
+
+
+def record_built(prefix, nodes, keys, state, started):
+    """Record nodes whose outputs were (re)written by the stage just run."""
+    built = 0
+    for key in keys:
+        node = nodes[key]
+        if all(p.exists() and p.stat().st_mtime >= started for p in node["outputs"]):
+            record(state, f"{prefix}/{key}", node)
+            built += 1
+    return built
+
+
+def run_dag_pipeline():
+    args = parse_args()
+    state = {} if args.force else manifest_io.read_json(STATE_PATH, default={})
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline: Incremental Build")
+    print(f"  Engine:  {args.engine}")
+    print(f"  State:   {STATE_PATH}")
+    if args.dry_run:
+        print("  Mode:    dry run")
+    print("=" * 60)
+
+    failures = []
+    counts = {}
+
+    def build(prefix, nodes, stale, script, extra_for):
+        """Run `script` for the stale keys and record what it produced."""
+        if not stale or args.dry_run:
+            counts[prefix] = (len(stale), 0)
+            return
+        started = time.time() - 1  # mtime granularity
+        for extra, keys in extra_for(stale):
+            if run_blender(args, script, extra) != 0:
+                failures.append(prefix)
+            record_built(prefix, nodes, keys, state, started)
+        built = sum(1 for k in stale
+                    if state.get(f"{prefix}/{k}") == input_digests(nodes[k]["inputs"]))
+        counts[prefix] = (len(stale), built)
+        manifest_io.write_json_atomic(STATE_PATH, state)
+
+    # Stage 1 — a model whose Kenney source is missing can't be built; its
+    # exported GLB (if any) is an up-to-date leaf that Stage 2 still renders
+    print("\nStage 1: models")
+    models = model_nodes(args.shared_textures, args.bundle_modular, args.lods, args.instanced)
+    buildable = {k: n for k, n in models.items() if n["inputs"]["source"]}
+    for name in sorted(set(models) - set(buildable)):
+        glb = models[name]["outputs"][0]
+        kept = f"keeping {glb.name}" if glb.exists() else "no GLB"
+        print(f"  model/{name}: leaf (source missing: {models[name]['source']}; {kept})")
+    stale = stale_nodes("model", buildable, state, args.force)
+    stage1_flags = (["--shared-textures"] if args.shared_textures else []) + \
+        (["--bundle-modular"] if args.bundle_modular else []) + \
+        (["--lods"] if args.lods else []) + \
+        (["--instanced"] if args.instanced else [])
+    build("model", buildable, stale, STAGE1_SCRIPT,
+          lambda keys: [(["--assets", ",".join(keys)] + stage1_flags, keys)])
+
+    # Stage 2 — fingerprints read the GLBs Stage 1 just wrote, so a model
+    # rebuilt to identical bytes doesn't re-render its sprite
+    print("\nStage 2: sprites")
+    sprites = {k: n for k, n in sprite_nodes(sprite_sources(models), args.engine).items()
+               if n["inputs"]["glb"] or (args.dry_run and k in buildable)}
+    stale = stale_nodes("sprite", sprites, state, args.force)
+    build("sprite", sprites, stale, STAGE2_SCRIPT,
+          lambda keys: [(["--engine", args.engine, "--assets", ",".join(keys)], keys)])
+
+    # Stage 3 — one Blender run per season with that season's stale tiles
+    print("\nStage 3: tiles")
+    tiles = {k: n for k, n in tile_nodes(args.engine).items() if n["inputs"]["glb"]}
+    stale = stale_nodes("tile", tiles, state, args.force)
+
+    def per_season(keys):
+        by_season = {}
+        for key in keys:
+            by_season.setdefault(tiles[key]["season"], []).append(key)
+        return [(["--engine", args.engine, "--season", season,
+                  "--only", ",".join(tiles[k]["tile"] for k in season_keys)], season_keys)
+                for season, season_keys in by_season.items()]
+
+    build("tile", tiles, stale, STAGE3_SCRIPT, per_season)
+
+    # Stage 4 — repack if any PNG changed
+    print("\nStage 4: atlas")
+    atlas = {"all": atlas_node(sprites, tiles)}
+    if not any(atlas["all"]["inputs"]["pngs"].values()):
+        atlas = {}  # nothing rendered yet
+    stale = stale_nodes("atlas", atlas, state, args.force)
+    build("atlas", atlas, stale, STAGE4_SCRIPT, lambda keys: [([], keys)])
+
+    print("\n" + "=" * 60)
+    print("Incremental Build " + ("Plan" if args.dry_run else "Complete"))
+    for prefix, (n_stale, n_built) in counts.items():
+        if args.dry_run:
+            print(f"  {prefix:7s} {n_stale} stale")
+        else:
+            print(f"  {prefix:7s} {n_built}/{n_stale} rebuilt")
+    print("=" * 60)
+
+    if failures:
+        print(f"\n  Failed stages: {', '.join(failures)}")
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_dag_pipeline()
@@ -0,0 +1,156 @@
+"""
+SimSoviet Asset Pipeline: Per-Asset Timing + Resource Report
+============================================================
+
+Shared by sovietize_kenney.py, render_sprites.py and render_hex_tiles.py.
+
+Records, per asset, wall time of each pipeline phase (import, material,
+render, crop, save/export, ...), peak RSS, output bytes and the Cycles
+sample count, then writes a JSON + CSV report and prints the slowest
+assets. Used to see which models dominate the build budget and whether
+an optimization actually helped.
+
+Instrumentation is module-level so deeply nested helpers can time
+themselves without threading a recorder through every signature:
+
+    pipeline_metrics.begin_asset("school")
+    with pipeline_metrics.phase("import"):
+        bpy.ops.import_scene.gltf(...)
+    pipeline_metrics.record(samples=64, output_bytes=path.stat().st_size)
+    pipeline_metrics.end_asset()
+    ...
+    pipeline_metrics.write_report("render_sprites", REPORT_DIR)
+
+Calls outside begin_asset()/end_asset() are ignored, so the timed
+helpers also work from render_server.py and other callers.
+
+Plain Python — no bpy.
+"""
+
+import csv
+import json
+import resource
+import sys
+import time
+from contextlib import contextmanager
+from pathlib import Path
+
+# Fixed column order for the CSV; unknown phases are appended after these
+PHASES = ("clear", "import", "material", "render", "recolor", "crop", "resample", "save",
+          "export", "textures")
+
+_assets = []
+_current = None
+
+
+def _peak_rss_mb():
+    """Process peak resident set size in MiB (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == "darwin":
+        return peak / (1024 * 1024)
+    return peak / 1024
+
+
+def begin_asset(name, **fields):
+    """Start timing an asset; any previous unfinished asset is closed."""
+    global _current
+    if _current is not None:
+        end_asset()
+    _current = {
+        "name": name,
+        "status": "ok",
+        "phases": {},
+        "_start": time.perf_counter(),
+        **fields,
+    }
+
+
+@contextmanager
+def phase(name):
+    """Accumulate wall time of the enclosed block under `name`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        if _current is not None:
+            elapsed = time.perf_counter() - start
+            _current["phases"][name] = _current["phases"].get(name, 0.0) + elapsed
+
+
+def record(**fields):
+    """Attach extra fields (output_bytes, samples, status, ...) to the asset."""
+    if _current is not None:
+        _current.update(fields)
+
+
+def end_asset(**fields):
+    """Finish the current asset, stamping total time and peak RSS."""
+    global _current
+    if _current is None:
+        return
+    _current.update(fields)
+    _current["total_s"] = round(time.perf_counter() - _current.pop("_start"), 4)
+    _current["phases"] = {k: round(v, 4) for k, v in _current["phases"].items()}
+    # Process-lifetime high-water mark: it only rises, so a jump marks the
+    # asset that pushed memory up.
+    _current["peak_rss_mb"] = round(_peak_rss_mb(), 1)
+    _assets.append(_current)
+    _current = None
+
+
+def write_report(stage, out_dir, top=10):
+    """Write <out_dir>/<stage>.json and .csv and print the slowest assets.
+
+    Returns (json_path, csv_path).
+    """
+    if _current is not None:
+        end_asset()
+
+    out_dir = Path(out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    json_path = out_dir / f"{stage}.json"
+    csv_path = out_dir / f"{stage}.csv"
+
+    phase_names = list(PHASES) + sorted(
+        {p for a in _assets for p in a["phases"]} - set(PHASES)
+    )
+    totals = {p: round(sum(a["phases"].get(p, 0.0) for a in _assets), 3)
+              for p in phase_names}
+    slowest = sorted(_assets, key=lambda a: a["total_s"], reverse=True)[:top]
+
+    report = {
+        "stage": stage,
+        "generated": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "assets": _assets,
+        "summary": {
+            "count": len(_assets),
+            "total_s": round(sum(a["total_s"] for a in _assets), 3),
+            "phase_totals_s": totals,
+            "peak_rss_mb": max((a["peak_rss_mb"] for a in _assets), default=0),
+            "output_bytes": sum(a.get("output_bytes", 0) for a in _assets),
+            "slowest": [{"name": a["name"], "total_s": a["total_s"]} for a in slowest],
+        },
+    }
+    with open(json_path, "w") as f:
+        json.dump(report, f, indent=2)
+
+    extra = sorted({k for a in _assets for k in a}
+                   - {"name", "phases", "total_s", "peak_rss_mb"})
+    with open(csv_path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["name", "total_s", *[f"{p}_s" for p in phase_names],
+                         "peak_rss_mb", *extra])
+        for a in _assets:
+            writer.writerow([
+                a["name"], a["total_s"],
+                *[a["phases"].get(p, "") for p in phase_names],
+                a["peak_rss_mb"],
+                *[a.get(k, "") for k in extra],
+            ])
+
+    print(f"\n  Slowest assets ({stage}):")
+    for a in slowest:
+        worst = max(a["phases"].items(), key=lambda kv: kv[1], default=("-", 0))
+        print(f"    {a['total_s']:8.2f}s  {a['name']:<28s} (most: {worst[0]} {worst[1]:.2f}s)")
+
+    return json_path, csv_path
@@ -0,0 +1,47 @@
+"""
+SimSoviet Asset Pipeline: Blender Image <-> NumPy Pixel Buffers
+===============================================================
+
+Shared by render_sprites.py and render_hex_tiles.py.
+
+`img.pixels[:]` builds a Python list with one float object per channel
+(~16M objects for a 2k x 2k RGBA image), and `img.pixels[:] = arr.tolist()`
+does the same in reverse. bpy_prop_array.foreach_get/foreach_set copy
+straight between Blender's buffer and any contiguous float32 buffer, so
+the helpers here move pixels without per-element Python objects.
+
+Arrays are (H, W, 4) float32 in Blender's row order (row 0 = bottom).
+"""
+
+import numpy as np
+
+
+def read_pixels(img, out=None):
+    """Copy an image's RGBA pixels into a (H, W, 4) float32 array.
+
+    Args:
+        img: bpy.types.Image
+        out: optional preallocated float32 array with H*W*4 elements,
+             reused across calls to avoid reallocating per sprite
+
+    Returns:
+        (H, W, 4) float32 array (a view of `out` when given)
+    """
+    w, h = img.size
+    n = w * h * 4
+    if out is None or out.size != n or out.dtype != np.float32:
+        out = np.empty(n, dtype=np.float32)
+    flat = out.reshape(-1)
+    img.pixels.foreach_get(flat)
+    return flat.reshape(h, w, 4)
+
+
+def write_pixels(img, pixels):
+    """Copy a (H, W, 4) array into an image of matching size.
+
+    Non-float32 or non-contiguous input (e.g. a crop slice) is converted
+    once; float32 C-contiguous input is passed through untouched.
+    """
+    flat = np.ascontiguousarray(pixels, dtype=np.float32).reshape(-1)
+    img.pixels.foreach_set(flat)
+    img.update()
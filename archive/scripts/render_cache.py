@@ -0,0 +1,120 @@
+"""
+SimSoviet Asset Pipeline: Content-Addressed Render Cache
+========================================================
+
+Shared by render_sprites.py (Stage 2) and render_hex_tiles.py (Stage 3).
+
+A render is keyed on the SHA-256 of the source GLB bytes plus every
+parameter that changes the output image (camera rotation, PPU, padding,
+engine, samples, lighting, season colormap). On a hit the stored PNG is
+copied to the output path and its metadata (anchor, size, model_size)
+is returned, so an unchanged asset costs a file copy instead of an
+import + Cycles render.
+
+Plain Python — no bpy — so it can be imported from either Blender script
+and from tooling that only inspects the cache.
+
+Layout:
+    <cache_dir>/<key[:2]>/<key>.png       Cropped sprite exactly as written
+    <cache_dir>/<key[:2]>/<key><tag>.png  Extra outputs, e.g. "@1x" variants
+    <cache_dir>/<key[:2]>/<key>.json      Sprite metadata returned by the renderer
+"""
+
+import hashlib
+import json
+import os
+import shutil
+from pathlib import Path
+
+# Bump when renderer code changes in a way the parameters don't capture
+# (e.g. a new crop rule), invalidating every cached sprite at once.
+CACHE_VERSION = 1
+
+_CHUNK = 1 << 20
+
+
+def hash_file(path):
+    """SHA-256 hex digest of a file's bytes, streamed in 1 MiB chunks."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(_CHUNK), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def cache_key(source_path, params):
+    """Build the cache key for rendering `source_path` with `params`.
+
+    params must be JSON-serializable; keys are sorted so dict ordering
+    never changes the key.
+    """
+    h = hashlib.sha256()
+    h.update(f"v{CACHE_VERSION}\n".encode())
+    h.update(hash_file(source_path).encode())
+    h.update(json.dumps(params, sort_keys=True, default=str).encode())
+    return h.hexdigest()
+
+
+def _entry_paths(cache_dir, key):
+    base = Path(cache_dir) / key[:2]
+    return base / f"{key}.png", base / f"{key}.json"
+
+
+def _extra_path(png_path, tag):
+    return png_path.with_name(f"{png_path.stem}{tag}.png")
+
+
+def has(cache_dir, key, extras=None):
+    """True if fetch() would hit (extras: the tags it would need)."""
+    png_path, meta_path = _entry_paths(cache_dir, key)
+    return (png_path.exists() and meta_path.exists()
+            and all(_extra_path(png_path, tag).exists() for tag in extras or {}))
+
+
+def fetch(cache_dir, key, output_path, extras=None):
+    """Copy a cached render to output_path.
+
+    extras maps tag -> output path for additional files stored with the
+    render (see store()); a hit requires all of them.
+
+    Returns the stored metadata dict on a hit, None on a miss.
+    """
+    if not has(cache_dir, key, extras):
+        return None
+    png_path, meta_path = _entry_paths(cache_dir, key)
+    extras = extras or {}
+
+    with open(meta_path) as f:
+        metadata = json.load(f)
+
+    for src, dst in [(png_path, output_path),
+                     *((_extra_path(png_path, t), p) for t, p in extras.items())]:
+        dst = Path(dst)
+        dst.parent.mkdir(parents=True, exist_ok=True)
+        shutil.copyfile(src, dst)
+    return metadata
+
+
+def store(cache_dir, key, output_path, metadata, extras=None):
+    """Record a fresh render in the cache.
+
+    extras maps tag -> path of additional files to keep with the render
+    (e.g. {"@1x": ...} density variants).
+
+    The PNGs are written before the metadata and all go through a temp
+    file + rename, so an interrupted run never leaves a half entry that
+    fetch() would treat as a hit.
+    """
+    png_path, meta_path = _entry_paths(cache_dir, key)
+    png_path.parent.mkdir(parents=True, exist_ok=True)
+
+    for src, dst in [(output_path, png_path),
+                     *((p, _extra_path(png_path, t)) for t, p in (extras or {}).items())]:
+        tmp_png = dst.with_suffix(".png.tmp")
+        shutil.copyfile(src, tmp_png)
+        os.replace(tmp_png, dst)
+
+    tmp_meta = meta_path.with_suffix(".json.tmp")
+    with open(tmp_meta, "w") as f:
+        json.dump(metadata, f, indent=2)
+    os.replace(tmp_meta, meta_path)
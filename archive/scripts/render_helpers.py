@@ -0,0 +1,115 @@
+"""
+SimSoviet Asset Pipeline: Shared Blender Render Helpers
+=======================================================
+
+Shared by render_sprites.py and render_hex_tiles.py (and, through
+render_sprites.py, calibrate_sampling.py and render_server.py).
+
+The bpy side of what both renderers do identically: gathering the
+evaluated scene vertices for framing, reporting the sample count, and
+writing the density variants of a rendered sprite. The resampling
+itself lives in sprite_densities.py (plain NumPy, unit tested).
+
+Blender only.
+"""
+
+import bpy
+import numpy as np
+
+import sprite_densities
+from pixel_buffers import read_pixels, write_pixels
+
+
+# ---------------------------------------------------------------------------
+# Scene
+# ---------------------------------------------------------------------------
+
+def get_world_vertices():
+    """Gather every evaluated mesh vertex in world space as an (N, 3) array.
+
+    Uses foreach_get on the evaluated mesh (modifiers applied) so even
+    dense models cost one buffer copy per object, not a Python loop.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    chunks = []
+    for obj in bpy.context.scene.objects:
+        if obj.type != 'MESH':
+            continue
+        eval_obj = obj.evaluated_get(depsgraph)
+        mesh = eval_obj.to_mesh()
+        n = len(mesh.vertices)
+        if n:
+            co = np.empty(n * 3, dtype=np.float64)
+            mesh.vertices.foreach_get("co", co)
+            mat = np.array(eval_obj.matrix_world, dtype=np.float64)
+            chunks.append(co.reshape(n, 3) @ mat[:3, :3].T + mat[:3, 3])
+        eval_obj.to_mesh_clear()
+
+    if not chunks:
+        return np.empty((0, 3), dtype=np.float64)
+    return np.concatenate(chunks)
+
+
+def render_samples(scene):
+    """Samples per pixel of the active engine (None for Workbench)."""
+    if scene.render.engine == 'CYCLES':
+        return scene.cycles.samples
+    if scene.render.engine == 'BLENDER_WORKBENCH':
+        return None
+    return scene.eevee.taa_render_samples
+
+
+# ---------------------------------------------------------------------------
+# PNG output + density variants
+# ---------------------------------------------------------------------------
+
+def save_png(pixels, path):
+    """Write (H, W, 4) pixels in Blender row order (bottom-up) as a PNG."""
+    h, w = pixels.shape[:2]
+    img = bpy.data.images.new(path.stem, w, h, alpha=True)
+    write_pixels(img, pixels)
+    img.filepath_raw = str(path)
+    img.file_format = 'PNG'
+    img.save()
+    bpy.data.images.remove(img)
+
+
+def density_extras(output_path):
+    """Cache extras for the density PNGs beside output_path ({"@1x": path, ...})."""
+    return {
+        f"@{d}x": sprite_densities.variant_path(output_path, d)
+        for d in sprite_densities.DENSITIES if d != sprite_densities.BASE_DENSITY
+    }
+
+
+def write_density_variants(output_path, info):
+    """Write every lower density from the RENDER_DENSITY PNG.
+
+    `info` describes the rendered PNG; the returned metadata describes
+    the base density (output_path) and lists every density under
+    "densities" (width, height, anchors).
+    """
+    render_path = sprite_densities.variant_path(output_path, sprite_densities.RENDER_DENSITY)
+    img = bpy.data.images.load(str(render_path))
+    pixels = read_pixels(img)[::-1]  # PNG row order, as the anchors are
+    bpy.data.images.remove(img)
+
+    fields = ("width", "height", "anchor_x", "anchor_y")
+    densities = {sprite_densities.RENDER_DENSITY: {k: info[k] for k in fields}}
+    for d in sprite_densities.derived_densities():
+        variant, anchor_x, anchor_y = sprite_densities.derive(
+            pixels, info["anchor_x"], info["anchor_y"], d
+        )
+        save_png(variant[::-1], sprite_densities.variant_path(output_path, d))
+        densities[d] = {
+            "width": variant.shape[1],
+            "height": variant.shape[0],
+            "anchor_x": anchor_x,
+            "anchor_y": anchor_y,
+        }
+
+    return {
+        **info,
+        **densities[sprite_densities.BASE_DENSITY],
+        "densities": {str(d): densities[d] for d in sorted(densities)},
+    }
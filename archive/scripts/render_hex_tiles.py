@@ -21,28 +21,64 @@ Usage:
     # Render only winter variant
     blender --background --python scripts/render_hex_tiles.py -- --season winter
 
-    # Render a single tile (for testing)
+    # Twelve monthly palettes blended between the season keyframes
+    # (month-01 ... month-12; best combined with --recolor-post)
+    blender --background --python scripts/render_hex_tiles.py -- --months
+
+    # Render a single tile (for testing), or a comma-separated list
     blender --background --python scripts/render_hex_tiles.py -- --only grass
+    blender --background --python scripts/render_hex_tiles.py -- --only grass,dirt
 
     # Use EEVEE instead of Cycles
     blender --background --python scripts/render_hex_tiles.py -- --engine eevee
 
+    # Ignore the render cache and re-render everything
+    blender --background --python scripts/render_hex_tiles.py -- --no-cache
+
+    # Render each tile once, then recolour every season from UV + light passes
+    blender --background --python scripts/render_hex_tiles.py -- --recolor-post
+
+    # Continue a crashed/killed run, skipping tiles already journaled
+    blender --background --python scripts/render_hex_tiles.py -- --resume
+
+    # Quick drafts (4 samples, half PPU), later promoted to full quality
+    blender --background --python scripts/render_hex_tiles.py -- --draft
+    blender --background --python scripts/render_hex_tiles.py -- --promote
+
 Output:
-    app/public/sprites/soviet/tiles/winter/*.png
+    app/public/sprites/soviet/tiles/winter/*.png     (@2x; *@1x.png / *@3x.png beside them)
     app/public/sprites/soviet/tiles/mud/*.png
     app/public/sprites/soviet/tiles/summer/*.png
+    app/public/sprites/soviet/tiles/month-NN/*.png   (--months / --season month-NN)
     app/public/sprites/soviet/tiles/manifest.json
+    .cache/journals/tiles.journal.jsonl              (progress journal for --resume)
+    .cache/reports/render_hex_tiles.{json,csv}       (per-tile timing/resource report)
 """
 
 import bpy
+import hashlib
 import math
-import json
 import sys
+import tempfile
 import numpy as np
 from pathlib import Path
 from mathutils import Vector, Euler
 from bpy_extras.object_utils import world_to_camera_view
 
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import pipeline_metrics  # noqa: E402
+import pixel_math  # noqa: E402
+import render_cache  # noqa: E402
+import render_journal  # noqa: E402
+import sampling_profiles  # noqa: E402
+import sprite_densities  # noqa: E402
+from pixel_buffers import read_pixels, write_pixels  # noqa: E402
+from render_helpers import (  # noqa: E402
+    density_extras, get_world_vertices, render_samples, save_png, write_density_variants,
+)
+
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -51,6 +87,8 @@ from bpy_extras.object_utils import world_to_camera_view
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 OUTPUT_DIR = PROJECT_ROOT / "app" / "public" / "sprites" / "soviet" / "tiles"
+CACHE_DIR = PROJECT_ROOT / ".cache" / "renders" / "tiles"
+REPORT_DIR = PROJECT_ROOT / ".cache" / "reports"
 
 # Kenney Hexagon Kit source
 HEX_KIT_DIR = Path("/Volumes/home/assets/Kenney/3D assets/Hexagon Kit/Models/GLB format")
@@ -60,6 +98,31 @@ CAM_ROTATION = Euler((math.radians(60), 0, math.radians(45)), 'XYZ')
 PIXELS_PER_UNIT = 80
 FRAME_PADDING = 1.25
 
+# Rendered once at the highest density, lower ones derived (render_sprites.py)
+RENDER_PIXELS_PER_UNIT = sprite_densities.render_ppu(PIXELS_PER_UNIT)
+# Cycles sampling is budgeted per tile by TILE_CATEGORIES key or
+# calibration — see sampling_profiles.py
+
+# --draft (same trade-off as render_sprites.py)
+DRAFT_PIXELS_PER_UNIT = PIXELS_PER_UNIT // 2
+
+# Lighting: same cold overcast setup as the building sprites
+SUN_LIGHT = {
+    "energy": 3.0,
+    "color": (0.85, 0.87, 0.95),
+    "angle_deg": 30,
+    "rotation_deg": (50, -15, 30),
+}
+FILL_LIGHT = {
+    "energy": 0.8,
+    "color": (0.90, 0.88, 0.82),
+    "rotation_deg": (130, 0, -30),
+}
+WORLD_COLOR = (0.12, 0.12, 0.15, 1.0)
+WORLD_STRENGTH = 0.5
+
+SEASONS = ["winter", "mud", "summer"]
+
 # Hex tiles to render (skip building/unit models — we use our own Soviet buildings)
 TILE_CATEGORIES = {
     "terrain": [
@@ -104,94 +167,11 @@ for cat, tiles in TILE_CATEGORIES.items():
 
 
 # ---------------------------------------------------------------------------
-# Soviet Colormap Generation
+# Soviet Colormap Generation (the remap itself: pixel_math.create_soviet_colormap)
 # ---------------------------------------------------------------------------
 
-def create_soviet_colormap(original_pixels, variant="winter"):
-    """Remap Kenney's colormap palette to Soviet-themed colors.
-
-    The Kenney hex tiles all share a single 512x512 UV-mapped colormap.
-    By remapping the colors in this texture, all tiles adopt the new
-    palette simultaneously. Each variant targets a different season:
-
-      winter — Frozen tundra. Desaturated blue-gray, dark, high contrast.
-               The default Soviet look: everything is cold and bleak.
-
-      mud    — Rasputitsa (spring/autumn mud season). Warm dark browns,
-               low contrast. Roads become impassable.
-
-      summer — Brief Soviet summer. Muted greens with gray undertone.
-               Slightly brighter than winter but still depressing.
-
-    Args:
-        original_pixels: numpy array (H, W, 4) of original RGBA floats [0-1]
-        variant: "winter", "mud", or "summer"
-
-    Returns:
-        numpy array (H, W, 4) of remapped RGBA floats
-    """
-    result = original_pixels.copy()
-    rgb = result[:, :, :3].copy()
-
-    # Luminance for desaturation
-    lum = 0.299 * rgb[:, :, 0] + 0.587 * rgb[:, :, 1] + 0.114 * rgb[:, :, 2]
-
-    # Black pixel mask (unused palette regions)
-    black_mask = (original_pixels[:, :, 0] < 0.01) & \
-                 (original_pixels[:, :, 1] < 0.01) & \
-                 (original_pixels[:, :, 2] < 0.01)
-
-    if variant == "winter":
-        # Frozen tundra: desaturate hard, shift cold, darken
-        sat = 0.12
-        for c in range(3):
-            rgb[:, :, c] = lum + sat * (rgb[:, :, c] - lum)
-        rgb[:, :, 0] *= 0.82   # less red
-        rgb[:, :, 1] *= 0.86   # less green
-        rgb[:, :, 2] *= 1.05   # slight blue boost
-        rgb *= 0.65             # darken
-        # Contrast
-        mid = 0.30
-        rgb = mid + 1.35 * (rgb - mid)
-
-    elif variant == "mud":
-        # Rasputitsa: warm brown, low contrast, muddy
-        sat = 0.18
-        for c in range(3):
-            rgb[:, :, c] = lum + sat * (rgb[:, :, c] - lum)
-        rgb[:, :, 0] *= 1.08   # warm shift
-        rgb[:, :, 1] *= 0.92
-        rgb[:, :, 2] *= 0.78   # less blue (warm)
-        rgb *= 0.60             # darken
-        # Low contrast (everything muddy)
-        mid = 0.28
-        rgb = mid + 1.1 * (rgb - mid)
-
-    elif variant == "summer":
-        # Brief Soviet summer: muted green-gray
-        sat = 0.30
-        for c in range(3):
-            rgb[:, :, c] = lum + sat * (rgb[:, :, c] - lum)
-        rgb[:, :, 0] *= 0.88
-        rgb[:, :, 1] *= 0.95   # keep slight green
-        rgb[:, :, 2] *= 0.90
-        rgb *= 0.72
-        mid = 0.32
-        rgb = mid + 1.25 * (rgb - mid)
-
-    # Restore black regions
-    rgb[black_mask] = 0
-    rgb = np.clip(rgb, 0, 1)
-
-    result[:, :, :3] = rgb
-    return result
-
-
-def load_and_remap_colormap(variant="winter"):
-    """Load the original Kenney colormap and create a Soviet variant.
-
-    Returns a bpy.data.images instance with the remapped pixels.
-    """
+def find_kenney_colormap():
+    """The Kenney colormap image, importing a hex tile to get it if needed."""
     # Find the packed colormap from any loaded hex GLB
     original = None
     for img in bpy.data.images:
@@ -213,23 +193,45 @@ def load_and_remap_colormap(variant="winter"):
 
     if not original:
         raise RuntimeError("Could not find Kenney colormap texture")
+    return original
+
 
+def load_and_remap_colormaps(variants):
+    """Load the original Kenney colormap and create every Soviet variant.
+
+    All variants are graded in one batched pass (pixel_math.grade_colormaps),
+    so a full MONTHS palette set costs about as much as a single season.
+
+    Returns variant -> bpy.data.images instance with the remapped pixels.
+    Each image carries a "content_hash" custom property (SHA-256 of the
+    remapped pixels) so the render cache can key on the colormap itself.
+    """
+    original = find_kenney_colormap()
     w, h = original.size
-    pixels = np.array(original.pixels[:]).reshape(h, w, 4)
+    pixels = read_pixels(original)
 
-    remapped = create_soviet_colormap(pixels, variant)
+    remapped = pixel_math.grade_colormaps(pixels, pixel_math.grades_for(list(variants)))
 
-    img_name = f"soviet_{variant}_colormap"
-    # Remove existing if re-running
-    existing = bpy.data.images.get(img_name)
-    if existing:
-        bpy.data.images.remove(existing)
+    images = {}
+    for variant, variant_pixels in zip(variants, remapped):
+        img_name = f"soviet_{variant}_colormap"
+        # Remove existing if re-running
+        existing = bpy.data.images.get(img_name)
+        if existing:
+            bpy.data.images.remove(existing)
 
-    new_img = bpy.data.images.new(img_name, w, h, alpha=True)
-    new_img.pixels[:] = remapped.flatten().tolist()
-    new_img.pack()
+        new_img = bpy.data.images.new(img_name, w, h, alpha=True)
+        write_pixels(new_img, variant_pixels)
+        new_img.pack()
+        new_img["content_hash"] = hashlib.sha256(variant_pixels.tobytes()).hexdigest()
+        images[variant] = new_img
 
-    return new_img
+    return images
+
+
+def load_and_remap_colormap(variant="winter"):
+    """Single-variant load_and_remap_colormaps()."""
+    return load_and_remap_colormaps([variant])[variant]
 
 
 # ---------------------------------------------------------------------------
@@ -237,14 +239,24 @@ def load_and_remap_colormap(variant="winter"):
 # ---------------------------------------------------------------------------
 
 def parse_args():
-    args = {"only": None, "engine": "cycles", "season": None}
+    args = {
+        "only": None,
+        "engine": "cycles",
+        "season": None,
+        "months": False,
+        "cache": True,
+        "recolor_post": False,
+        "resume": False,
+        "draft": False,
+        "promote": False,
+    }
 
     if "--" in sys.argv:
         custom = sys.argv[sys.argv.index("--") + 1:]
         i = 0
         while i < len(custom):
             if custom[i] == "--only" and i + 1 < len(custom):
-                args["only"] = custom[i + 1]
+                args["only"] = set(custom[i + 1].split(","))
                 i += 2
             elif custom[i] == "--engine" and i + 1 < len(custom):
                 args["engine"] = custom[i + 1].lower()
@@ -252,6 +264,24 @@ def parse_args():
             elif custom[i] == "--season" and i + 1 < len(custom):
                 args["season"] = custom[i + 1].lower()
                 i += 2
+            elif custom[i] == "--months":
+                args["months"] = True
+                i += 1
+            elif custom[i] == "--no-cache":
+                args["cache"] = False
+                i += 1
+            elif custom[i] == "--recolor-post":
+                args["recolor_post"] = True
+                i += 1
+            elif custom[i] == "--resume":
+                args["resume"] = True
+                i += 1
+            elif custom[i] == "--draft":
+                args["draft"] = True
+                i += 1
+            elif custom[i] == "--promote":
+                args["promote"] = True
+                i += 1
             else:
                 i += 1
 
@@ -279,38 +309,20 @@ def clear_scene():
             bpy.data.materials.remove(block)
 
 
-def get_scene_bounds():
-    min_co = Vector((float('inf'),) * 3)
-    max_co = Vector((float('-inf'),) * 3)
-
-    for obj in bpy.context.scene.objects:
-        if obj.type != 'MESH':
-            continue
-        for corner in obj.bound_box:
-            world_co = obj.matrix_world @ Vector(corner)
-            for i in range(3):
-                min_co[i] = min(min_co[i], world_co[i])
-                max_co[i] = max(max_co[i], world_co[i])
-
-    return min_co, max_co
-
+def get_scene_bounds(world_co):
+    """World AABB of the vertices; +/-inf if there are none."""
+    if not len(world_co):
+        return Vector((float('inf'),) * 3), Vector((float('-inf'),) * 3)
+    return Vector(world_co.min(axis=0)), Vector(world_co.max(axis=0))
 
-def compute_projected_extent(min_co, max_co, cam_obj):
-    cam_inv = cam_obj.matrix_world.inverted()
 
-    corners = [
-        Vector((x, y, z))
-        for x in (min_co.x, max_co.x)
-        for y in (min_co.y, max_co.y)
-        for z in (min_co.z, max_co.z)
-    ]
+def compute_projected_extent(world_co, cam_obj):
+    """Tight camera-plane extent of the vertices: (width, height, center offset).
 
-    cam_corners = [cam_inv @ c for c in corners]
-
-    xs = [c.x for c in cam_corners]
-    ys = [c.y for c in cam_corners]
-
-    return (max(xs) - min(xs), max(ys) - min(ys))
+    A hexagon's AABB corners stick out past the hex itself, so framing on
+    the vertices keeps the frame (and auto_crop_png's discard) smaller.
+    """
+    return pixel_math.projected_extent(world_co, np.array(cam_obj.matrix_world.inverted()))
 
 
 # ---------------------------------------------------------------------------
@@ -320,29 +332,29 @@ def compute_projected_extent(min_co, max_co, cam_obj):
 def setup_lighting():
     """Cold, overcast Soviet lighting — same as building sprites."""
     sun_data = bpy.data.lights.new("soviet_sun", 'SUN')
-    sun_data.energy = 3.0
-    sun_data.color = (0.85, 0.87, 0.95)
-    sun_data.angle = math.radians(30)
+    sun_data.energy = SUN_LIGHT["energy"]
+    sun_data.color = SUN_LIGHT["color"]
+    sun_data.angle = math.radians(SUN_LIGHT["angle_deg"])
     sun_obj = bpy.data.objects.new("soviet_sun", sun_data)
     bpy.context.scene.collection.objects.link(sun_obj)
-    sun_obj.rotation_euler = Euler((
-        math.radians(50), math.radians(-15), math.radians(30),
-    ))
+    sun_obj.rotation_euler = Euler(
+        [math.radians(a) for a in SUN_LIGHT["rotation_deg"]]
+    )
 
     fill_data = bpy.data.lights.new("fill", 'SUN')
-    fill_data.energy = 0.8
-    fill_data.color = (0.90, 0.88, 0.82)
+    fill_data.energy = FILL_LIGHT["energy"]
+    fill_data.color = FILL_LIGHT["color"]
     fill_obj = bpy.data.objects.new("fill", fill_data)
     bpy.context.scene.collection.objects.link(fill_obj)
-    fill_obj.rotation_euler = Euler((
-        math.radians(130), 0, math.radians(-30),
-    ))
+    fill_obj.rotation_euler = Euler(
+        [math.radians(a) for a in FILL_LIGHT["rotation_deg"]]
+    )
 
     world = bpy.data.worlds.new("soviet_sky")
     world.use_nodes = True
     bg = world.node_tree.nodes["Background"]
-    bg.inputs["Color"].default_value = (0.12, 0.12, 0.15, 1.0)
-    bg.inputs["Strength"].default_value = 0.5
+    bg.inputs["Color"].default_value = WORLD_COLOR
+    bg.inputs["Strength"].default_value = WORLD_STRENGTH
     bpy.context.scene.world = world
 
 
@@ -350,7 +362,7 @@ def setup_lighting():
 # Render configuration
 # ---------------------------------------------------------------------------
 
-def configure_render(engine="cycles"):
+def configure_render(engine="cycles", budget=sampling_profiles.DEFAULT_BUDGET):
     scene = bpy.context.scene
     scene.render.film_transparent = True
     scene.render.image_settings.file_format = 'PNG'
@@ -359,15 +371,28 @@ def configure_render(engine="cycles"):
 
     if engine == "eevee":
         scene.render.engine = 'BLENDER_EEVEE_NEXT'
-        scene.eevee.taa_render_samples = 64
+        sampling_profiles.apply_budget(scene, budget)
+    elif engine == "workbench":
+        # Fixed studio lighting, no sampling — drafts only
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'TEXTURE'
+        scene.display.render_aa = '8'
     else:
         scene.render.engine = 'CYCLES'
         scene.cycles.device = 'CPU'
-        scene.cycles.samples = 64
+        sampling_profiles.apply_budget(scene, budget)
         scene.cycles.use_denoising = True
         scene.cycles.denoiser = 'OPENIMAGEDENOISE'
 
 
+def tile_budget(tile_name, draft=False):
+    """Sampling budget for a tile: calibrated, else its category's default."""
+    if draft:
+        return sampling_profiles.DRAFT_BUDGET
+    return sampling_profiles.budget_for("tiles", tile_name, TILE_TO_CATEGORY.get(tile_name))
+
+
 # ---------------------------------------------------------------------------
 # Auto-crop (same logic as render_sprites.py)
 # ---------------------------------------------------------------------------
@@ -375,46 +400,15 @@ def configure_render(engine="cycles"):
 def auto_crop_png(image_path, anchor_x, anchor_y):
     """Trim transparent pixels, adjust anchor point."""
     img = bpy.data.images.load(str(image_path))
-    w, h = img.size
-
-    pixels = np.array(img.pixels[:], dtype=np.float32).reshape(h, w, 4)
-    alpha = pixels[:, :, 3]
-    rows_mask = np.any(alpha > 0.01, axis=1)
-    cols_mask = np.any(alpha > 0.01, axis=0)
-
-    if not np.any(rows_mask):
-        bpy.data.images.remove(img)
-        return anchor_x, anchor_y, w, h
-
-    rmin = int(np.argmax(rows_mask))
-    rmax = int(h - 1 - np.argmax(rows_mask[::-1]))
-    cmin = int(np.argmax(cols_mask))
-    cmax = int(w - 1 - np.argmax(cols_mask[::-1]))
-
-    pad = 2
-    rmin = max(0, rmin - pad)
-    rmax = min(h - 1, rmax + pad)
-    cmin = max(0, cmin - pad)
-    cmax = min(w - 1, cmax + pad)
-
-    cropped = pixels[rmin:rmax + 1, cmin:cmax + 1, :].copy()
+    pixels = read_pixels(img)
+    cropped, anchor_x, anchor_y = pixel_math.crop_to_content(pixels, anchor_x, anchor_y)
     crop_h, crop_w = cropped.shape[:2]
 
-    new_img = bpy.data.images.new("cropped", crop_w, crop_h, alpha=True)
-    new_img.pixels[:] = cropped.flatten().tolist()
-    new_img.filepath_raw = str(image_path)
-    new_img.file_format = 'PNG'
-    new_img.save()
-
-    anchor_blender_row = (h - 1) - anchor_y
-    new_blender_row = anchor_blender_row - rmin
-    new_anchor_y = (crop_h - 1) - new_blender_row
-    new_anchor_x = anchor_x - cmin
+    if cropped is not pixels:
+        save_png(cropped, Path(image_path))
 
     bpy.data.images.remove(img)
-    bpy.data.images.remove(new_img)
-
-    return int(new_anchor_x), int(new_anchor_y), crop_w, crop_h
+    return anchor_x, anchor_y, crop_w, crop_h
 
 
 # ---------------------------------------------------------------------------
@@ -432,27 +426,148 @@ def apply_soviet_colormap(soviet_cm):
                     node.image = soviet_cm
 
 
-def render_single_tile(tile_name, soviet_cm, output_path, engine="cycles"):
+def render_params(engine, soviet_cm, draft=False, budget=None):
+    """Every setting that changes a rendered tile, for the cache key."""
+    densities = () if draft else sprite_densities.DENSITIES
+    if draft:
+        budget = sampling_profiles.DRAFT_BUDGET
+    budget = budget or sampling_profiles.DEFAULT_BUDGET
+    return {
+        "stage": "hex_tile",
+        "cam_rotation_deg": [round(math.degrees(a), 6) for a in CAM_ROTATION],
+        "pixels_per_unit": DRAFT_PIXELS_PER_UNIT if draft else RENDER_PIXELS_PER_UNIT,
+        "densities": list(densities),
+        "frame_padding": FRAME_PADDING,
+        "framing": "vertices",
+        "engine": engine,
+        "sampling": budget._asdict(),
+        "sun": SUN_LIGHT,
+        "fill": FILL_LIGHT,
+        "world": [WORLD_COLOR, WORLD_STRENGTH],
+        "colormap": soviet_cm.get("content_hash", soviet_cm.name),
+        "blender": bpy.app.version_string,
+    }
+
+
+def tile_input_hash(glb_path, engine, soviet_cm, recolor_post=False, draft=False):
+    """Cache/journal key for one tile in one season."""
+    params = render_params(engine, soviet_cm, draft, tile_budget(glb_path.stem, draft))
+    if recolor_post:
+        # Light passes + UV erosion; the old Combined-times-albedo
+        # renders were keyed "recolor_post"
+        params["mode"] = "recolor_post/light-passes"
+    return render_cache.cache_key(glb_path, params)
+
+
+def render_single_tile(tile_name, soviet_cm, output_path, engine="cycles",
+                       cache_dir=None, draft=False):
     """Import a hex tile GLB, apply Soviet colormap, render as sprite.
 
+    With cache_dir set, an identical earlier render (same GLB bytes,
+    colormap pixels and render parameters) is copied into place instead.
+    A draft prefers a cached full-quality render of the same inputs.
+
+    Renders at RENDER_PIXELS_PER_UNIT and writes every density beside
+    output_path (the @2x PNG); a draft is output_path only.
+
     Returns dict with sprite metadata, or None on failure.
     """
-    clear_scene()
-
+    extras = {} if draft else density_extras(output_path)
     glb_path = HEX_KIT_DIR / f"{tile_name}.glb"
     if not glb_path.exists():
         print(f"    MISS: {glb_path}")
         return None
 
+    if cache_dir and draft:
+        final = render_cache.fetch(
+            cache_dir, tile_input_hash(glb_path, engine, soviet_cm), output_path,
+            density_extras(output_path),
+        )
+        if final:
+            print(f"    CACHED (full quality): {final['width']}x{final['height']}")
+            pipeline_metrics.record(status="cached")
+            return final
+
+    if cache_dir:
+        key = tile_input_hash(glb_path, engine, soviet_cm, draft=draft)
+        cached = render_cache.fetch(cache_dir, key, output_path, extras)
+        if cached:
+            print(f"    CACHED: {cached['width']}x{cached['height']}  "
+                  f"anchor=({cached['anchor_x']},{cached['anchor_y']})")
+            pipeline_metrics.record(status="cached")
+            if draft:
+                sprite_densities.remove_variants(output_path)
+            return cached
+
+    scene_info = setup_tile_scene(glb_path, soviet_cm, engine, draft)
+    if scene_info is None:
+        print(f"    SKIP: No mesh in {tile_name}")
+        return None
+    cam_obj, size = scene_info
+
+    render_path = output_path if draft else sprite_densities.variant_path(
+        output_path, sprite_densities.RENDER_DENSITY
+    )
+    scene = bpy.context.scene
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    scene.render.filepath = str(render_path)
+    with pipeline_metrics.phase("render"):
+        bpy.ops.render.render(write_still=True)
+    pipeline_metrics.record(samples=render_samples(scene))
+
+    anchor_x, anchor_y = tile_anchor(cam_obj)
+
+    # Auto-crop
+    with pipeline_metrics.phase("crop"):
+        anchor_x, anchor_y, final_w, final_h = auto_crop_png(
+            render_path, anchor_x, anchor_y
+        )
+
+    file_kb = render_path.stat().st_size / 1024
+    print(f"    OK: {final_w}x{final_h}  anchor=({anchor_x},{anchor_y})  {file_kb:.0f} KB")
+
+    tile_info = {
+        "width": final_w,
+        "height": final_h,
+        "anchor_x": anchor_x,
+        "anchor_y": anchor_y,
+        "hex_size": {
+            "x": round(float(size.x), 4),
+            "y": round(float(size.y), 4),
+            "z": round(float(size.z), 4),
+        },
+    }
+    if draft:
+        tile_info.update({"draft": True, "pixels_per_unit": DRAFT_PIXELS_PER_UNIT})
+        sprite_densities.remove_variants(output_path)
+    else:
+        with pipeline_metrics.phase("resample"):
+            tile_info = write_density_variants(output_path, tile_info)
+
+    if cache_dir:
+        render_cache.store(cache_dir, key, output_path, tile_info, extras)
+
+    return tile_info
+
+
+def setup_tile_scene(glb_path, colormap_img, engine="cycles", draft=False):
+    """Import a hex tile and set up camera, framing, lighting and engine.
+
+    Returns (cam_obj, model_size), or None if the GLB has no meshes.
+    """
+    clear_scene()
+
     # Import
-    bpy.ops.import_scene.gltf(filepath=str(glb_path))
+    with pipeline_metrics.phase("import"):
+        bpy.ops.import_scene.gltf(filepath=str(glb_path))
 
     # Apply Soviet colormap
-    apply_soviet_colormap(soviet_cm)
+    with pipeline_metrics.phase("material"):
+        apply_soviet_colormap(colormap_img)
 
-    min_co, max_co = get_scene_bounds()
+    world_co = get_world_vertices()
+    min_co, max_co = get_scene_bounds(world_co)
     if min_co.x == float('inf'):
-        print(f"    SKIP: No mesh in {tile_name}")
         return None
 
     center = (min_co + max_co) / 2
@@ -467,18 +582,21 @@ def render_single_tile(tile_name, soviet_cm, output_path, engine="cycles"):
     cam_obj.rotation_euler = CAM_ROTATION
 
     bpy.context.view_layer.update()
-    forward = cam_obj.matrix_world.to_quaternion() @ Vector((0, 0, -1))
+    cam_rot = cam_obj.matrix_world.to_quaternion()
+    forward = cam_rot @ Vector((0, 0, -1))
     cam_obj.location = center - forward * 50
     bpy.context.view_layer.update()
 
-    # Frame
-    proj_w, proj_h = compute_projected_extent(min_co, max_co, cam_obj)
+    # Frame on the projected vertices, camera slid onto their center
+    proj_w, proj_h, offset = compute_projected_extent(world_co, cam_obj)
+    cam_obj.location += cam_rot @ Vector((offset[0], offset[1], 0))
+    bpy.context.view_layer.update()
     padded_h = proj_h * FRAME_PADDING
     padded_w = proj_w * FRAME_PADDING
     cam_data.ortho_scale = padded_h
 
     aspect = padded_w / padded_h if padded_h > 0.001 else 1.0
-    res_y = max(64, round(padded_h * PIXELS_PER_UNIT))
+    res_y = max(64, round(padded_h * (DRAFT_PIXELS_PER_UNIT if draft else RENDER_PIXELS_PER_UNIT)))
     res_x = max(64, round(res_y * aspect))
     res_x += res_x % 2
     res_y += res_y % 2
@@ -490,38 +608,282 @@ def render_single_tile(tile_name, soviet_cm, output_path, engine="cycles"):
 
     # Lighting & render config
     setup_lighting()
-    configure_render(engine)
+    configure_render(engine, tile_budget(glb_path.stem, draft))
+
+    return cam_obj, size
+
+
+def tile_anchor(cam_obj):
+    """Project the hex center at ground level (z=0) to PNG pixel coords.
+
+    For hex tiles, the center of the hexagon at z=0 is the anchor.
+    """
+    scene = bpy.context.scene
+    ndc = world_to_camera_view(scene, cam_obj, Vector((0, 0, 0)))
+    anchor_x = round(ndc.x * scene.render.resolution_x)
+    anchor_y = round((1.0 - ndc.y) * scene.render.resolution_y)
+    return anchor_x, anchor_y
+
+
+# ---------------------------------------------------------------------------
+# Single-pass rendering with post-process season recolouring
+# ---------------------------------------------------------------------------
+#
+# The season variants differ only in the colormap texture, so each tile can
+# be rendered once with a white colormap, keeping the diffuse and glossy
+# light passes apart, plus a UV pass. Each season is then:
+#
+#     rgb = (DiffDir + DiffInd) * srgb_to_linear(colormap[uv])
+#           + (GlossDir + GlossInd) * GlossCol        (pixel_math.recolor_from_passes)
+#
+# which is a NumPy gather instead of a Cycles render; specular highlights
+# stay untinted, and pixels whose UV is a blend of two faces take a
+# neighbour's swatch. Indirect bounce light is still computed against white
+# instead of the season palette, which slightly brightens inner corners —
+# acceptable for flat-shaded hex tiles, and the classic per-season render
+# remains the default.
+
+WHITE_COLORMAP_NAME = "soviet_white_colormap"
+
+
+def get_white_colormap():
+    """A tiny all-white stand-in colormap for the shading render."""
+    img = bpy.data.images.get(WHITE_COLORMAP_NAME)
+    if img is None:
+        img = bpy.data.images.new(WHITE_COLORMAP_NAME, 4, 4, alpha=True)
+        write_pixels(img, np.ones((4, 4, 4), dtype=np.float32))
+        img.pack()
+    return img
+
+
+# File Output slot -> Render Layers socket
+RECOLOR_PASSES = {
+    "combined": "Image",
+    "uv": "UV",
+    "diff_dir": "DiffDir",
+    "diff_ind": "DiffInd",
+    "gloss_dir": "GlossDir",
+    "gloss_ind": "GlossInd",
+    "gloss_col": "GlossCol",
+}
+
+
+def configure_recolor_passes(pass_dir):
+    """Route the Combined, UV and light passes to float EXRs via the compositor.
 
+    Blender's File Output node appends the frame number, so files land
+    as <pass_dir>/combined0001.exr, <pass_dir>/uv0001.exr, ... Passes
+    the engine doesn't produce (EEVEE has no indirect light passes) get
+    no slot and read back as None.
+    """
+    scene = bpy.context.scene
+    layer = scene.view_layers[0]
+    layer.use_pass_uv = True
+    layer.use_pass_diffuse_direct = True
+    layer.use_pass_diffuse_indirect = True
+    layer.use_pass_glossy_direct = True
+    layer.use_pass_glossy_indirect = True
+    layer.use_pass_glossy_color = True
+    scene.use_nodes = True
+    scene.render.use_compositing = True
+
+    tree = scene.node_tree
+    tree.nodes.clear()
+    layers = tree.nodes.new("CompositorNodeRLayers")
+    composite = tree.nodes.new("CompositorNodeComposite")
+    tree.links.new(layers.outputs["Image"], composite.inputs["Image"])
+
+    out = tree.nodes.new("CompositorNodeOutputFile")
+    out.base_path = str(pass_dir)
+    out.format.file_format = 'OPEN_EXR'
+    out.format.color_depth = '32'
+    out.format.color_mode = 'RGBA'
+    out.file_slots.clear()
+    for slot, socket in RECOLOR_PASSES.items():
+        source = layers.outputs.get(socket)
+        if source is None or not source.enabled:
+            continue
+        out.file_slots.new(slot)
+        tree.links.new(source, out.inputs[slot])
+
+
+def load_pass(pass_dir, slot):
+    """Read a File Output EXR back as a (H, W, 4) float32 array (None if absent)."""
+    path = next(Path(pass_dir).glob(f"{slot}*.exr"), None)
+    if path is None:
+        return None
+    img = bpy.data.images.load(str(path))
+    pixels = read_pixels(img)
+    bpy.data.images.remove(img)
+    return pixels
+
+
+def light_passes(passes):
+    """(diffuse light, glossy) from the loaded passes; missing ones count as 0.
+
+    Workbench has no light passes at all, so its white-colormap Combined
+    pass stands in for the diffuse light (the shading * albedo fallback).
+    """
+    def total(*slots):
+        found = [passes[s] for s in slots if passes[s] is not None]
+        return sum(found) if found else None
+
+    diffuse = total("diff_dir", "diff_ind")
+    gloss = total("gloss_dir", "gloss_ind")
+    if diffuse is None:
+        return passes["combined"], np.zeros_like(passes["combined"])
+    if gloss is None or passes["gloss_col"] is None:
+        return diffuse, np.zeros_like(diffuse)
+    return diffuse, gloss * passes["gloss_col"]
+
+
+def save_linear_png(pixels, output_path):
+    """Write premultiplied linear RGBA through the scene's colour management.
+
+    save_render() applies the same view transform and PNG settings a
+    regular write_still render would, so recoloured tiles match.
+    """
+    h, w = pixels.shape[:2]
+    img = bpy.data.images.new("recolored", w, h, alpha=True, float_buffer=True)
+    img.alpha_mode = 'PREMUL'
+    write_pixels(img, pixels)
     output_path.parent.mkdir(parents=True, exist_ok=True)
-    scene.render.filepath = str(output_path)
-    bpy.ops.render.render(write_still=True)
+    img.save_render(str(output_path), scene=bpy.context.scene)
+    bpy.data.images.remove(img)
 
-    # Anchor: hex center at ground level (z=0)
-    # For hex tiles, the center of the hexagon at z=0 is the anchor
-    base_center = Vector((0, 0, 0))
-    ndc = world_to_camera_view(scene, cam_obj, base_center)
-    anchor_x = round(ndc.x * res_x)
-    anchor_y = round((1.0 - ndc.y) * res_y)
 
-    # Auto-crop
-    anchor_x, anchor_y, final_w, final_h = auto_crop_png(
-        output_path, anchor_x, anchor_y
-    )
+def render_tile_all_seasons(tile_name, season_colormaps, output_paths,
+                            engine="cycles", cache_dir=None):
+    """Render a tile once and derive every season variant in post.
 
-    file_kb = output_path.stat().st_size / 1024
-    print(f"    OK: {final_w}x{final_h}  anchor=({anchor_x},{anchor_y})  {file_kb:.0f} KB")
+    Args:
+        season_colormaps: season -> Soviet colormap image
+        output_paths: season -> PNG path
 
-    return {
-        "width": final_w,
-        "height": final_h,
-        "anchor_x": anchor_x,
-        "anchor_y": anchor_y,
-        "hex_size": {
-            "x": round(float(size.x), 4),
-            "y": round(float(size.y), 4),
-            "z": round(float(size.z), 4),
+    Returns dict season -> sprite metadata (empty on failure).
+    """
+    glb_path = HEX_KIT_DIR / f"{tile_name}.glb"
+    if not glb_path.exists():
+        print(f"    MISS: {glb_path}")
+        return {}
+
+    infos = {}
+    keys = {}
+    if cache_dir:
+        for season, cm in season_colormaps.items():
+            keys[season] = tile_input_hash(glb_path, engine, cm, recolor_post=True)
+            cached = render_cache.fetch(
+                cache_dir, keys[season], output_paths[season],
+                density_extras(output_paths[season]),
+            )
+            if cached:
+                infos[season] = cached
+        if len(infos) == len(season_colormaps):
+            print(f"    CACHED: {len(infos)} seasons")
+            pipeline_metrics.record(status="cached")
+            return infos
+
+    scene_info = setup_tile_scene(glb_path, get_white_colormap(), engine)
+    if scene_info is None:
+        print(f"    SKIP: No mesh in {tile_name}")
+        return {}
+    cam_obj, size = scene_info
+
+    # Scratch EXRs stay out of the published tiles/ directory and are
+    # removed even if the render or the read-back fails
+    with tempfile.TemporaryDirectory(prefix=f"hex-passes-{tile_name}-") as pass_dir:
+        configure_recolor_passes(pass_dir)
+        with pipeline_metrics.phase("render"):
+            bpy.ops.render.render(write_still=False)
+        pipeline_metrics.record(samples=render_samples(bpy.context.scene))
+
+        passes = {slot: load_pass(pass_dir, slot) for slot in RECOLOR_PASSES}
+    combined = passes["combined"]
+    diffuse_light, glossy = light_passes(passes)
+
+    base_anchor = tile_anchor(cam_obj)
+    for season, cm in season_colormaps.items():
+        if season in infos:
+            continue
+        output_path = output_paths[season]
+        render_path = sprite_densities.variant_path(output_path, sprite_densities.RENDER_DENSITY)
+        with pipeline_metrics.phase("recolor"):
+            recolored = pixel_math.recolor_from_passes(
+                diffuse_light, glossy, passes["uv"], combined[:, :, 3], read_pixels(cm)
+            )
+        with pipeline_metrics.phase("save"):
+            save_linear_png(recolored, render_path)
+
+        with pipeline_metrics.phase("crop"):
+            anchor_x, anchor_y, final_w, final_h = auto_crop_png(render_path, *base_anchor)
+        file_kb = render_path.stat().st_size / 1024
+        print(f"    OK [{season}]: {final_w}x{final_h}  "
+              f"anchor=({anchor_x},{anchor_y})  {file_kb:.0f} KB")
+
+        infos[season] = {
+            "width": final_w,
+            "height": final_h,
+            "anchor_x": anchor_x,
+            "anchor_y": anchor_y,
+            "hex_size": {
+                "x": round(float(size.x), 4),
+                "y": round(float(size.y), 4),
+                "z": round(float(size.z), 4),
+            },
+        }
+        with pipeline_metrics.phase("resample"):
+            infos[season] = write_density_variants(output_path, infos[season])
+        if cache_dir:
+            render_cache.store(
+                cache_dir, keys[season], output_path, infos[season],
+                density_extras(output_path),
+            )
+
+    return infos
+
+
+# ---------------------------------------------------------------------------
+# Tile manifest
+# ---------------------------------------------------------------------------
+
+def build_tile_manifest(base=None):
+    """Tile manifest header with empty seasons.
+
+    Keys in `base` this stage doesn't own (e.g. Stage 4 "atlases") are
+    carried over; header fields are always regenerated.
+    """
+    manifest = dict(base or {})
+    manifest.update({
+        "version": "1.0.0",
+        "generator": "render_hex_tiles.py",
+        "camera": {
+            "projection": "orthographic",
+            "type": "dimetric_2:1",
+            "rotation_x_deg": 60,
+            "rotation_z_deg": 45,
         },
-    }
+        "scale": {
+            "pixels_per_unit": PIXELS_PER_UNIT,
+            "frame_padding": FRAME_PADDING,
+            "base_density": sprite_densities.BASE_DENSITY,
+            "densities": list(sprite_densities.DENSITIES),
+        },
+        "hex_geometry": {
+            "flat_to_flat": 1.0,
+            "pointy_to_pointy": 1.1547,
+            "column_spacing": 0.75,
+            "row_spacing": 0.5774,
+            "orientation": "flat_top",
+            "note": "Offset coordinates: odd columns shift +half row",
+        },
+        "season_keyframes": [
+            {"position": round(pos, 6), "season": season}
+            for pos, season in pixel_math.SEASON_KEYFRAMES
+        ],
+        "seasons": {},
+        "categories": TILE_CATEGORIES,
+    })
+    return manifest
 
 
 # ---------------------------------------------------------------------------
@@ -530,16 +892,43 @@ def render_single_tile(tile_name, soviet_cm, output_path, engine="cycles"):
 
 def run_hex_tile_pipeline():
     args = parse_args()
-    seasons = [args["season"]] if args["season"] else ["winter", "mud", "summer"]
+    if args["season"]:
+        seasons = [args["season"]]
+    elif args["months"]:
+        seasons = list(pixel_math.MONTHS)
+    else:
+        seasons = SEASONS
+    unknown = [s for s in seasons if s not in SEASONS and s not in pixel_math.MONTHS]
+    if unknown:
+        print(f"\nERROR: Unknown season '{unknown[0]}'")
+        print(f"Available: {', '.join(SEASONS)}, month-01 ... month-12")
+        sys.exit(1)
+    if args["draft"] and args["promote"]:
+        print("\nERROR: --draft and --promote are mutually exclusive")
+        sys.exit(1)
+    if args["recolor_post"] and (args["draft"] or args["promote"]):
+        # Drafts/promotions are per season; the shared-pass path isn't
+        print("  NOTE: --recolor-post ignored with --draft/--promote")
+        args["recolor_post"] = False
 
     print("=" * 60)
     print("SimSoviet Asset Pipeline Stage 3: Hex Tile Renderer")
     print(f"  Engine:   {args['engine']}")
     print(f"  Seasons:  {', '.join(seasons)}")
-    print(f"  PPU:      {PIXELS_PER_UNIT}")
+    if args["draft"]:
+        print(f"  Draft:    {sampling_profiles.DRAFT_BUDGET.samples} samples, "
+              f"PPU {DRAFT_PIXELS_PER_UNIT}")
+    else:
+        print(f"  PPU:      {RENDER_PIXELS_PER_UNIT} rendered, "
+              f"densities {', '.join(f'@{d}x' for d in sprite_densities.DENSITIES)}")
+    if args["promote"]:
+        print("  Promote:  drafts to full quality (changed ones re-rendered)")
     print(f"  Source:   {HEX_KIT_DIR}")
     if args["only"]:
-        print(f"  Single:   {args['only']}")
+        print(f"  Only:     {', '.join(sorted(args['only']))}")
+    print(f"  Cache:    {CACHE_DIR if args['cache'] else 'disabled'}")
+    if args["recolor_post"]:
+        print("  Mode:     single render, seasons recoloured in post")
     print("=" * 60)
 
     if not HEX_KIT_DIR.exists():
@@ -547,30 +936,129 @@ def run_hex_tile_pipeline():
         print("Expected at /Volumes/home/assets/Kenney/3D assets/Hexagon Kit/")
         sys.exit(1)
 
-    # Pre-generate all Soviet colormaps
+    # Pre-generate all Soviet colormaps (one batched grading pass)
     print("\nGenerating Soviet colormaps...")
-    soviet_colormaps = {}
-    for season in seasons:
-        cm = load_and_remap_colormap(season)
-        soviet_colormaps[season] = cm
+    soviet_colormaps = load_and_remap_colormaps(seasons)
+    for season, cm in soviet_colormaps.items():
         print(f"  {season}: {cm.size[0]}x{cm.size[1]}")
 
     # Filter tiles
     tiles_to_render = ALL_TILES
     if args["only"]:
-        if args["only"] in ALL_TILES:
-            tiles_to_render = [args["only"]]
-        else:
-            print(f"\nERROR: Unknown tile '{args['only']}'")
+        unknown = [t for t in args["only"] if t not in ALL_TILES]
+        if unknown:
+            print(f"\nERROR: Unknown tile '{', '.join(unknown)}'")
             print(f"Available tiles: {', '.join(ALL_TILES)}")
             sys.exit(1)
+        tiles_to_render = [t for t in ALL_TILES if t in args["only"]]
+
+    # Per-season tile lists; --promote narrows each to its draft entries.
+    # Drafts whose full-quality render (same GLB, colormap and params) is
+    # already cached are unchanged and restored; the rest are rendered.
+    season_tiles = {season: tiles_to_render for season in seasons}
+    if args["promote"]:
+        current = manifest_io.read_json(OUTPUT_DIR / "manifest.json", default={})
+        for season in seasons:
+            drafts = {k for k, v in current.get("seasons", {}).get(season, {}).items()
+                      if v.get("draft")}
+            season_tiles[season] = [t for t in tiles_to_render if t in drafts]
+            unchanged = [
+                t for t in season_tiles[season]
+                if args["cache"] and (HEX_KIT_DIR / f"{t}.glb").exists()
+                and render_cache.has(
+                    CACHE_DIR,
+                    tile_input_hash(HEX_KIT_DIR / f"{t}.glb", args["engine"],
+                                    soviet_colormaps[season]),
+                    density_extras(OUTPUT_DIR / season / f"{t}.png"),
+                )
+            ]
+            print(f"  Promote {season}: {len(season_tiles[season]) - len(unchanged)} changed "
+                  f"draft tiles to render, {len(unchanged)} unchanged (from the render cache)")
 
-    total = len(tiles_to_render) * len(seasons)
+    total = sum(len(tiles) for tiles in season_tiles.values())
     sprite_data = {}  # season -> tile_name -> metadata
     results = {"success": 0, "failed": 0, "skipped": 0}
 
+    # Journal of finished tiles, keyed "<season>/<tile>"
+    journal = render_journal.journal_path(OUTPUT_DIR)
+    if args["resume"]:
+        done = render_journal.load(journal)
+        print(f"\nResuming: {len(done)} tiles in {journal.name}")
+    else:
+        done = {}
+        render_journal.reset(journal)
+
     count = 0
-    for season in seasons:
+    if args["recolor_post"]:
+        sprite_data = {season: {} for season in seasons}
+        for i, tile_name in enumerate(tiles_to_render, 1):
+            category = TILE_TO_CATEGORY.get(tile_name, "unknown")
+            print(f"\n  [{i}/{len(tiles_to_render)}] {tile_name} ({category})")
+            pipeline_metrics.begin_asset(tile_name, category=category, seasons=len(seasons))
+            output_paths = {
+                season: OUTPUT_DIR / season / f"{tile_name}.png" for season in seasons
+            }
+
+            glb_path = HEX_KIT_DIR / f"{tile_name}.glb"
+            hashes = {}
+            journaled = {}
+            if glb_path.exists():
+                for season in seasons:
+                    hashes[season] = tile_input_hash(
+                        glb_path, args["engine"], soviet_colormaps[season], recolor_post=True
+                    )
+                    entry = render_journal.resumable(
+                        done, f"{season}/{tile_name}", hashes[season]
+                    )
+                    if entry:
+                        journaled[season] = entry
+
+            infos = {}
+            if len(journaled) == len(seasons):
+                print("    RESUMED: already journaled")
+            else:
+                try:
+                    infos = render_tile_all_seasons(
+                        tile_name, soviet_colormaps, output_paths, args["engine"],
+                        cache_dir=CACHE_DIR if args["cache"] else None,
+                    )
+                except Exception as e:
+                    print(f"    FAIL: {e}")
+                    import traceback
+                    traceback.print_exc()
+
+            if len(journaled) == len(seasons):
+                pipeline_metrics.end_asset(status="resumed")
+            elif not infos:
+                pipeline_metrics.end_asset(status="failed")
+            else:
+                pipeline_metrics.end_asset(output_bytes=sum(
+                    output_paths[season].stat().st_size for season in infos
+                ))
+
+            for season in seasons:
+                if season in infos:
+                    entry = sprite_densities.with_density_paths({
+                        "sprite": f"sprites/soviet/tiles/{season}/{tile_name}.png",
+                        "category": category,
+                        **infos[season],
+                    }, PIXELS_PER_UNIT)
+                    render_journal.append(
+                        journal, f"{season}/{tile_name}", hashes[season],
+                        output_paths[season], entry,
+                    )
+                else:
+                    entry = journaled.get(season)
+                if entry:
+                    results["success"] += 1
+                    sprite_data[season][tile_name] = entry
+                else:
+                    results["failed"] += 1
+        seasons_to_render = []
+    else:
+        seasons_to_render = seasons
+
+    for season in seasons_to_render:
         print(f"\n{'─' * 40}")
         print(f"Season: {season.upper()}")
         print(f"{'─' * 40}")
@@ -578,67 +1066,76 @@ def run_hex_tile_pipeline():
         soviet_cm = soviet_colormaps[season]
         season_sprites = {}
 
-        for tile_name in tiles_to_render:
+        for tile_name in season_tiles[season]:
             count += 1
             category = TILE_TO_CATEGORY.get(tile_name, "unknown")
             print(f"\n  [{count}/{total}] {tile_name} ({category})")
+            pipeline_metrics.begin_asset(f"{season}/{tile_name}", category=category)
 
             output_path = OUTPUT_DIR / season / f"{tile_name}.png"
 
+            glb_path = HEX_KIT_DIR / f"{tile_name}.glb"
+            input_hash = None
+            if glb_path.exists():
+                input_hash = tile_input_hash(
+                    glb_path, args["engine"], soviet_cm, draft=args["draft"]
+                )
+                journaled = render_journal.resumable(
+                    done, f"{season}/{tile_name}", input_hash
+                )
+                if journaled:
+                    print("    RESUMED: already journaled")
+                    pipeline_metrics.end_asset(status="resumed")
+                    results["success"] += 1
+                    season_sprites[tile_name] = journaled
+                    continue
+
             try:
                 info = render_single_tile(
-                    tile_name, soviet_cm, output_path, args["engine"]
+                    tile_name, soviet_cm, output_path, args["engine"],
+                    cache_dir=CACHE_DIR if args["cache"] else None,
+                    draft=args["draft"],
                 )
                 if info:
                     results["success"] += 1
-                    season_sprites[tile_name] = {
+                    season_sprites[tile_name] = sprite_densities.with_density_paths({
                         "sprite": f"sprites/soviet/tiles/{season}/{tile_name}.png",
                         "category": category,
                         **info,
-                    }
+                    }, PIXELS_PER_UNIT)
+                    render_journal.append(
+                        journal, f"{season}/{tile_name}", input_hash,
+                        output_path, season_sprites[tile_name],
+                    )
+                    pipeline_metrics.end_asset(output_bytes=output_path.stat().st_size)
                 else:
                     results["failed"] += 1
+                    pipeline_metrics.end_asset(status="failed")
             except Exception as e:
                 print(f"    FAIL: {e}")
                 import traceback
                 traceback.print_exc()
                 results["failed"] += 1
+                pipeline_metrics.end_asset(status="failed")
 
         sprite_data[season] = season_sprites
 
-    # Write manifest
-    manifest = {
-        "version": "1.0.0",
-        "generator": "render_hex_tiles.py",
-        "camera": {
-            "projection": "orthographic",
-            "type": "dimetric_2:1",
-            "rotation_x_deg": 60,
-            "rotation_z_deg": 45,
-        },
-        "scale": {
-            "pixels_per_unit": PIXELS_PER_UNIT,
-            "frame_padding": FRAME_PADDING,
-        },
-        "hex_geometry": {
-            "flat_to_flat": 1.0,
-            "pointy_to_pointy": 1.1547,
-            "column_spacing": 0.75,
-            "row_spacing": 0.5774,
-            "orientation": "flat_top",
-            "note": "Offset coordinates: odd columns shift +half row",
-        },
-        "seasons": {},
-        "categories": TILE_CATEGORIES,
-    }
-
-    for season, sprites in sprite_data.items():
-        manifest["seasons"][season] = sprites
-
+    # Merge into the existing manifest: seasons and tiles not rendered in
+    # this run (--season / --only) keep their entries, tiles whose Kenney
+    # GLB is gone are pruned, and Stage 4 keys are carried over.
     manifest_path = OUTPUT_DIR / "manifest.json"
-    manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(manifest_path, "w") as f:
-        json.dump(manifest, f, indent=2)
+    valid_tiles = {t for t in ALL_TILES if (HEX_KIT_DIR / f"{t}.glb").exists()}
+    with manifest_io.locked(manifest_path):
+        existing = manifest_io.read_json(manifest_path, default={})
+        manifest = build_tile_manifest(existing)
+        old_seasons = existing.get("seasons", {})
+        for season in {**old_seasons, **sprite_data}:
+            manifest["seasons"][season] = manifest_io.merge_entries(
+                old_seasons.get(season, {}), sprite_data.get(season, {}), valid_tiles
+            )
+        manifest_io.write_json_atomic(manifest_path, manifest)
+
+    report_path, _ = pipeline_metrics.write_report("render_hex_tiles", REPORT_DIR)
 
     # Summary
     print(f"\n{'=' * 60}")
@@ -648,6 +1145,7 @@ def run_hex_tile_pipeline():
     print(f"  Seasons:   {', '.join(seasons)}")
     print(f"  Output:    {OUTPUT_DIR}/")
     print(f"  Manifest:  {manifest_path}")
+    print(f"  Report:    {report_path}")
     print(f"{'=' * 60}")
 
 
@@ -0,0 +1,108 @@
+"""
+SimSoviet Asset Pipeline: Per-Asset Render Journal
+==================================================
+
+Shared by render_sprites.py and render_hex_tiles.py.
+
+Both renderers used to hold every sprite's metadata in memory until the
+very end, so a crash 40 minutes in lost the whole run. Each finished
+asset is now appended to a JSON-lines journal under .cache/journals/
+(never in app/public, which Vite ships) and fsynced. With --resume,
+assets journaled with a matching input hash (the render-cache key: GLB
+bytes + render parameters) whose PNGs — the base one and every density
+variant the entry lists — are all still on disk are skipped, and their
+manifest entries come straight from the journal.
+
+A run without --resume starts a fresh journal.
+
+Record format (one per line, last record for a key wins):
+    {"key": "school", "input_hash": "ab12...", "output": "/abs/path.png",
+     "files": ["/abs/path.png", "/abs/path@1x.png", ...],
+     "entry": {...manifest entry...}, "time": 1739000000.0}
+
+Plain Python — no bpy.
+"""
+
+import json
+import os
+import time
+from pathlib import Path
+
+import sprite_densities
+
+JOURNAL_DIR = Path(__file__).parent.parent / ".cache" / "journals"
+
+
+def journal_path(output_dir):
+    """JOURNAL_DIR/<dirname>.journal.jsonl for an output directory."""
+    return JOURNAL_DIR / f"{Path(output_dir).name}.journal.jsonl"
+
+
+def output_files(output_path, entry):
+    """The base PNG plus every density variant the entry lists."""
+    return [Path(output_path)] + [
+        sprite_densities.variant_path(output_path, int(d))
+        for d in entry.get("densities", {}) if int(d) != sprite_densities.BASE_DENSITY
+    ]
+
+
+def load(path):
+    """Read journal records into key -> record (last one wins).
+
+    A torn final line from a killed process is ignored.
+    """
+    records = {}
+    path = Path(path)
+    if not path.exists():
+        return records
+    with open(path) as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            records[rec["key"]] = rec
+    return records
+
+
+def reset(path):
+    """Start an empty journal for a fresh (non-resumed) run."""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w"):
+        pass
+
+
+def append(path, key, input_hash, output_path, entry):
+    """Durably record one finished asset."""
+    rec = {
+        "key": key,
+        "input_hash": input_hash,
+        "output": str(output_path),
+        "files": [str(p) for p in output_files(output_path, entry)],
+        "entry": entry,
+        "time": time.time(),
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a") as f:
+        f.write(json.dumps(rec) + "\n")
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def resumable(records, key, input_hash):
+    """Return the journaled entry if `key` is done with these inputs.
+
+    Every file the record lists must still exist, so a run killed
+    between the base PNG and its density variants renders again.
+    """
+    rec = records.get(key)
+    if rec is None or rec.get("input_hash") != input_hash:
+        return None
+    files = rec.get("files") or [str(p) for p in output_files(rec["output"], rec["entry"])]
+    if not all(Path(f).exists() for f in files):
+        return None
+    return rec["entry"]
@@ -0,0 +1,255 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline: Persistent Sprite Render Server
+=========================================================
+
+Long-lived Blender worker for Stage 2. Every render_sprites.py run pays
+Blender startup, add-on loading and glTF importer initialization, and
+every sprite rebuilds camera, lights, world and render settings from
+scratch. This server builds that fixed stage once and then swaps only
+the model objects per job, for interactive artist iteration and CI
+re-renders.
+
+Jobs arrive as JSON lines over a localhost TCP socket, one connection at
+a time (bpy is single-threaded). Each request line gets one response line.
+
+Usage:
+    blender --background --python scripts/render_server.py -- --port 8765
+
+    # From any shell:
+    echo '{"glb": "public/models/soviet/school.glb", "output": "/tmp/school.png"}' \\
+        | nc -q 60 127.0.0.1 8765
+
+Protocol:
+    -> {"id": 1, "glb": PATH, "output": PATH,
+        "source": "building-type-f.glb",   # optional, Stage 1 mesh filter
+        "role": "housing",                 # optional, picks the sample budget
+        "engine": "cycles", "border": true, "cache": true}   # optional
+    <- {"id": 1, "ok": true, "sprite": {...}, "seconds": 3.1}
+    <- {"id": 1, "ok": false, "error": "..."}
+
+    -> {"cmd": "ping"}        <- {"ok": true, "jobs": N}
+    -> {"cmd": "shutdown"}    <- {"ok": true}   (server exits)
+
+Relative paths resolve against the project root (archive/).
+"""
+
+import bpy
+import json
+import socket
+import sys
+import time
+import traceback
+from pathlib import Path
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import render_cache  # noqa: E402
+import render_sprites as rs  # noqa: E402
+import sampling_profiles  # noqa: E402
+import sprite_densities  # noqa: E402
+
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8765
+
+
+# ---------------------------------------------------------------------------
+# CLI argument parsing (Blender passes custom args after --)
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    args = {"host": DEFAULT_HOST, "port": DEFAULT_PORT, "engine": "cycles", "threads": None}
+
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--port" and i + 1 < len(custom):
+                args["port"] = int(custom[i + 1])
+                i += 2
+            elif custom[i] == "--host" and i + 1 < len(custom):
+                args["host"] = custom[i + 1]
+                i += 2
+            elif custom[i] == "--engine" and i + 1 < len(custom):
+                args["engine"] = custom[i + 1].lower()
+                i += 2
+            elif custom[i] == "--threads" and i + 1 < len(custom):
+                args["threads"] = int(custom[i + 1])
+                i += 2
+            else:
+                i += 1
+
+    return args
+
+
+# ---------------------------------------------------------------------------
+# Persistent stage
+# ---------------------------------------------------------------------------
+
+def build_stage(engine, threads):
+    """Create the fixed camera/lights/world/render setup once.
+
+    Returns the stage dict: the camera, the names of objects that belong
+    to the stage (never removed between jobs) and the active engine.
+    """
+    rs.clear_scene()
+    cam_obj = rs.create_camera()
+    rs.setup_lighting()
+    rs.configure_render(engine, threads)
+    return {
+        "camera": cam_obj,
+        "keep": {obj.name for obj in bpy.context.scene.objects},
+        "engine": engine,
+        "threads": threads,
+        "jobs": 0,
+    }
+
+
+def clear_models(stage):
+    """Remove the previous job's model objects, leaving the stage intact."""
+    for obj in list(bpy.context.scene.objects):
+        if obj.name not in stage["keep"]:
+            bpy.data.objects.remove(obj, do_unlink=True)
+
+    for collection in [bpy.data.meshes, bpy.data.materials, bpy.data.images]:
+        for block in list(collection):
+            if block.users == 0:
+                collection.remove(block)
+
+
+def resolve(path):
+    path = Path(path)
+    return path if path.is_absolute() else rs.PROJECT_ROOT / path
+
+
+def handle_job(stage, job):
+    """Render one sprite on the warm stage. Returns the sprite metadata."""
+    glb_path = resolve(job["glb"])
+    output_path = resolve(job["output"])
+    source = job.get("source")
+    engine = job.get("engine", stage["engine"]).lower()
+    border = job.get("border", True)
+    # Calibration entries are keyed by sprite name, i.e. the output stem
+    budget = sampling_profiles.budget_for("sprites", output_path.stem, job.get("role"))
+
+    if not glb_path.exists():
+        raise FileNotFoundError(f"GLB not found: {glb_path}")
+
+    key = None
+    if job.get("cache", True):
+        key = render_cache.cache_key(glb_path, rs.render_params(
+            engine, source, border, budget=budget,
+            # Single density at PIXELS_PER_UNIT: the server skips the variants
+            densities=(sprite_densities.BASE_DENSITY,),
+        ))
+        cached = render_cache.fetch(rs.CACHE_DIR, key, output_path)
+        if cached:
+            return cached
+
+    if engine != stage["engine"]:
+        rs.configure_render(engine, stage["threads"], budget)
+        stage["engine"] = engine
+    elif engine != "workbench":
+        sampling_profiles.apply_budget(bpy.context.scene, budget)
+
+    clear_models(stage)
+    bounds = rs.import_model(glb_path, source)
+    if bounds is None:
+        raise ValueError(f"No mesh objects in {glb_path.name}")
+    min_co, max_co = bounds
+
+    cam_obj = stage["camera"]
+    world_co = rs.get_world_vertices()
+    rs.frame_model(cam_obj, min_co, max_co, world_co)
+    sprite_info = rs.render_framed_sprite(output_path, cam_obj, min_co, max_co, border, world_co)
+
+    if key:
+        render_cache.store(rs.CACHE_DIR, key, output_path, sprite_info)
+    return sprite_info
+
+
+# ---------------------------------------------------------------------------
+# Socket loop
+# ---------------------------------------------------------------------------
+
+def serve_connection(stage, conn):
+    """Process JSON-line requests from one client until it disconnects.
+
+    Returns False when a shutdown command was received.
+    """
+    reader = conn.makefile("r", encoding="utf-8")
+    writer = conn.makefile("w", encoding="utf-8")
+
+    def reply(payload):
+        writer.write(json.dumps(payload) + "\n")
+        writer.flush()
+
+    for line in reader:
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            job = json.loads(line)
+        except json.JSONDecodeError as e:
+            reply({"ok": False, "error": f"bad JSON: {e}"})
+            continue
+
+        cmd = job.get("cmd")
+        if cmd == "ping":
+            reply({"ok": True, "jobs": stage["jobs"]})
+            continue
+        if cmd == "shutdown":
+            reply({"ok": True})
+            return False
+
+        start = time.monotonic()
+        try:
+            sprite = handle_job(stage, job)
+            stage["jobs"] += 1
+            reply({
+                "id": job.get("id"),
+                "ok": True,
+                "sprite": sprite,
+                "seconds": round(time.monotonic() - start, 3),
+            })
+        except Exception as e:
+            traceback.print_exc()
+            reply({"id": job.get("id"), "ok": False, "error": str(e)})
+
+    return True
+
+
+def run_server():
+    args = parse_args()
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline: Persistent Sprite Render Server")
+    print(f"  Engine:  {args['engine']}")
+    print(f"  Listen:  {args['host']}:{args['port']}")
+    print("=" * 60)
+
+    stage = build_stage(args["engine"], args["threads"])
+
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as srv:
+        srv.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        srv.bind((args["host"], args["port"]))
+        srv.listen(1)
+        print("  Ready.")
+
+        running = True
+        while running:
+            conn, addr = srv.accept()
+            with conn:
+                print(f"  Client: {addr[0]}:{addr[1]}")
+                running = serve_connection(stage, conn)
+
+    print(f"  Shut down after {stage['jobs']} jobs.")
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_server()
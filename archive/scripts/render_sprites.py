@@ -21,9 +21,32 @@ Usage:
     # Use EEVEE instead of Cycles (faster, requires GPU/display)
     blender --background --python scripts/render_sprites.py -- --engine eevee
 
+    # Render across several Blender workers (see render_sprites_parallel.py)
+    python3 scripts/render_sprites_parallel.py --workers 8
+
+    # Ignore the render cache and re-render everything
+    blender --background --python scripts/render_sprites.py -- --no-cache
+
+    # Render the full padded frame and trim it afterwards (pre-border behaviour)
+    blender --background --python scripts/render_sprites.py -- --no-border
+
+    # Continue a crashed/killed run, skipping sprites already journaled
+    blender --background --python scripts/render_sprites.py -- --resume
+
+    # Draft: 4-sample Cycles at half PPU (or --engine workbench) for layout
+    # work; sprites with an up-to-date full-quality cache entry use that
+    blender --background --python scripts/render_sprites.py -- --draft
+
+    # Promote every sprite the manifest still marks as a draft to full quality;
+    # drafts whose inputs are unchanged come from the render cache, the rest render
+    blender --background --python scripts/render_sprites.py -- --promote
+
 Output:
-    app/public/sprites/soviet/*.png          Transparent isometric sprite PNGs
+    app/public/sprites/soviet/*.png          Transparent isometric sprite PNGs (@2x)
+    app/public/sprites/soviet/*@{1,3}x.png   Other densities (see sprite_densities.py)
     app/public/sprites/soviet/manifest.json  Sprite metadata (dimensions, anchor points)
+    .cache/journals/soviet.journal.jsonl     Per-sprite progress journal (for --resume)
+    .cache/reports/render_sprites.{json,csv} Per-sprite timing/resource report
 """
 
 import bpy
@@ -35,6 +58,20 @@ from pathlib import Path
 from mathutils import Vector, Euler
 from bpy_extras.object_utils import world_to_camera_view
 
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import manifest_io  # noqa: E402
+import pipeline_metrics  # noqa: E402
+import pixel_math  # noqa: E402
+import render_cache  # noqa: E402
+import render_journal  # noqa: E402
+import sampling_profiles  # noqa: E402
+import sprite_densities  # noqa: E402
+from pixel_buffers import read_pixels  # noqa: E402
+from render_helpers import (  # noqa: E402
+    density_extras, get_world_vertices, render_samples, save_png, write_density_variants,
+)
+
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -45,6 +82,8 @@ PROJECT_ROOT = SCRIPT_DIR.parent
 MODEL_DIR = PROJECT_ROOT / "public" / "models" / "soviet"
 SPRITE_DIR = PROJECT_ROOT / "app" / "public" / "sprites" / "soviet"
 MANIFEST_PATH = MODEL_DIR / "manifest.json"
+CACHE_DIR = PROJECT_ROOT / ".cache" / "renders" / "sprites"
+REPORT_DIR = PROJECT_ROOT / ".cache" / "reports"
 
 # Camera: 2:1 dimetric projection (SimCity 2000 / classic isometric)
 #   X = 60 deg  ->  30 deg from horizontal (the "tilt")
@@ -59,20 +98,67 @@ CAM_ROTATION = Euler((math.radians(60), 0, math.radians(45)), 'XYZ')
 # for retina displays when the game tile is 64px wide at 1x.
 PIXELS_PER_UNIT = 80
 
+# Sprites are rendered once at the highest density (120 PPU = @3x) and
+# the @2x (PIXELS_PER_UNIT) and @1x PNGs derived — see sprite_densities.py
+RENDER_PIXELS_PER_UNIT = sprite_densities.render_ppu(PIXELS_PER_UNIT)
+
 # Padding around the model in the rendered frame (1.0 = no padding)
 FRAME_PADDING = 1.25
 
+# Transparent margin (px) kept around the silhouette after cropping
+CROP_PAD = 2
+
 # Roles that should be rendered as sprites (skip modular assembly pieces)
 SKIP_ROLES = {"modular"}
 
+# Cycles sampling (denoised with OpenImageDenoise) is budgeted per sprite
+# by role or calibration — see sampling_profiles.py
+
+# --draft: a few denoised samples (sampling_profiles.DRAFT_BUDGET) at half
+# the pixel density. Anchors and sizes in the manifest are exact for the
+# draft PNGs; entries carry "draft": true and their own pixels_per_unit
+# until --promote replaces them.
+DRAFT_PIXELS_PER_UNIT = PIXELS_PER_UNIT // 2
+
+# Lighting: cold overcast key sun + warm ground-bounce fill (see setup_lighting)
+SUN_LIGHT = {
+    "energy": 3.0,
+    "color": (0.85, 0.87, 0.95),     # Cold blue-white
+    "angle_deg": 30,                  # Soft shadow edge
+    "rotation_deg": (50, -15, 30),
+}
+FILL_LIGHT = {
+    "energy": 0.8,
+    "color": (0.90, 0.88, 0.82),
+    "rotation_deg": (130, 0, -30),
+}
+WORLD_COLOR = (0.12, 0.12, 0.15, 1.0)  # Grey Soviet sky
+WORLD_STRENGTH = 0.5
+
 
 # ---------------------------------------------------------------------------
 # CLI argument parsing (Blender passes custom args after --)
 # ---------------------------------------------------------------------------
 
 def parse_args():
-    """Parse CLI args after Blender's -- separator."""
-    args = {"only": None, "engine": "cycles"}
+    """Parse CLI args after Blender's -- separator.
+
+    --assets and --manifest-out are used by render_sprites_parallel.py to
+    hand each worker process its share of the manifest and collect a
+    partial sprite manifest back from it.
+    """
+    args = {
+        "only": None,
+        "engine": "cycles",
+        "assets": None,
+        "manifest_out": None,
+        "threads": None,
+        "cache": True,
+        "border": True,
+        "resume": False,
+        "draft": False,
+        "promote": False,
+    }
 
     if "--" in sys.argv:
         custom = sys.argv[sys.argv.index("--") + 1:]
@@ -84,6 +170,30 @@ def parse_args():
             elif custom[i] == "--engine" and i + 1 < len(custom):
                 args["engine"] = custom[i + 1].lower()
                 i += 2
+            elif custom[i] == "--assets" and i + 1 < len(custom):
+                args["assets"] = {a for a in custom[i + 1].split(",") if a}
+                i += 2
+            elif custom[i] == "--manifest-out" and i + 1 < len(custom):
+                args["manifest_out"] = Path(custom[i + 1])
+                i += 2
+            elif custom[i] == "--threads" and i + 1 < len(custom):
+                args["threads"] = int(custom[i + 1])
+                i += 2
+            elif custom[i] == "--no-cache":
+                args["cache"] = False
+                i += 1
+            elif custom[i] == "--no-border":
+                args["border"] = False
+                i += 1
+            elif custom[i] == "--resume":
+                args["resume"] = True
+                i += 1
+            elif custom[i] == "--draft":
+                args["draft"] = True
+                i += 1
+            elif custom[i] == "--promote":
+                args["promote"] = True
+                i += 1
             else:
                 i += 1
 
@@ -106,50 +216,84 @@ def clear_scene():
                 collection.remove(block)
 
 
-def get_scene_bounds():
-    """Compute world-space axis-aligned bounding box of all mesh objects.
+def get_scene_bounds(world_co=None):
+    """Compute world-space axis-aligned bounding box of all mesh vertices.
+
+    Uses the evaluated vertices (get_world_vertices) rather than each
+    object's bound_box, whose local-space corners overshoot once the
+    object is rotated. Pass world_co to reuse an already gathered array.
 
-    Returns (min_corner, max_corner) as Vector3 pairs.
+    Returns (min_corner, max_corner) as Vector3 pairs (+/-inf if no meshes).
     """
-    min_co = Vector((float('inf'),) * 3)
-    max_co = Vector((float('-inf'),) * 3)
+    if world_co is None:
+        world_co = get_world_vertices()
+    if not len(world_co):
+        return Vector((float('inf'),) * 3), Vector((float('-inf'),) * 3)
+    return Vector(world_co.min(axis=0)), Vector(world_co.max(axis=0))
 
-    for obj in bpy.context.scene.objects:
-        if obj.type != 'MESH':
-            continue
-        for corner in obj.bound_box:
-            world_co = obj.matrix_world @ Vector(corner)
-            for i in range(3):
-                min_co[i] = min(min_co[i], world_co[i])
-                max_co[i] = max(max_co[i], world_co[i])
 
-    return min_co, max_co
+def compute_projected_extent(world_co, cam_obj):
+    """Compute the model's true 2D extent as seen by the camera.
+
+    Transforms every vertex into camera space with one matmul and takes
+    the enclosing rectangle in the camera's local X-Y plane (for an
+    orthographic camera that is the silhouette's bounding box). Projecting
+    only the 8 AABB corners overestimates rotated and L-shaped buildings.
 
+    Returns (width, height, center) where center is the rectangle's
+    midpoint as a camera-local (x, y) offset from the camera axis.
+    """
+    return pixel_math.projected_extent(world_co, np.array(cam_obj.matrix_world.inverted()))
 
-def compute_projected_extent(min_co, max_co, cam_obj):
-    """Compute model's 2D extent as seen by the camera.
 
-    Projects all 8 bounding box corners into camera space and returns
-    the (width, height) of the enclosing 2D rectangle.
+def project_to_pixels(world_co, cam_obj, res_x, res_y):
+    """Project (N, 3) world points to continuous pixel coords.
 
-    For an orthographic camera, the projection is simply the model's
-    extent in the camera's local X-Y plane.
+    Same convention as world_to_camera_view scaled by the resolution:
+    x grows right, y grows UP (Blender row order, row 0 = bottom).
     """
-    cam_inv = cam_obj.matrix_world.inverted()
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    proj = np.array(cam_obj.calc_matrix_camera(depsgraph, x=res_x, y=res_y))
+    view = np.array(cam_obj.matrix_world.inverted())
+    return pixel_math.project_to_pixels(world_co, proj @ view, res_x, res_y)
 
-    corners = [
-        Vector((x, y, z))
-        for x in (min_co.x, max_co.x)
-        for y in (min_co.y, max_co.y)
-        for z in (min_co.z, max_co.z)
-    ]
 
-    cam_corners = [cam_inv @ c for c in corners]
+def silhouette_border(world_co, cam_obj, res_x, res_y, filter_px=1.5):
+    """Pixel rectangle that contains every visible pixel of the model.
 
-    xs = [c.x for c in cam_corners]
-    ys = [c.y for c in cam_corners]
+    The projected vertex extent is grown by the pixel filter radius (the
+    reach of antialiased coverage past the true edge) plus CROP_PAD, then
+    clamped to the frame. It holds everything auto_crop_png() would keep,
+    with the anchor at the same content pixel; edges may sit a pixel
+    further out (see pixel_math.crop_to_region).
 
-    return (max(xs) - min(xs), max(ys) - min(ys))
+    Returns (x0, x1, y0, y1) in Blender pixel space, half-open, y up.
+    """
+    px, py = project_to_pixels(world_co, cam_obj, res_x, res_y)
+    return pixel_math.silhouette_region(px, py, res_x, res_y, filter_px / 2.0, CROP_PAD)
+
+
+def set_render_border(scene, region):
+    """Restrict rendering to a pixel region and crop the output to it.
+
+    Blender converts border fractions to pixels by truncation, so each
+    edge is nudged half a pixel inward of the next boundary to land
+    exactly on the intended pixel.
+    """
+    res_x = scene.render.resolution_x
+    res_y = scene.render.resolution_y
+    if region is None:
+        scene.render.use_border = False
+        scene.render.use_crop_to_border = False
+        return
+
+    x0, x1, y0, y1 = region
+    scene.render.use_border = True
+    scene.render.use_crop_to_border = True
+    scene.render.border_min_x = (x0 + 0.5) / res_x
+    scene.render.border_max_x = min(1.0, (x1 + 0.5) / res_x)
+    scene.render.border_min_y = (y0 + 0.5) / res_y
+    scene.render.border_max_y = min(1.0, (y1 + 0.5) / res_y)
 
 
 # ---------------------------------------------------------------------------
@@ -168,35 +312,31 @@ def setup_lighting():
     """
     # Key light — cold, overcast sun
     sun_data = bpy.data.lights.new("soviet_sun", 'SUN')
-    sun_data.energy = 3.0
-    sun_data.color = (0.85, 0.87, 0.95)   # Cold blue-white
-    sun_data.angle = math.radians(30)       # Soft shadow edge
+    sun_data.energy = SUN_LIGHT["energy"]
+    sun_data.color = SUN_LIGHT["color"]
+    sun_data.angle = math.radians(SUN_LIGHT["angle_deg"])
     sun_obj = bpy.data.objects.new("soviet_sun", sun_data)
     bpy.context.scene.collection.objects.link(sun_obj)
-    sun_obj.rotation_euler = Euler((
-        math.radians(50),
-        math.radians(-15),
-        math.radians(30),
-    ))
+    sun_obj.rotation_euler = Euler(
+        [math.radians(a) for a in SUN_LIGHT["rotation_deg"]]
+    )
 
     # Fill light — warm ground bounce
     fill_data = bpy.data.lights.new("fill", 'SUN')
-    fill_data.energy = 0.8
-    fill_data.color = (0.90, 0.88, 0.82)
+    fill_data.energy = FILL_LIGHT["energy"]
+    fill_data.color = FILL_LIGHT["color"]
     fill_obj = bpy.data.objects.new("fill", fill_data)
     bpy.context.scene.collection.objects.link(fill_obj)
-    fill_obj.rotation_euler = Euler((
-        math.radians(130),
-        0,
-        math.radians(-30),
-    ))
+    fill_obj.rotation_euler = Euler(
+        [math.radians(a) for a in FILL_LIGHT["rotation_deg"]]
+    )
 
     # World — grey Soviet sky (environment lighting only)
     world = bpy.data.worlds.new("soviet_sky")
     world.use_nodes = True
     bg = world.node_tree.nodes["Background"]
-    bg.inputs["Color"].default_value = (0.12, 0.12, 0.15, 1.0)
-    bg.inputs["Strength"].default_value = 0.5
+    bg.inputs["Color"].default_value = WORLD_COLOR
+    bg.inputs["Strength"].default_value = WORLD_STRENGTH
     bpy.context.scene.world = world
 
 
@@ -204,15 +344,26 @@ def setup_lighting():
 # Render engine configuration
 # ---------------------------------------------------------------------------
 
-def configure_render(engine="cycles"):
+def configure_render(engine="cycles", threads=None, budget=sampling_profiles.DEFAULT_BUDGET):
     """Configure render engine and output format.
 
     Cycles (default): Reliable in headless/background mode on all platforms.
-        Uses CPU with denoising for clean results in ~64 samples.
+        Uses CPU with denoising and adaptive sampling within `budget`.
     EEVEE: Faster but requires GPU and may fail in headless mode.
+    Workbench: Rasterized with fixed studio lighting (scene lights are
+        ignored) — draft previews only.
+
+    threads pins the render thread count so several Blender workers can
+    share a machine without oversubscribing it (None = auto-detect).
     """
     scene = bpy.context.scene
 
+    if threads:
+        scene.render.threads_mode = 'FIXED'
+        scene.render.threads = threads
+    else:
+        scene.render.threads_mode = 'AUTO'
+
     # Transparent background — the game draws its own ground tiles
     scene.render.film_transparent = True
 
@@ -224,12 +375,17 @@ def configure_render(engine="cycles"):
     if engine == "eevee":
         # EEVEE (Blender 4.x = BLENDER_EEVEE_NEXT)
         scene.render.engine = 'BLENDER_EEVEE_NEXT'
-        scene.eevee.taa_render_samples = 64
+        sampling_profiles.apply_budget(scene, budget)
+    elif engine == "workbench":
+        scene.render.engine = 'BLENDER_WORKBENCH'
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'TEXTURE'
+        scene.display.render_aa = '8'
     else:
         # Cycles — works headless, CPU-only for reliability
         scene.render.engine = 'CYCLES'
         scene.cycles.device = 'CPU'
-        scene.cycles.samples = 64
+        sampling_profiles.apply_budget(scene, budget)
         scene.cycles.use_denoising = True
         scene.cycles.denoiser = 'OPENIMAGEDENOISE'
 
@@ -241,74 +397,64 @@ def configure_render(engine="cycles"):
 def auto_crop_png(image_path, anchor_x, anchor_y):
     """Trim transparent pixels from a rendered PNG sprite.
 
-    Reads the image back via Blender's API, finds the content bounding box
-    using numpy, crops it, saves back, and returns adjusted anchor + dims.
-
-    Blender stores pixels bottom-to-top (row 0 = bottom of image), while
-    PNG files and screen coordinates are top-to-bottom. The coordinate
-    conversions account for this.
+    Reads the image back into a float32 buffer (pixel_buffers.read_pixels),
+    crops it with pixel_math.crop_to_content (which also re-bases the
+    anchor from Blender's bottom-up rows to PNG's top-down ones), saves
+    back, and returns adjusted anchor + dims.
 
     Returns (anchor_x, anchor_y, width, height) in PNG coordinates (top-left origin).
     """
     img = bpy.data.images.load(str(image_path))
-    w, h = img.size
-
-    # Blender pixel array: flat RGBA floats, bottom-to-top row order
-    pixels = np.array(img.pixels[:], dtype=np.float32).reshape(h, w, 4)
-
-    # Find rows/columns with any visible content
-    alpha = pixels[:, :, 3]
-    rows_mask = np.any(alpha > 0.01, axis=1)
-    cols_mask = np.any(alpha > 0.01, axis=0)
-
-    if not np.any(rows_mask):
-        # Fully transparent — nothing to crop
-        bpy.data.images.remove(img)
-        return anchor_x, anchor_y, w, h
-
-    # Bounding box in Blender's bottom-to-top row space
-    rmin = int(np.argmax(rows_mask))
-    rmax = int(h - 1 - np.argmax(rows_mask[::-1]))
-    cmin = int(np.argmax(cols_mask))
-    cmax = int(w - 1 - np.argmax(cols_mask[::-1]))
-
-    # 2px padding to prevent edge aliasing artifacts
-    pad = 2
-    rmin = max(0, rmin - pad)
-    rmax = min(h - 1, rmax + pad)
-    cmin = max(0, cmin - pad)
-    cmax = min(w - 1, cmax + pad)
-
-    # Crop the pixel buffer (still in bottom-to-top order)
-    cropped = pixels[rmin:rmax + 1, cmin:cmax + 1, :].copy()
+    pixels = read_pixels(img)
+    cropped, anchor_x, anchor_y = pixel_math.crop_to_content(
+        pixels, anchor_x, anchor_y, pad=CROP_PAD
+    )
     crop_h, crop_w = cropped.shape[:2]
 
-    # Save cropped image (Blender expects bottom-to-top pixel data)
-    new_img = bpy.data.images.new("cropped", crop_w, crop_h, alpha=True)
-    new_img.pixels[:] = cropped.flatten().tolist()
-    new_img.filepath_raw = str(image_path)
-    new_img.file_format = 'PNG'
-    new_img.save()
-
-    # Adjust anchor from pre-crop PNG coords to post-crop PNG coords
-    #
-    # Coordinate math:
-    #   PNG row = (h - 1) - blender_row  (flips vertical axis)
-    #   anchor_y is in PNG coords (top = 0)
-    #   anchor's blender_row = (h - 1) - anchor_y
-    #   After cropping blender rows [rmin..rmax]:
-    #     new_blender_row = old_blender_row - rmin
-    #     new_anchor_y = (crop_h - 1) - new_blender_row
-    anchor_blender_row = (h - 1) - anchor_y
-    new_blender_row = anchor_blender_row - rmin
-    new_anchor_y = (crop_h - 1) - new_blender_row
-    new_anchor_x = anchor_x - cmin
-
-    # Cleanup
+    if cropped is not pixels:
+        save_png(cropped, image_path)
+
     bpy.data.images.remove(img)
-    bpy.data.images.remove(new_img)
+    return anchor_x, anchor_y, crop_w, crop_h
+
 
-    return int(new_anchor_x), int(new_anchor_y), crop_w, crop_h
+# ---------------------------------------------------------------------------
+# Render cache
+# ---------------------------------------------------------------------------
+
+def render_params(engine, source_filename=None, border=True, draft=False, budget=None,
+                  densities=sprite_densities.DENSITIES):
+    """Every setting that changes a rendered sprite, for the cache key.
+
+    Thread count is deliberately absent — it changes speed, not pixels.
+    densities are the ones written (the highest is rendered); drafts are
+    a single PNG at DRAFT_PIXELS_PER_UNIT.
+    """
+    if draft:
+        budget = sampling_profiles.DRAFT_BUDGET
+        densities = ()
+    budget = budget or sampling_profiles.DEFAULT_BUDGET
+    if draft:
+        ppu = DRAFT_PIXELS_PER_UNIT
+    else:
+        ppu = PIXELS_PER_UNIT * max(densities) // sprite_densities.BASE_DENSITY
+    return {
+        "stage": "sprite",
+        "cam_rotation_deg": [round(math.degrees(a), 6) for a in CAM_ROTATION],
+        "pixels_per_unit": ppu,
+        "densities": list(densities),
+        "frame_padding": FRAME_PADDING,
+        "framing": "vertices",
+        "engine": engine,
+        "sampling": budget._asdict(),
+        "sun": SUN_LIGHT,
+        "fill": FILL_LIGHT,
+        "world": [WORLD_COLOR, WORLD_STRENGTH],
+        "source_filename": source_filename,
+        "crop_pad": CROP_PAD,
+        "border": border,
+        "blender": bpy.app.version_string,
+    }
 
 
 # ---------------------------------------------------------------------------
@@ -346,7 +492,9 @@ def filter_to_source_mesh(source_filename):
                 bpy.data.meshes.remove(block)
 
 
-def render_single_sprite(glb_path, output_path, engine="cycles", source_filename=None):
+def render_single_sprite(glb_path, output_path, engine="cycles", source_filename=None,
+                         threads=None, cache_dir=None, border=True, input_hash=None,
+                         draft=False, budget=None):
     """Import a sovietized GLB and render it as an isometric sprite.
 
     Pipeline:
@@ -354,15 +502,106 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
       2. Create orthographic camera at 2:1 dimetric angle
       3. Frame the model (compute projected extent, set ortho_scale)
       4. Setup lighting
-      5. Render to transparent PNG
+      5. Render the silhouette region only (border + crop) to transparent PNG
       6. Compute anchor point (tile base center in image space)
-      7. Auto-crop transparent margins
+      7. Shift the anchor into the cropped region
+
+    With border=False, step 5 renders the full padded frame and step 7
+    trims it afterwards with auto_crop_png() (a second PNG encode).
+
+    With cache_dir set, a previous render of identical GLB bytes and
+    render parameters is copied into place instead (see render_cache.py).
+    input_hash, if the caller already computed the cache key, skips
+    re-hashing the GLB.
+
+    The sprite is rendered at RENDER_PIXELS_PER_UNIT and every density in
+    sprite_densities.DENSITIES is written beside output_path (which gets
+    the @2x PNG); see write_density_variants().
+
+    budget is the sprite's sampling_profiles.SampleBudget (default budget
+    if None). With draft=True the sprite is rendered with DRAFT_BUDGET at
+    DRAFT_PIXELS_PER_UNIT, as output_path only, and flagged as a draft —
+    unless the cache already holds a full-quality render of the same
+    inputs, which is used instead.
 
     Returns dict with sprite metadata, or None on failure.
     """
+    extras = {} if draft else density_extras(output_path)
+    if cache_dir and draft:
+        final = render_cache.fetch(
+            cache_dir,
+            render_cache.cache_key(
+                glb_path, render_params(engine, source_filename, border, budget=budget)
+            ),
+            output_path,
+            density_extras(output_path),
+        )
+        if final:
+            print(f"    CACHED (full quality): {final['width']}x{final['height']}")
+            pipeline_metrics.record(status="cached")
+            return final
+
+    if cache_dir:
+        key = input_hash or render_cache.cache_key(
+            glb_path, render_params(engine, source_filename, border, draft, budget)
+        )
+        cached = render_cache.fetch(cache_dir, key, output_path, extras)
+        if cached:
+            print(f"    CACHED: {cached['width']}x{cached['height']}  "
+                  f"anchor=({cached['anchor_x']},{cached['anchor_y']})")
+            pipeline_metrics.record(status="cached")
+            if draft:
+                sprite_densities.remove_variants(output_path)
+            return cached
+
     clear_scene()
 
     # 1. Import model
+    with pipeline_metrics.phase("import"):
+        bounds = import_model(glb_path, source_filename)
+    if bounds is None:
+        print(f"    SKIP: No mesh objects in {glb_path.name}")
+        return None
+    min_co, max_co = bounds
+
+    # 2. Create orthographic camera at dimetric angle
+    cam_obj = create_camera()
+
+    # 3. Frame the model on its projected vertices (gathered once, reused
+    # for the render border)
+    world_co = get_world_vertices()
+    ppu = DRAFT_PIXELS_PER_UNIT if draft else RENDER_PIXELS_PER_UNIT
+    frame_model(cam_obj, min_co, max_co, world_co, ppu)
+
+    # 4. Lighting
+    setup_lighting()
+
+    # 5-7. Render, anchor, crop
+    configure_render(engine, threads,
+                     sampling_profiles.DRAFT_BUDGET if draft
+                     else budget or sampling_profiles.DEFAULT_BUDGET)
+    if draft:
+        sprite_info = render_framed_sprite(output_path, cam_obj, min_co, max_co, border, world_co)
+        sprite_info.update({"draft": True, "pixels_per_unit": ppu})
+        sprite_densities.remove_variants(output_path)
+    else:
+        render_path = sprite_densities.variant_path(output_path, sprite_densities.RENDER_DENSITY)
+        sprite_info = render_framed_sprite(render_path, cam_obj, min_co, max_co, border, world_co)
+        # 8. Derive the lower densities from the render
+        with pipeline_metrics.phase("resample"):
+            sprite_info = write_density_variants(output_path, sprite_info)
+
+    if cache_dir:
+        render_cache.store(cache_dir, key, output_path, sprite_info, extras)
+
+    return sprite_info
+
+
+def import_model(glb_path, source_filename=None):
+    """Import a GLB (filtering Stage 1 stale meshes) and return its bounds.
+
+    Returns (min_co, max_co), or None if the file has no mesh objects.
+    """
     bpy.ops.import_scene.gltf(filepath=str(glb_path))
 
     # Filter out stale meshes from Stage 1 export bug
@@ -371,13 +610,12 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
 
     min_co, max_co = get_scene_bounds()
     if min_co.x == float('inf'):
-        print(f"    SKIP: No mesh objects in {glb_path.name}")
         return None
+    return min_co, max_co
 
-    center = (min_co + max_co) / 2
-    size = max_co - min_co
 
-    # 2. Create orthographic camera at dimetric angle
+def create_camera():
+    """Create the orthographic 2:1 dimetric camera and make it active."""
     cam_data = bpy.data.cameras.new("iso_cam")
     cam_data.type = 'ORTHO'
     cam_obj = bpy.data.objects.new("iso_cam", cam_data)
@@ -385,25 +623,44 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
     bpy.context.scene.camera = cam_obj
 
     cam_obj.rotation_euler = CAM_ROTATION
+    return cam_obj
+
+
+def frame_model(cam_obj, min_co, max_co, world_co=None, ppu=PIXELS_PER_UNIT):
+    """Aim the camera at the model and size ortho scale + resolution.
+
+    Frames on the projected extent of the actual vertices (see
+    compute_projected_extent), so the frame hugs the silhouette instead
+    of the bounding box's projection.
+
+    Returns (res_x, res_y).
+    """
+    if world_co is None:
+        world_co = get_world_vertices()
+    center = (min_co + max_co) / 2
 
     # Position camera aimed at model center, pulled back along forward axis.
     # Distance doesn't matter for ortho — it just needs to be far enough
     # that the model is within the near/far clip planes.
     bpy.context.view_layer.update()
-    forward = cam_obj.matrix_world.to_quaternion() @ Vector((0, 0, -1))
+    cam_rot = cam_obj.matrix_world.to_quaternion()
+    forward = cam_rot @ Vector((0, 0, -1))
     cam_obj.location = center - forward * 50
     bpy.context.view_layer.update()
 
-    # 3. Frame the model
-    proj_w, proj_h = compute_projected_extent(min_co, max_co, cam_obj)
+    # The silhouette's center generally isn't the bbox center's projection:
+    # slide the camera in its own plane so the tight frame is centered
+    proj_w, proj_h, offset = compute_projected_extent(world_co, cam_obj)
+    cam_obj.location += cam_rot @ Vector((offset[0], offset[1], 0))
+    bpy.context.view_layer.update()
 
     padded_h = proj_h * FRAME_PADDING
     padded_w = proj_w * FRAME_PADDING
-    cam_data.ortho_scale = padded_h
+    cam_obj.data.ortho_scale = padded_h
 
     # Resolution: proportional to model's projected size at our target PPU
     aspect = padded_w / padded_h if padded_h > 0.001 else 1.0
-    res_y = max(64, round(padded_h * PIXELS_PER_UNIT))
+    res_y = max(64, round(padded_h * ppu))
     res_x = max(64, round(res_y * aspect))
     # Ensure even dimensions (some encoders prefer this)
     res_x += res_x % 2
@@ -413,15 +670,44 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
     scene.render.resolution_x = res_x
     scene.render.resolution_y = res_y
     scene.render.resolution_percentage = 100
+    return res_x, res_y
 
-    # 4. Lighting
-    setup_lighting()
 
-    # 5. Render
-    configure_render(engine)
+def render_framed_sprite(output_path, cam_obj, min_co, max_co, border=True, world_co=None):
+    """Render the framed model, then compute the anchor and crop.
+
+    Expects the camera framed by frame_model() and lighting/engine set up.
+    Returns the sprite metadata dict.
+    """
+    scene = bpy.context.scene
+    res_x = scene.render.resolution_x
+    res_y = scene.render.resolution_y
+    center = (min_co + max_co) / 2
+    size = max_co - min_co
+
+    # 5. Render — only the silhouette region, so Cycles never traces the
+    # transparent padding and the PNG comes out already cropped
+    region = None
+    if border:
+        if world_co is None:
+            world_co = get_world_vertices()
+        if len(world_co):
+            region = silhouette_border(
+                world_co, cam_obj, res_x, res_y,
+                filter_px=scene.cycles.filter_width
+                if scene.render.engine == 'CYCLES' else 1.5,
+            )
+    set_render_border(scene, region)
+
     output_path.parent.mkdir(parents=True, exist_ok=True)
     scene.render.filepath = str(output_path)
-    bpy.ops.render.render(write_still=True)
+    with pipeline_metrics.phase("render"):
+        bpy.ops.render.render(write_still=True)
+    pipeline_metrics.record(
+        samples=render_samples(scene),
+        render_px=(region[1] - region[0]) * (region[3] - region[2]) if region
+        else res_x * res_y,
+    )
 
     # 6. Compute anchor point
     # The anchor is where the model's base center (ground-level center of the
@@ -433,10 +719,18 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
     anchor_x = round(ndc.x * res_x)
     anchor_y = round((1.0 - ndc.y) * res_y)  # Flip Y: NDC bottom=0, PNG top=0
 
-    # 7. Auto-crop
-    anchor_x, anchor_y, final_w, final_h = auto_crop_png(
-        output_path, anchor_x, anchor_y
-    )
+    # 7. Crop: re-base the anchor into the rendered region (the border
+    # output may be a pixel or so wider per edge than a trimmed one; see
+    # pixel_math.crop_to_region)
+    if region:
+        anchor_x, anchor_y, final_w, final_h = pixel_math.crop_to_region(
+            anchor_x, anchor_y, region, res_y
+        )
+    else:
+        with pipeline_metrics.phase("crop"):
+            anchor_x, anchor_y, final_w, final_h = auto_crop_png(
+                output_path, anchor_x, anchor_y
+            )
 
     file_kb = output_path.stat().st_size / 1024
     print(f"    OK: {final_w}x{final_h}  anchor=({anchor_x},{anchor_y})  {file_kb:.0f} KB")
@@ -454,21 +748,112 @@ def render_single_sprite(glb_path, output_path, engine="cycles", source_filename
     }
 
 
+# ---------------------------------------------------------------------------
+# Sprite manifest
+# ---------------------------------------------------------------------------
+
+def build_sprite_manifest(sprite_data, base=None):
+    """Assemble the sprite manifest around `sprite_data`.
+
+    Keys in `base` that this stage doesn't own (e.g. Stage 4 "atlases")
+    are carried over; header fields are always regenerated.
+    """
+    sprite_manifest = dict(base or {})
+    sprite_manifest.update({
+        "version": "1.0.0",
+        "generator": "render_sprites.py",
+        "camera": {
+            "projection": "orthographic",
+            "type": "dimetric_2:1",
+            "rotation_x_deg": 60,
+            "rotation_z_deg": 45,
+            "note": "Matches SimCity 2000 / classic isometric viewing angle",
+        },
+        "scale": {
+            "pixels_per_unit": PIXELS_PER_UNIT,
+            "frame_padding": FRAME_PADDING,
+            "base_density": sprite_densities.BASE_DENSITY,
+            "densities": list(sprite_densities.DENSITIES),
+        },
+        "sprites": sprite_data,
+        "roles": {},
+    })
+
+    # Group sprites by role
+    all_roles = sorted(set(v["role"] for v in sprite_data.values()))
+    for role in all_roles:
+        sprite_manifest["roles"][role] = sorted(
+            k for k, v in sprite_data.items() if v["role"] == role
+        )
+
+    return sprite_manifest
+
+
+def renderable_names(stage1_manifest):
+    """Stage 1 assets that should have a sprite (GLB present, not modular)."""
+    return {
+        name for name, info in stage1_manifest.get("assets", {}).items()
+        if info.get("role", "") not in SKIP_ROLES
+        and (PROJECT_ROOT / "public" / info["file"]).exists()
+    }
+
+
+def merge_sprite_manifest(path, sprite_data, valid_names):
+    """Merge freshly rendered sprites into the manifest at `path`.
+
+    Entries rendered this run replace existing ones, untouched entries
+    are kept, and entries whose Stage 1 asset is gone are pruned. The
+    read-merge-write runs under a file lock and lands via atomic rename.
+    """
+    with manifest_io.locked(path):
+        existing = manifest_io.read_json(path, default={})
+        merged = manifest_io.merge_entries(
+            existing.get("sprites", {}), sprite_data, valid_names
+        )
+        manifest_io.write_json_atomic(path, build_sprite_manifest(merged, existing))
+    return path
+
+
 # ---------------------------------------------------------------------------
 # Pipeline orchestration
 # ---------------------------------------------------------------------------
 
+def sprite_input_hash(name, info, args):
+    """Render cache key for one Stage 1 asset under this run's settings."""
+    return render_cache.cache_key(
+        PROJECT_ROOT / "public" / info["file"],
+        render_params(args["engine"], info.get("source"), args["border"], args["draft"],
+                      sampling_profiles.budget_for("sprites", name, info.get("role", ""))),
+    )
+
+
 def run_sprite_pipeline():
     """Render isometric sprites for all complete buildings in the manifest."""
     args = parse_args()
 
+    if args["draft"] and args["promote"]:
+        print("\nERROR: --draft and --promote are mutually exclusive")
+        sys.exit(1)
+
     print("=" * 60)
     print("SimSoviet Asset Pipeline Stage 2: Isometric Sprite Renderer")
     print(f"  Engine:  {args['engine']}")
-    print(f"  PPU:     {PIXELS_PER_UNIT}")
+    if args["draft"]:
+        print(f"  Draft:   {sampling_profiles.DRAFT_BUDGET.samples} samples, "
+              f"PPU {DRAFT_PIXELS_PER_UNIT}")
+    else:
+        print(f"  PPU:     {RENDER_PIXELS_PER_UNIT} rendered, "
+              f"densities {', '.join(f'@{d}x' for d in sprite_densities.DENSITIES)}")
+    if args["promote"]:
+        print("  Promote: drafts to full quality (changed ones re-rendered)")
     print(f"  Padding: {FRAME_PADDING}")
     if args["only"]:
         print(f"  Single:  {args['only']}")
+    if args["assets"]:
+        print(f"  Subset:  {len(args['assets'])} assets")
+    if args["threads"]:
+        print(f"  Threads: {args['threads']}")
+    print(f"  Cache:   {CACHE_DIR if args['cache'] else 'disabled'}")
     print("=" * 60)
 
     # Read Stage 1 manifest
@@ -482,9 +867,40 @@ def run_sprite_pipeline():
         manifest = json.load(f)
 
     assets = manifest.get("assets", {})
+    # Worker mode: only render the subset handed out by the orchestrator
+    if args["assets"]:
+        assets = {k: v for k, v in assets.items() if k in args["assets"]}
+
+    # Promote: only the sprites the current manifest still marks as drafts.
+    # A draft whose GLB + full-quality render params hash to a render
+    # already in the cache is unchanged and just restored in the loop
+    # below; only the changed ones are rendered.
+    if args["promote"]:
+        current = manifest_io.read_json(SPRITE_DIR / "manifest.json", default={})
+        drafts = {k for k, v in current.get("sprites", {}).items() if v.get("draft")}
+        assets = {k: v for k, v in assets.items() if k in drafts}
+        unchanged = {
+            name for name, info in assets.items()
+            if args["cache"] and (PROJECT_ROOT / "public" / info["file"]).exists()
+            and render_cache.has(CACHE_DIR, sprite_input_hash(name, info, args),
+                                 density_extras(SPRITE_DIR / f"{name}.png"))
+        }
+        print(f"\n  Promote: {len(assets) - len(unchanged)} changed draft sprites to render, "
+              f"{len(unchanged)} unchanged (restored from the render cache)")
+
     sprite_data = {}
     results = {"success": [], "failed": [], "skipped": []}
 
+    # Journal: workers (--manifest-out) append to the orchestrator's journal
+    journal = render_journal.journal_path(SPRITE_DIR)
+    if args["resume"]:
+        done = render_journal.load(journal)
+        print(f"\n  Resume:  {len(done)} sprites in {journal.name}")
+    else:
+        done = {}
+        if not args["manifest_out"]:
+            render_journal.reset(journal)
+
     for name, info in sorted(assets.items()):
         role = info.get("role", "")
 
@@ -507,59 +923,66 @@ def run_sprite_pipeline():
         total = sum(1 for _, v in assets.items()
                     if v.get("role") not in SKIP_ROLES)
         print(f"\n  [{count}/{total}] {name} ({role})")
+        pipeline_metrics.begin_asset(name, role=role)
+
+        output_path = SPRITE_DIR / f"{name}.png"
+        budget = sampling_profiles.budget_for("sprites", name, role)
+        input_hash = sprite_input_hash(name, info, args)
+        journaled = render_journal.resumable(done, name, input_hash)
+        if journaled:
+            print("    RESUMED: already journaled")
+            pipeline_metrics.end_asset(status="resumed")
+            results["success"].append(name)
+            sprite_data[name] = journaled
+            continue
 
         try:
             sprite_info = render_single_sprite(
                 glb_path,
-                output_path=SPRITE_DIR / f"{name}.png",
+                output_path=output_path,
                 engine=args["engine"],
                 source_filename=info.get("source"),
+                threads=args["threads"],
+                cache_dir=CACHE_DIR if args["cache"] else None,
+                border=args["border"],
+                input_hash=input_hash,
+                draft=args["draft"],
+                budget=budget,
             )
             if sprite_info:
                 results["success"].append(name)
-                sprite_data[name] = {
+                sprite_data[name] = sprite_densities.with_density_paths({
                     "sprite": f"sprites/soviet/{name}.png",
                     "role": role,
                     **sprite_info,
-                }
+                }, PIXELS_PER_UNIT)
+                render_journal.append(journal, name, input_hash, output_path, sprite_data[name])
+                pipeline_metrics.end_asset(output_bytes=output_path.stat().st_size)
             else:
                 results["failed"].append(name)
+                pipeline_metrics.end_asset(status="failed")
         except Exception as e:
             print(f"    FAIL: {e}")
             import traceback
             traceback.print_exc()
             results["failed"].append(name)
+            pipeline_metrics.end_asset(status="failed")
+
+    # Write sprite manifest. Worker partials (--manifest-out) hold just
+    # this run's sprites; the real manifest is merged so --only/--assets
+    # runs replace their own entries and keep everyone else's.
+    if args["manifest_out"]:
+        sprite_manifest_path = args["manifest_out"]
+        manifest_io.write_json_atomic(sprite_manifest_path, build_sprite_manifest(sprite_data))
+    else:
+        sprite_manifest_path = SPRITE_DIR / "manifest.json"
+        merge_sprite_manifest(sprite_manifest_path, sprite_data, renderable_names(manifest))
 
-    # Write sprite manifest
-    sprite_manifest = {
-        "version": "1.0.0",
-        "generator": "render_sprites.py",
-        "camera": {
-            "projection": "orthographic",
-            "type": "dimetric_2:1",
-            "rotation_x_deg": 60,
-            "rotation_z_deg": 45,
-            "note": "Matches SimCity 2000 / classic isometric viewing angle",
-        },
-        "scale": {
-            "pixels_per_unit": PIXELS_PER_UNIT,
-            "frame_padding": FRAME_PADDING,
-        },
-        "sprites": sprite_data,
-        "roles": {},
-    }
-
-    # Group sprites by role
-    all_roles = sorted(set(v["role"] for v in sprite_data.values()))
-    for role in all_roles:
-        sprite_manifest["roles"][role] = sorted(
-            k for k, v in sprite_data.items() if v["role"] == role
-        )
-
-    sprite_manifest_path = SPRITE_DIR / "manifest.json"
-    sprite_manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(sprite_manifest_path, "w") as f:
-        json.dump(sprite_manifest, f, indent=2)
+    # Timing report (workers write their own, named after their partial)
+    report_stage = "render_sprites"
+    if args["manifest_out"]:
+        report_stage += f".{args['manifest_out'].stem}"
+    report_path, _ = pipeline_metrics.write_report(report_stage, REPORT_DIR)
 
     # Summary
     print("\n" + "=" * 60)
@@ -569,6 +992,7 @@ def run_sprite_pipeline():
     print(f"  Skipped:   {len(results['skipped'])} (modular pieces)")
     print(f"  Output:    {SPRITE_DIR}/")
     print(f"  Manifest:  {sprite_manifest_path}")
+    print(f"  Report:    {report_path}")
     print("=" * 60)
 
     if results["failed"]:
@@ -0,0 +1,348 @@
+#!/usr/bin/env python3
+"""
+SimSoviet Asset Pipeline Stage 2 (parallel): Blender Worker Orchestrator
+========================================================================
+
+Fans render_sprites.py out across several headless Blender processes.
+A single Blender process renders one sprite at a time, so a full Cycles
+CPU rebuild only uses the parallelism Cycles finds inside one frame.
+This script splits the Stage 1 manifest across N workers, each pinned to
+a fixed number of render threads, then merges the partial sprite
+manifests they write into the usual sprites manifest.
+
+Runs under plain Python (no bpy) — it only launches Blender.
+
+Usage:
+    # Auto: one worker per 4 cores
+    python3 scripts/render_sprites_parallel.py
+
+    # 8 workers with 4 Cycles threads each (32-core build box)
+    python3 scripts/render_sprites_parallel.py --workers 8 --threads-per-worker 4
+
+    # Custom Blender binary, EEVEE engine
+    python3 scripts/render_sprites_parallel.py --blender /opt/blender/blender --engine eevee
+
+    # The render modes of render_sprites.py are passed to every worker
+    python3 scripts/render_sprites_parallel.py --draft
+    python3 scripts/render_sprites_parallel.py --promote --no-border
+    python3 scripts/render_sprites_parallel.py --only school,barracks
+
+Output:
+    app/public/sprites/soviet/*.png              Same as render_sprites.py
+    app/public/sprites/soviet/manifest.json      Merged sprite manifest
+    .cache/workers/sprites/*.log                 Per-worker Blender logs + partial manifests
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import manifest_io
+import render_journal
+
+
+# ---------------------------------------------------------------------------
+# Configuration (mirrors render_sprites.py — that module imports bpy)
+# ---------------------------------------------------------------------------
+
+SCRIPT_DIR = Path(__file__).parent
+PROJECT_ROOT = SCRIPT_DIR.parent
+MODEL_DIR = PROJECT_ROOT / "public" / "models" / "soviet"
+SPRITE_DIR = PROJECT_ROOT / "app" / "public" / "sprites" / "soviet"
+MANIFEST_PATH = MODEL_DIR / "manifest.json"
+WORKER_SCRIPT = SCRIPT_DIR / "render_sprites.py"
+# Logs and partial manifests; never under app/public, which ships
+WORK_DIR = PROJECT_ROOT / ".cache" / "workers" / "sprites"
+
+SKIP_ROLES = {"modular"}
+
+DEFAULT_THREADS_PER_WORKER = 4
+
+
+# ---------------------------------------------------------------------------
+# CLI
+# ---------------------------------------------------------------------------
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Render Stage 2 sprites across parallel Blender workers.",
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None,
+        help="Number of Blender processes (default: cores / threads-per-worker)",
+    )
+    parser.add_argument(
+        "--threads-per-worker", type=int, default=DEFAULT_THREADS_PER_WORKER,
+        help=f"Render threads per worker (default: {DEFAULT_THREADS_PER_WORKER})",
+    )
+    parser.add_argument(
+        "--blender", default=os.environ.get("BLENDER", "blender"),
+        help="Blender executable (default: $BLENDER or 'blender')",
+    )
+    parser.add_argument("--engine", default="cycles", help="cycles or eevee")
+    parser.add_argument(
+        "--no-cache", action="store_true",
+        help="Re-render everything, ignoring the shared render cache",
+    )
+    parser.add_argument(
+        "--resume", action="store_true",
+        help="Skip sprites already in the render journal from a killed run",
+    )
+    parser.add_argument(
+        "--no-border", action="store_true",
+        help="Render the full padded frame and trim afterwards",
+    )
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--draft", action="store_true", help="Quick low-sample drafts")
+    mode.add_argument(
+        "--promote", action="store_true",
+        help="Re-render the sprites the manifest still marks as drafts",
+    )
+    parser.add_argument(
+        "--only", type=lambda v: {a for a in v.split(",") if a}, default=None,
+        help="Comma-separated asset names to render",
+    )
+    return parser.parse_args()
+
+
+def default_worker_count(threads_per_worker):
+    """Cores divided by threads per worker, never less than one."""
+    cores = os.cpu_count() or 1
+    return max(1, cores // max(1, threads_per_worker))
+
+
+# ---------------------------------------------------------------------------
+# Work splitting
+# ---------------------------------------------------------------------------
+
+def draft_names():
+    """Sprites the current sprite manifest still marks as drafts."""
+    current = manifest_io.read_json(SPRITE_DIR / "manifest.json", default={})
+    return {k for k, v in current.get("sprites", {}).items() if v.get("draft")}
+
+
+def collect_jobs():
+    """Return the renderable assets from the Stage 1 manifest.
+
+    Each job is (name, cost) where cost is the GLB size in bytes — a cheap
+    proxy for import and render time that keeps the big civic buildings
+    from all landing on the same worker.
+    """
+    with open(MANIFEST_PATH) as f:
+        manifest = json.load(f)
+
+    jobs = []
+    for name, info in sorted(manifest.get("assets", {}).items()):
+        if info.get("role", "") in SKIP_ROLES:
+            continue
+        glb_path = PROJECT_ROOT / "public" / info["file"]
+        if not glb_path.exists():
+            print(f"  [{name}] MISS: {glb_path}")
+            continue
+        jobs.append((name, glb_path.stat().st_size))
+    return jobs
+
+
+def split_jobs(jobs, n_workers):
+    """Greedy longest-processing-time split of jobs into n_workers buckets.
+
+    Jobs are assigned heaviest first to whichever bucket is currently
+    lightest. Deterministic for a given manifest, empty buckets dropped.
+    """
+    buckets = [[] for _ in range(n_workers)]
+    loads = [0] * n_workers
+    for name, cost in sorted(jobs, key=lambda j: (-j[1], j[0])):
+        i = loads.index(min(loads))
+        buckets[i].append(name)
+        loads[i] += cost
+    return [sorted(b) for b in buckets if b]
+
+
+# ---------------------------------------------------------------------------
+# Workers
+# ---------------------------------------------------------------------------
+
+def launch_worker(index, names, args):
+    """Start one background Blender process rendering `names`."""
+    partial = WORK_DIR / f"manifest-{index}.json"
+    log_path = WORK_DIR / f"worker-{index}.log"
+    if partial.exists():
+        partial.unlink()
+
+    cmd = [
+        args.blender, "--background", "--factory-startup",
+        "--python", str(WORKER_SCRIPT),
+        "--",
+        "--engine", args.engine,
+        "--assets", ",".join(names),
+        "--manifest-out", str(partial),
+        "--threads", str(args.threads_per_worker),
+    ]
+    if args.no_cache:
+        cmd.append("--no-cache")
+    for flag, on in (("--resume", args.resume), ("--no-border", args.no_border),
+                     ("--draft", args.draft), ("--promote", args.promote)):
+        if on:
+            cmd.append(flag)
+    log = open(log_path, "w")
+    proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+    return {
+        "index": index,
+        "names": names,
+        "proc": proc,
+        "log": log,
+        "log_path": log_path,
+        "partial": partial,
+    }
+
+
+def merge_partials(workers):
+    """Merge the per-worker sprite manifests into one.
+
+    Header fields (camera, scale) are identical across workers, so the
+    first partial's are kept; sprites are unioned and roles regrouped.
+    """
+    merged = None
+    sprites = {}
+    for w in workers:
+        if not w["partial"].exists():
+            continue
+        with open(w["partial"]) as f:
+            part = json.load(f)
+        if merged is None:
+            merged = part
+        sprites.update(part.get("sprites", {}))
+
+    if merged is None:
+        return None
+
+    merged["sprites"] = dict(sorted(sprites.items()))
+    merged["roles"] = group_roles(sprites)
+    return merged
+
+
+def group_roles(sprites):
+    roles = {}
+    for role in sorted(set(v["role"] for v in sprites.values())):
+        roles[role] = sorted(k for k, v in sprites.items() if v["role"] == role)
+    return roles
+
+
+def write_merged_manifest(path, merged, valid_names):
+    """Fold this run's sprites into the manifest on disk (see manifest_io).
+
+    Sprites from failed workers keep their previous entry rather than
+    vanishing; assets no longer in Stage 1 are pruned.
+    """
+    with manifest_io.locked(path):
+        existing = manifest_io.read_json(path, default={})
+        sprites = manifest_io.merge_entries(
+            existing.get("sprites", {}), merged["sprites"], valid_names
+        )
+        manifest = {**existing, **merged, "sprites": sprites, "roles": group_roles(sprites)}
+        manifest_io.write_json_atomic(path, manifest)
+
+
+# ---------------------------------------------------------------------------
+# Orchestration
+# ---------------------------------------------------------------------------
+
+def run_parallel_pipeline():
+    args = parse_args()
+    n_workers = args.workers or default_worker_count(args.threads_per_worker)
+
+    if not MANIFEST_PATH.exists():
+        print(f"\nERROR: Manifest not found: {MANIFEST_PATH}")
+        print("Run Stage 1 first:")
+        print("  blender --background --python scripts/sovietize_kenney.py")
+        sys.exit(1)
+
+    renderable = collect_jobs()
+    valid_names = {name for name, _ in renderable}
+    jobs = renderable
+    if args.only:
+        unknown = sorted(args.only - valid_names)
+        if unknown:
+            print(f"\nERROR: not renderable: {', '.join(unknown)}")
+            sys.exit(1)
+        jobs = [job for job in jobs if job[0] in args.only]
+    if args.promote:
+        # The same selection each worker's render_sprites.py makes
+        drafts = draft_names()
+        jobs = [job for job in jobs if job[0] in drafts]
+    if not jobs:
+        print("\nNothing to render.")
+        return
+    buckets = split_jobs(jobs, n_workers)
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline Stage 2: Parallel Sprite Renderer")
+    print(f"  Engine:   {args.engine}")
+    modes = [m for m, on in (("draft", args.draft), ("promote", args.promote),
+                             ("no border", args.no_border)) if on]
+    if modes:
+        print(f"  Mode:     {', '.join(modes)}")
+    print(f"  Assets:   {len(jobs)}")
+    print(f"  Workers:  {len(buckets)} x {args.threads_per_worker} threads")
+    print(f"  Blender:  {args.blender}")
+    print("=" * 60)
+
+    WORK_DIR.mkdir(parents=True, exist_ok=True)
+    # Workers append to one shared journal; only a fresh run clears it
+    if not args.resume:
+        render_journal.reset(render_journal.journal_path(SPRITE_DIR))
+    start = time.monotonic()
+    workers = [launch_worker(i, names, args) for i, names in enumerate(buckets)]
+    for w in workers:
+        print(f"  worker {w['index']}: {len(w['names'])} assets -> {w['log_path'].name}")
+
+    failed_workers = []
+    for w in workers:
+        code = w["proc"].wait()
+        w["log"].close()
+        status = "OK" if code == 0 else f"EXIT {code}"
+        print(f"  worker {w['index']}: {status}")
+        if code != 0:
+            failed_workers.append(w)
+
+    merged = merge_partials(workers)
+    if merged is None:
+        print("\nERROR: No worker produced a manifest")
+        sys.exit(1)
+
+    sprite_manifest_path = SPRITE_DIR / "manifest.json"
+    write_merged_manifest(sprite_manifest_path, merged, valid_names)
+
+    rendered = set(merged["sprites"])
+    missing = sorted(name for name, _ in jobs if name not in rendered)
+    elapsed = time.monotonic() - start
+
+    print("\n" + "=" * 60)
+    print("Parallel Sprite Rendering Complete")
+    print(f"  Rendered:  {len(rendered)} sprites")
+    print(f"  Failed:    {len(missing)}")
+    print(f"  Elapsed:   {elapsed:.0f}s")
+    print(f"  Manifest:  {sprite_manifest_path}")
+    print("=" * 60)
+
+    if missing:
+        print("\n  Failed models:")
+        for name in missing:
+            print(f"    - {name}")
+    for w in failed_workers:
+        print(f"\n  See log: {w['log_path']}")
+
+    if missing or failed_workers:
+        sys.exit(1)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+if __name__ == "__main__":
+    run_parallel_pipeline()
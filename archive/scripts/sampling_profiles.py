@@ -0,0 +1,121 @@
+"""
+SimSoviet Asset Pipeline: Per-Asset Cycles Sampling Budgets
+===========================================================
+
+Shared by render_sprites.py, render_hex_tiles.py, render_server.py and
+calibrate_sampling.py.
+
+Every sprite used to get a flat 64 samples, whether it was a flat grass
+hex that converges at 8 or the cultural palace. A SampleBudget now
+drives Cycles adaptive sampling per asset:
+
+  - samples          ceiling; adaptive sampling stops pixels earlier
+  - noise_threshold  adaptive stop criterion (0 = adaptive sampling off)
+  - min_samples      adaptive floor (0 = Cycles picks one)
+  - time_limit       per-frame cap in seconds (0 = none). A safety net
+                     only: when it triggers, the result depends on the
+                     machine, so budgets are sized to stay under it.
+
+Budgets are looked up per asset: a calibrated entry from
+sampling_calibration.json (written by calibrate_sampling.py, the lowest
+budget whose render matches a high-sample reference to a target
+PSNR/SSIM) wins; otherwise the default for the asset's category —
+TILE_CATEGORIES for hex tiles, the Stage 1 role for buildings.
+
+Plain Python — no bpy (apply_budget only sets attributes on the scene
+it's handed).
+"""
+
+import json
+from pathlib import Path
+from typing import NamedTuple
+
+
+class SampleBudget(NamedTuple):
+    samples: int
+    noise_threshold: float
+    min_samples: int = 0
+    time_limit: float = 0.0
+
+
+SCRIPT_DIR = Path(__file__).parent
+CALIBRATION_PATH = SCRIPT_DIR / "sampling_calibration.json"
+
+# Fallback for anything without a category budget (the old fixed 64)
+DEFAULT_BUDGET = SampleBudget(64, 0.01, 0, 0.0)
+
+# --draft: a handful of denoised samples, no adaptive pass
+DRAFT_BUDGET = SampleBudget(4, 0.0, 0, 0.0)
+
+# Building sprites, by Stage 1 manifest role. Big civic buildings with
+# glass and deep recesses keep the full budget; fences and blocks don't.
+ROLE_BUDGETS = {
+    "housing": SampleBudget(64, 0.01, 16, 30.0),
+    "government": SampleBudget(64, 0.01, 16, 30.0),
+    "industry": SampleBudget(64, 0.01, 16, 30.0),
+    "services": SampleBudget(64, 0.01, 16, 30.0),
+    "military": SampleBudget(48, 0.015, 16, 30.0),
+    "culture": SampleBudget(96, 0.01, 16, 45.0),
+    "power": SampleBudget(64, 0.01, 16, 30.0),
+    "agriculture": SampleBudget(48, 0.015, 16, 30.0),
+    "propaganda": SampleBudget(64, 0.01, 16, 30.0),
+    "transport": SampleBudget(64, 0.01, 16, 30.0),
+    "utility": SampleBudget(32, 0.02, 8, 20.0),
+    "environment": SampleBudget(32, 0.02, 8, 20.0),
+}
+
+# Hex tiles, by render_hex_tiles.TILE_CATEGORIES key. Mostly flat,
+# diffuse and small on screen.
+TILE_BUDGETS = {
+    "terrain": SampleBudget(16, 0.02, 4, 10.0),
+    "terrain_feature": SampleBudget(32, 0.015, 8, 15.0),
+    "path": SampleBudget(16, 0.02, 4, 10.0),
+    "river": SampleBudget(24, 0.015, 8, 15.0),
+    "structure": SampleBudget(48, 0.01, 8, 20.0),
+}
+
+CATEGORY_BUDGETS = {"sprites": ROLE_BUDGETS, "tiles": TILE_BUDGETS}
+
+
+# ---------------------------------------------------------------------------
+# Budget lookup
+# ---------------------------------------------------------------------------
+
+_calibration = None
+
+
+def load_calibration(path=CALIBRATION_PATH):
+    """{"sprites": {name: entry}, "tiles": {name: entry}} — empty if never calibrated."""
+    global _calibration
+    if _calibration is None:
+        path = Path(path)
+        _calibration = json.loads(path.read_text()) if path.exists() else {}
+    return _calibration
+
+
+def budget_for(kind, name, category):
+    """Sampling budget for one asset.
+
+    Args:
+        kind: "sprites" or "tiles"
+        name: sprite/tile name (calibration key)
+        category: manifest role (sprites) or TILE_CATEGORIES key (tiles)
+    """
+    entry = load_calibration().get(kind, {}).get(name)
+    if entry:
+        return SampleBudget(*(entry[f] for f in SampleBudget._fields))
+    return CATEGORY_BUDGETS[kind].get(category, DEFAULT_BUDGET)
+
+
+def apply_budget(scene, budget):
+    """Configure the scene's Cycles (or EEVEE) sampling from a budget."""
+    if scene.render.engine == 'BLENDER_EEVEE_NEXT':
+        scene.eevee.taa_render_samples = budget.samples
+        return
+    cycles = scene.cycles
+    cycles.samples = budget.samples
+    cycles.use_adaptive_sampling = budget.noise_threshold > 0
+    if budget.noise_threshold > 0:
+        cycles.adaptive_threshold = budget.noise_threshold
+        cycles.adaptive_min_samples = budget.min_samples
+    cycles.time_limit = budget.time_limit
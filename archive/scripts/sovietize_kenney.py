@@ -9,24 +9,73 @@ appropriately grim Soviet concrete structures using AmbientCG PBR textures.
 Usage (from Blender scripting console or command line):
     blender --background --python scripts/sovietize_kenney.py
 
+    # Split across 8 Blender processes (or "auto": one per core) and
+    # merge their manifests
+    blender --background --python scripts/sovietize_kenney.py -- --jobs 8
+
+    # Convert only shard 2 of 4 (e.g. on another machine), or only some
+    # models; their entries are merged into the existing manifest.json
+    blender --background --python scripts/sovietize_kenney.py -- --shard 2/4
+    blender --background --python scripts/sovietize_kenney.py -- --assets school,warehouse
+
+    # Write each TextureProfile's JPEGs once to public/models/soviet/textures/
+    # and have the GLBs reference them by URI instead of embedding copies
+    blender --background --python scripts/sovietize_kenney.py -- --shared-textures
+
+    # Also write every "modular" piece into one GLB (public/models/soviet/
+    # modular.glb) as named nodes, so assembling buildings is one fetch
+    blender --background --python scripts/sovietize_kenney.py -- --bundle-modular
+
+    # Also write decimated LODs (<name>.lod1.glb, ...) for every building;
+    # ratios and the error bound default to LOD_SETTINGS
+    blender --background --python scripts/sovietize_kenney.py -- --lods
+    blender --background --python scripts/sovietize_kenney.py -- --lods --lod-ratios 0.5,0.25,0.1 --lod-max-error 0.03
+
+    # Only report duplicated mesh primitives across all models (no export;
+    # .cache/reports/mesh_dedup.json), or export as usual and also write
+    # each unique primitive once to instances.glb with per-building
+    # instance lists for GPU instancing
+    blender --background --python scripts/sovietize_kenney.py -- --dedup-report
+    blender --background --python scripts/sovietize_kenney.py -- --instanced
+
 Or load into Blender's Script Editor and run.
 
 Stage 1 of the SimSoviet asset pipeline:
   1. Imports Kenney GLB models
   2. Strips the colormap atlas material
-  3. Applies AmbientCG concrete/brick PBR materials (color + normal)
+  3. Applies AmbientCG concrete/brick PBR materials (color + normal),
+     loaded once per TextureProfile and shared by every model using it
   4. Tints glass/windows to dirty grey-blue
-  5. Exports retextured GLBs to public/models/soviet/
+  5. Exports retextured GLBs to public/models/soviet/ (with --shared-textures,
+     the concrete JPEGs go to textures/ once and the manifest's "textures"
+     lists each profile's set; with --bundle-modular, the modular pieces
+     also go into modular.glb and the manifest's "bundles" maps each
+     soviet_name to its node path; with --lods, decimated LOD GLBs go
+     next to each model, listed under its "lods" with triangle counts and
+     screen-coverage switch thresholds; with --instanced, every unique
+     mesh primitive goes into instances.glb once and each building lists
+     its "instances")
+  6. Writes a per-model timing report to .cache/reports/sovietize_kenney.{json,csv}
 
 Stage 2 (render_sprites.py) takes these GLBs and renders isometric sprites.
 """
 
 import bpy
+import math
+import numpy as np
 import os
-import json
+import subprocess
 import sys
 from pathlib import Path
 from typing import NamedTuple
+from mathutils.bvhtree import BVHTree
+
+# Blender doesn't put the script's directory on sys.path
+sys.path.insert(0, str(Path(__file__).parent))
+import glb_io  # noqa: E402
+import manifest_io  # noqa: E402
+import mesh_dedup  # noqa: E402
+import pipeline_metrics  # noqa: E402
 
 
 # ---------------------------------------------------------------------------
@@ -45,6 +94,42 @@ AMBIENTCG_BASE = Path("/Volumes/home/assets/AmbientCG/Assets/MATERIAL/1K-JPG")
 SCRIPT_DIR = Path(__file__).parent
 PROJECT_ROOT = SCRIPT_DIR.parent
 OUTPUT_DIR = PROJECT_ROOT / "public" / "models" / "soviet"
+REPORT_DIR = PROJECT_ROOT / ".cache" / "reports"
+SHARD_DIR = PROJECT_ROOT / ".cache" / "shards"
+TEXTURE_DIR = OUTPUT_DIR / "textures"
+
+# --bundle-modular: pieces of this role also go into one GLB, one node each
+BUNDLE_ROLE = "modular"
+BUNDLE_GLB = OUTPUT_DIR / f"{BUNDLE_ROLE}.glb"
+
+
+class LodSettings(NamedTuple):
+    """Decimated LOD chain for --lods."""
+    ratios: tuple       # Decimate (collapse) ratio per LOD, finest first
+    max_error: float    # Max vertex-to-surface deviation, fraction of the bbox diagonal
+
+
+LOD_SETTINGS = LodSettings(ratios=(0.5, 0.25), max_error=0.02)
+
+# Screen-coverage thresholds: a LOD is used while its error stays under
+# LOD_PIXEL_ERROR pixels on a LOD_REFERENCE_HEIGHT-pixel viewport
+LOD_PIXEL_ERROR = 1.0
+LOD_REFERENCE_HEIGHT = 1080
+
+# Too small to be worth decimating (and bundled anyway)
+LOD_SKIP_ROLES = {"modular"}
+
+# --instanced: every unique (primitive, material) once, as its own node
+INSTANCE_GLB = OUTPUT_DIR / "instances.glb"
+
+# glTF exporter compression settings for every Stage 1 GLB (compare
+# alternatives with bench_compression.py)
+EXPORT_SETTINGS = {
+    "export_draco_mesh_compression_enable": True,
+    "export_draco_mesh_compression_level": 6,
+    "export_image_format": "JPEG",
+    "export_jpeg_quality": 85,
+}
 
 
 # ---------------------------------------------------------------------------
@@ -263,6 +348,38 @@ def create_soviet_material(profile: TextureProfile, mat_name: str) -> bpy.types.
     return mat
 
 
+def get_soviet_material(profile: TextureProfile) -> bpy.types.Material:
+    """Return the shared material for a profile, building it on first use.
+
+    The material and its AmbientCG images get a fake user so they survive
+    clear_scene() between models — each JPEG set is decoded once per run
+    instead of once per model.
+    """
+    mat_name = f"soviet_{profile.name.lower()}"
+    mat = bpy.data.materials.get(mat_name)
+    if mat is None:
+        mat = create_soviet_material(profile, mat_name)
+        keep_across_models(mat)
+    return mat
+
+
+def get_soviet_glass_material() -> bpy.types.Material:
+    """Return the single shared glass material, building it on first use."""
+    mat = bpy.data.materials.get("soviet_glass")
+    if mat is None:
+        mat = create_soviet_glass_material()
+        keep_across_models(mat)
+    return mat
+
+
+def keep_across_models(mat: bpy.types.Material):
+    """Protect a shared material and its images from clear_scene()."""
+    mat.use_fake_user = True
+    for node in mat.node_tree.nodes:
+        if node.type == "TEX_IMAGE" and node.image:
+            node.image.use_fake_user = True
+
+
 def create_soviet_glass_material() -> bpy.types.Material:
     """Create a dirty Soviet window glass material — grey-blue, low transparency."""
     mat = bpy.data.materials.new(name="soviet_glass")
@@ -288,16 +405,76 @@ def create_soviet_glass_material() -> bpy.types.Material:
     return mat
 
 
+# ---------------------------------------------------------------------------
+# Shared textures (--shared-textures)
+# ---------------------------------------------------------------------------
+
+def shared_texture_files(profile: TextureProfile) -> dict:
+    """AmbientCG image stem -> (map, file name under TEXTURE_DIR) for a profile."""
+    return {
+        f"{profile.name}_1K-JPG_Color": ("color", f"{profile.name}_color.jpg"),
+        f"{profile.name}_1K-JPG_NormalGL": ("normal", f"{profile.name}_normal.jpg"),
+    }
+
+
+# Texture files already written by this process
+_written_textures = set()
+
+
+def share_textures(output_glb: Path, profiles) -> dict:
+    """Move the profiles' embedded JPEGs out of an exported GLB.
+
+    Each texture is written to TEXTURE_DIR once per run (atomically, so
+    --jobs shards exporting the same profile can't tear it) and the GLB
+    is rewritten to reference it by URI. Returns profile name ->
+    {map: public path} of the textures the GLB now references.
+    """
+    files = {}
+    for profile in profiles:
+        for stem, (texture_map, filename) in shared_texture_files(profile).items():
+            files[stem] = (profile.name, texture_map, filename)
+    gltf, binary = glb_io.read_glb(output_glb)
+    refs = {}
+
+    def uri_for(image):
+        # The exporter names images after the Blender image, minus ".jpg"
+        stem = Path(image.get("name", "")).stem
+        if stem not in files:
+            return None
+        profile_name, texture_map, filename = files[stem]
+        refs.setdefault(profile_name, {})[texture_map] = f"models/soviet/textures/{filename}"
+        return f"textures/{filename}"
+
+    binary, extracted = glb_io.externalize_images(gltf, binary, uri_for)
+    for uri, data in extracted.items():
+        if uri not in _written_textures:
+            glb_io.write_atomic(OUTPUT_DIR / uri, data)
+            _written_textures.add(uri)
+    glb_io.write_glb(output_glb, gltf, binary)
+    return refs
+
+
+def collect_texture_sets(assets) -> dict:
+    """Profile name -> shared texture files, from the assets referencing them."""
+    textures = {}
+    for entry in assets.values():
+        if entry.get("texture_files"):
+            textures.setdefault(entry["texture"], {}).update(entry["texture_files"])
+    return {name: textures[name] for name in sorted(textures)}
+
+
 # ---------------------------------------------------------------------------
 # Pipeline Core
 # ---------------------------------------------------------------------------
 
 def clear_scene():
-    """Remove ALL objects and data blocks from the scene.
+    """Remove all model data from the scene.
 
     The original version only removed objects with users==0, which left
     stale mesh data blocks from previous imports leaking into subsequent
-    GLB exports. This version force-removes everything.
+    GLB exports. This version force-removes every object and mesh, and
+    every material and image except the shared Soviet ones (fake user,
+    see get_soviet_material), so the AmbientCG textures stay decoded.
     """
     # Delete all objects
     bpy.ops.object.select_all(action="SELECT")
@@ -308,40 +485,30 @@ def clear_scene():
     for block in list(bpy.data.meshes):
         bpy.data.meshes.remove(block)
     for block in list(bpy.data.materials):
-        bpy.data.materials.remove(block)
+        if not block.use_fake_user:
+            bpy.data.materials.remove(block)
     for block in list(bpy.data.images):
-        bpy.data.images.remove(block)
+        if not block.use_fake_user:
+            bpy.data.images.remove(block)
     for block in list(bpy.data.cameras):
         bpy.data.cameras.remove(block)
     for block in list(bpy.data.lights):
         bpy.data.lights.remove(block)
 
     # Belt and suspenders: purge any remaining orphan data recursively
+    # (fake-user blocks are never orphans)
     bpy.ops.outliner.orphans_purge(do_recursive=True)
 
 
-def sovietize_model(
-    source_glb: Path,
-    output_glb: Path,
-    profile: TextureProfile,
-    soviet_name: str,
-) -> bool:
-    """Import a Kenney GLB, retexture it, and export as a Soviet building."""
-    clear_scene()
-
-    # Import GLB
-    if not source_glb.exists():
-        print(f"  SKIP: Source not found: {source_glb}")
-        return False
-
-    bpy.ops.import_scene.gltf(filepath=str(source_glb))
-
-    # Create materials
-    concrete_mat = create_soviet_material(profile, f"soviet_{soviet_name}")
-    glass_mat = create_soviet_glass_material()
+def apply_soviet_materials(objects, profile: TextureProfile):
+    """Swap Kenney materials on `objects` for the shared Soviet ones."""
+    # Shared materials (built on the first model that needs them)
+    with pipeline_metrics.phase("material"):
+        concrete_mat = get_soviet_material(profile)
+        glass_mat = get_soviet_glass_material()
 
     # Replace materials on all mesh objects
-    for obj in bpy.context.scene.objects:
+    for obj in objects:
         if obj.type != "MESH":
             continue
 
@@ -358,97 +525,780 @@ def sovietize_model(
             else:
                 slot.material = concrete_mat
 
-    # Export
+
+def export_glb(output_glb: Path, apply_modifiers: bool = False, settings: dict = None):
+    """Export the whole scene with the Stage 1 GLB settings (or `settings`)."""
     output_glb.parent.mkdir(parents=True, exist_ok=True)
-    bpy.ops.export_scene.gltf(
-        filepath=str(output_glb),
-        export_format="GLB",
-        export_draco_mesh_compression_enable=True,
-        export_draco_mesh_compression_level=6,
-        export_materials="EXPORT",
-        export_image_format="JPEG",
-        export_jpeg_quality=85,
-    )
+    with pipeline_metrics.phase("export"):
+        bpy.ops.export_scene.gltf(
+            filepath=str(output_glb),
+            export_format="GLB",
+            export_apply=apply_modifiers,
+            export_materials="EXPORT",
+            **(EXPORT_SETTINGS if settings is None else settings),
+        )
+
+
+def sovietize_model(
+    source_glb: Path,
+    output_glb: Path,
+    profile: TextureProfile,
+    soviet_name: str,
+    shared_textures: bool = False,
+    lods: LodSettings = None,
+):
+    """Import a Kenney GLB, retexture it, and export as a Soviet building.
+
+    Returns False if the source is missing, otherwise the extra manifest
+    fields: "texture_files" (shared_textures) and "lods" (lods).
+    """
+    with pipeline_metrics.phase("clear"):
+        clear_scene()
+
+    # Import GLB
+    if not source_glb.exists():
+        print(f"  SKIP: Source not found: {source_glb}")
+        return False
+
+    with pipeline_metrics.phase("import"):
+        bpy.ops.import_scene.gltf(filepath=str(source_glb))
+
+    apply_soviet_materials(bpy.context.scene.objects, profile)
+    export_glb(output_glb)
+
+    extras = {}
+    if shared_textures:
+        with pipeline_metrics.phase("textures"):
+            texture_files = share_textures(output_glb, [profile]).get(profile.name, {})
+        if texture_files:
+            extras["texture_files"] = texture_files
 
     # Get file size
+    pipeline_metrics.record(output_bytes=output_glb.stat().st_size)
     size_kb = output_glb.stat().st_size / 1024
-    print(f"  OK: {soviet_name} ({size_kb:.0f} KB)")
-    return True
+    shared = f", textures: {', '.join(sorted(extras['texture_files']))}" \
+        if extras.get("texture_files") else ""
+    print(f"  OK: {soviet_name} ({size_kb:.0f} KB{shared})")
 
+    if lods:
+        with pipeline_metrics.phase("lod"):
+            extras["lods"] = export_lods(output_glb, lods, profile if shared_textures else None)
+        pipeline_metrics.record(lods=len(extras["lods"]) - 1)
+    return extras
 
-def run_pipeline():
-    """Execute the full retexturing pipeline."""
-    print("=" * 60)
-    print("SimSoviet Asset Pipeline: Kenney -> Soviet Retexturer")
-    print("=" * 60)
 
+# ---------------------------------------------------------------------------
+# LOD chain (--lods)
+# ---------------------------------------------------------------------------
+
+def lod_path(output_glb: Path, level: int) -> Path:
+    """school.glb -> school.lod1.glb (level 0 is the model itself)."""
+    if level == 0:
+        return output_glb
+    return output_glb.with_name(f"{output_glb.stem}.lod{level}{output_glb.suffix}")
+
+
+def world_triangles(objects):
+    """(world-space vertices, triangles) of the evaluated meshes (modifiers applied)."""
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    verts, tris = [], []
+    for obj in objects:
+        evaluated = obj.evaluated_get(depsgraph)
+        mesh = evaluated.to_mesh()
+        mesh.calc_loop_triangles()
+        base = len(verts)
+        matrix = evaluated.matrix_world
+        verts.extend(matrix @ v.co for v in mesh.vertices)
+        tris.extend(tuple(base + i for i in tri.vertices) for tri in mesh.loop_triangles)
+        evaluated.to_mesh_clear()
+    return verts, tris
+
+
+def surface_deviation(verts_a, tris_a, verts_b, tris_b) -> float:
+    """Symmetric max vertex-to-surface distance between two triangle sets."""
+    if not tris_a or not tris_b:
+        return math.inf
+    tree_a = BVHTree.FromPolygons(verts_a, tris_a)
+    tree_b = BVHTree.FromPolygons(verts_b, tris_b)
+    worst = 0.0
+    for verts, tree in ((verts_a, tree_b), (verts_b, tree_a)):
+        for v in verts:
+            hit = tree.find_nearest(v)
+            if hit[0] is not None:
+                worst = max(worst, hit[3])
+    return worst
+
+
+def screen_coverage(relative_error: float) -> float:
+    """Largest screen coverage (bbox diagonal / viewport height) a LOD is used at.
+
+    A model whose diagonal spans coverage * LOD_REFERENCE_HEIGHT pixels
+    shows an error of relative_error * that many pixels; keep it under
+    LOD_PIXEL_ERROR.
+    """
+    if relative_error <= 0:
+        return 1.0
+    return min(1.0, LOD_PIXEL_ERROR / (relative_error * LOD_REFERENCE_HEIGHT))
+
+
+def export_lods(output_glb: Path, lods: LodSettings, shared_profile=None) -> list:
+    """Decimate the scene's meshes into a LOD chain next to `output_glb`.
+
+    Each ratio adds Decimate (collapse) modifiers and measures the result
+    against the full-resolution surface; the chain stops at the first LOD
+    whose deviation exceeds lods.max_error (coarser ratios would only be
+    worse). Accepted LODs are exported with modifiers applied.
+
+    Returns the manifest "lods" list, LOD 0 (the model itself) first.
+    """
+    meshes = [obj for obj in bpy.context.scene.objects if obj.type == "MESH"]
+    base_verts, base_tris = world_triangles(meshes)
+    lo = [min(v[i] for v in base_verts) for i in range(3)] if base_verts else [0, 0, 0]
+    hi = [max(v[i] for v in base_verts) for i in range(3)] if base_verts else [0, 0, 0]
+    diagonal = math.dist(lo, hi) or 1.0
+
+    chain = [{
+        "level": 0,
+        "file": f"models/soviet/{output_glb.name}",
+        "triangles": len(base_tris),
+        "error": 0.0,
+        "screen_coverage": 1.0,
+    }]
+    modifiers = [obj.modifiers.new("lod", "DECIMATE") for obj in meshes]
+    try:
+        for level, ratio in enumerate(lods.ratios, 1):
+            for mod in modifiers:
+                mod.decimate_type = "COLLAPSE"
+                mod.ratio = ratio
+            verts, tris = world_triangles(meshes)
+            error = surface_deviation(base_verts, base_tris, verts, tris) / diagonal
+            if error > lods.max_error:
+                print(f"    LOD {level}: ratio {ratio} exceeds error bound "
+                      f"({error:.4f} > {lods.max_error}), chain stops")
+                break
+
+            path = lod_path(output_glb, level)
+            export_glb(path, apply_modifiers=True)
+            if shared_profile:
+                share_textures(path, [shared_profile])
+            chain.append({
+                "level": level,
+                "file": f"models/soviet/{path.name}",
+                "ratio": ratio,
+                "triangles": len(tris),
+                "error": round(error, 6),
+                # Never coarser than the previous level's threshold
+                "screen_coverage": round(min(screen_coverage(error),
+                                             chain[-1]["screen_coverage"]), 4),
+            })
+            print(f"    LOD {level}: {len(tris)} tris ({len(tris) / max(1, len(base_tris)):.0%}), "
+                  f"error {error:.4f}, coverage < {chain[-1]['screen_coverage']}")
+    finally:
+        for obj, mod in zip(meshes, modifiers):
+            obj.modifiers.remove(mod)
+
+    # LODs left over from a run with more ratios (or a looser bound)
+    stale = len(chain)
+    while lod_path(output_glb, stale).exists():
+        lod_path(output_glb, stale).unlink()
+        stale += 1
+    return chain
+
+
+# ---------------------------------------------------------------------------
+# Modular bundle (--bundle-modular)
+# ---------------------------------------------------------------------------
+
+def bundle_models(models, output_glb: Path, shared_textures: bool = False) -> dict:
+    """Write `models` into one GLB, each under a node named after it.
+
+    Scene layout (glTF node names = Blender object names, unique):
+
+        modular                 root empty
+          wall-window           one empty per piece, at the origin
+            <Kenney meshes>     retextured with the shared profile materials
+
+    Every piece using a profile shares that profile's single material, so
+    the bundle carries one copy of each texture. Exported to a temp file
+    and renamed, so a concurrent reader never sees a half-written bundle.
+
+    Returns soviet_name -> node path ("modular/wall-window") for the
+    pieces whose source exists.
+    """
+    root_name = output_glb.stem
+    pipeline_metrics.begin_asset(output_glb.name, pieces=len(models))
+    with pipeline_metrics.phase("clear"):
+        clear_scene()
+
+    root = bpy.data.objects.new(root_name, None)
+    bpy.context.scene.collection.objects.link(root)
+
+    nodes = {}
+    profiles = {}
+    for _, source, _, soviet_name, profile, _, _ in models:
+        if not source.exists():
+            print(f"  SKIP: Source not found: {source}")
+            continue
+        # Create the piece node before importing so it keeps its exact name
+        piece = bpy.data.objects.new(soviet_name, None)
+        bpy.context.scene.collection.objects.link(piece)
+        piece.parent = root
+
+        before = set(bpy.context.scene.objects)
+        with pipeline_metrics.phase("import"):
+            bpy.ops.import_scene.gltf(filepath=str(source))
+        imported = [obj for obj in bpy.context.scene.objects if obj not in before]
+        for obj in imported:
+            if obj.parent is None:
+                obj.parent = piece
+        apply_soviet_materials(imported, profile)
+
+        nodes[soviet_name] = f"{root_name}/{piece.name}"
+        profiles[profile.name] = profile
+
+    if not nodes:
+        pipeline_metrics.end_asset(status="missing")
+        return {}
+
+    tmp = output_glb.with_name(f".{output_glb.name}.tmp.glb")
+    export_glb(tmp)
+    if shared_textures:
+        with pipeline_metrics.phase("textures"):
+            share_textures(tmp, profiles.values())
+    os.replace(tmp, output_glb)
+
+    size_kb = output_glb.stat().st_size / 1024
+    pipeline_metrics.record(output_bytes=output_glb.stat().st_size)
+    pipeline_metrics.end_asset(status="ok")
+    print(f"  OK: {output_glb.name} ({len(nodes)} pieces, {size_kb:.0f} KB)")
+    return nodes
+
+
+def add_bundle_refs(assets, nodes):
+    """Point each bundled asset's manifest entry at its node in the bundle."""
+    for name, node in nodes.items():
+        if name in assets:
+            assets[name]["bundle"] = {
+                "file": f"models/soviet/{BUNDLE_GLB.name}",
+                "node": node,
+            }
+
+
+def collect_bundles(assets) -> dict:
+    """Bundle file -> soviet_name -> node path, from the bundled assets."""
+    bundles = {}
+    for name, entry in assets.items():
+        if entry.get("bundle"):
+            bundles.setdefault(entry["bundle"]["file"], {})[name] = entry["bundle"]["node"]
+    return bundles
+
+
+def run_bundle(shared_textures: bool) -> dict:
+    """Rebuild the BUNDLE_ROLE bundle from every piece in the work list."""
+    print(f"\n--- Bundle: {BUNDLE_GLB.name} ---")
+    pieces = [m for m in model_list() if m[5] == BUNDLE_ROLE]
+    return bundle_models(pieces, BUNDLE_GLB, shared_textures)
+
+
+# ---------------------------------------------------------------------------
+# Primitive dedup + instancing (--dedup-report / --instanced)
+# ---------------------------------------------------------------------------
+
+def mesh_primitives(obj):
+    """Yield (material, positions, uvs) per material slot of a mesh object.
+
+    positions are (M, 3, 3) world-space triangle corners, uvs (M, 3, 2)
+    from the active UV map (None without one), modifiers applied.
+    """
+    depsgraph = bpy.context.evaluated_depsgraph_get()
+    evaluated = obj.evaluated_get(depsgraph)
+    mesh = evaluated.to_mesh()
+    mesh.calc_loop_triangles()
+    n = len(mesh.loop_triangles)
+    try:
+        tri_verts = np.empty(n * 3, np.int32)
+        tri_loops = np.empty(n * 3, np.int32)
+        mat_index = np.empty(n, np.int32)
+        mesh.loop_triangles.foreach_get("vertices", tri_verts)
+        mesh.loop_triangles.foreach_get("loops", tri_loops)
+        mesh.loop_triangles.foreach_get("material_index", mat_index)
+
+        co = np.empty(len(mesh.vertices) * 3, np.float64)
+        mesh.vertices.foreach_get("co", co)
+        m = np.array(evaluated.matrix_world)
+        co = co.reshape(-1, 3) @ m[:3, :3].T + m[:3, 3]
+
+        uv = None
+        if mesh.uv_layers.active:
+            uv = np.empty(len(mesh.loops) * 2, np.float64)
+            mesh.uv_layers.active.data.foreach_get("uv", uv)
+            uv = uv.reshape(-1, 2)
+
+        tri_verts = tri_verts.reshape(-1, 3)
+        tri_loops = tri_loops.reshape(-1, 3)
+        for k in np.unique(mat_index):
+            sel = mat_index == k
+            slot = obj.material_slots[k] if k < len(obj.material_slots) else None
+            material = slot.material if slot else None
+            yield (material, co[tri_verts[sel]],
+                   uv[tri_loops[sel]] if uv is not None else None)
+    finally:
+        evaluated.to_mesh_clear()
+
+
+def primitive_object(name: str, primitive: dict, material) -> bpy.types.Object:
+    """A scene object holding one canonical primitive at the origin."""
+    mesh = bpy.data.meshes.new(name)
+    mesh.from_pydata(primitive["vertices"].tolist(), [], primitive["indices"].tolist())
+    if primitive["uvs"] is not None:
+        vertex_index = np.empty(len(mesh.loops), np.int32)
+        mesh.loops.foreach_get("vertex_index", vertex_index)
+        mesh.uv_layers.new().data.foreach_set("uv", primitive["uvs"][vertex_index].ravel())
+    if material:
+        mesh.materials.append(material)
+    obj = bpy.data.objects.new(name, mesh)
+    bpy.context.scene.collection.objects.link(obj)
+    return obj
+
+
+def gltf_translation(origin) -> list:
+    """Blender Z-up position -> glTF Y-up (the exporter's axis conversion)."""
+    x, y, z = (float(v) for v in origin)
+    return [round(x, 6), round(z, 6), round(-y, 6)]
+
+
+def run_instancing(export: bool, shared_textures: bool = False) -> dict:
+    """Hash every model's primitives; report duplicates, optionally export.
+
+    Imports each model in the work list (source present), retextures it
+    like sovietize_model, and canonicalizes each primitive
+    (mesh_dedup.canonical_primitive). Writes .cache/reports/mesh_dedup.json.
+
+    With `export`, each unique (geometry, material) pair becomes one node
+    of INSTANCE_GLB, named "prim-<hash12>-<material>" and placed at the
+    origin. Instances need the same material to batch, so geometry shared
+    across profiles is stored once per profile; the report still counts
+    it as one.
+
+    Returns soviet_name -> instance list ({"primitive", "translation"},
+    glTF axes) when exporting, else {}.
+    """
+    print("\n--- Primitive dedup ---")
+    pipeline_metrics.begin_asset(INSTANCE_GLB.name if export else "mesh_dedup")
+    records = []
+    library = {}      # primitive id -> (canonical primitive, material)
+    instances = {}
+    for _, source, _, soviet_name, profile, _, _ in model_list():
+        if not source.exists():
+            continue
+        with pipeline_metrics.phase("clear"):
+            clear_scene()
+        with pipeline_metrics.phase("import"):
+            bpy.ops.import_scene.gltf(filepath=str(source))
+        apply_soviet_materials(bpy.context.scene.objects, profile)
+
+        uses = []
+        with pipeline_metrics.phase("dedup"):
+            for obj in [o for o in bpy.context.scene.objects if o.type == "MESH"]:
+                for material, positions, uvs in mesh_primitives(obj):
+                    prim = mesh_dedup.canonical_primitive(positions, uvs)
+                    material_name = material.name if material else "none"
+                    records.append({
+                        "hash": prim["hash"],
+                        "asset": soviet_name,
+                        "object": obj.name,
+                        "material": material_name,
+                        "triangles": len(prim["indices"]),
+                        "bytes": mesh_dedup.primitive_bytes(prim),
+                    })
+                    prim_id = f"prim-{prim['hash'][:12]}-{material_name}"
+                    library.setdefault(prim_id, (prim, material))
+                    uses.append({"primitive": prim_id,
+                                 "translation": gltf_translation(prim["origin"])})
+        instances[soviet_name] = uses
+
+    report = mesh_dedup.build_report(records)
+    report["instanced_primitives"] = len(library)
+    report_path = REPORT_DIR / "mesh_dedup.json"
+    manifest_io.write_json_atomic(report_path, report)
+
+    print(f"  Primitives: {report['primitives']} ({report['unique_primitives']} unique, "
+          f"{len(library)} with materials)")
+    print(f"  Bytes:      {report['bytes'] / 1024:.0f} KB -> "
+          f"{report['unique_bytes'] / 1024:.0f} KB unique (uncompressed)")
+    for dup in report["duplicates"][:5]:
+        print(f"    {dup['count']}x {dup['triangles']} tris: {', '.join(dup['assets'])}")
+    print(f"  Report:     {report_path}")
+
+    if not export or not library:
+        pipeline_metrics.end_asset(status="ok" if records else "missing")
+        return {}
+
+    with pipeline_metrics.phase("clear"):
+        clear_scene()
+    for prim_id, (prim, material) in library.items():
+        primitive_object(prim_id, prim, material)
+    tmp = INSTANCE_GLB.with_name(f".{INSTANCE_GLB.name}.tmp.glb")
+    export_glb(tmp)
+    if shared_textures:
+        with pipeline_metrics.phase("textures"):
+            share_textures(tmp, {m[4].name: m[4] for m in model_list()}.values())
+    os.replace(tmp, INSTANCE_GLB)
+
+    size_kb = INSTANCE_GLB.stat().st_size / 1024
+    pipeline_metrics.record(output_bytes=INSTANCE_GLB.stat().st_size)
+    pipeline_metrics.end_asset(status="ok")
+    print(f"  OK: {INSTANCE_GLB.name} ({len(library)} primitives, {size_kb:.0f} KB)")
+    return instances
+
+
+def add_instance_refs(assets, instances):
+    """Attach each asset's instance list (from run_instancing) to its entry."""
+    for name, uses in instances.items():
+        if name in assets:
+            assets[name]["instances"] = uses
+
+
+# ---------------------------------------------------------------------------
+# Work list + sharding
+# ---------------------------------------------------------------------------
+
+# (section label, source directory, manifest, result bucket for a missing source)
+KITS = [
+    ("Modular Buildings", MODULAR_BUILDINGS, BUILDING_MANIFEST, "failed"),
+    ("City Kit Suburban", CITY_KIT_SUBURBAN, SUBURBAN_MANIFEST, "skipped"),
+]
+
+# Role lists written to the manifest, in this order
+ROLES = [
+    "housing", "government", "industry", "services", "military", "culture",
+    "power", "agriculture", "propaganda", "transport", "modular", "utility",
+    "environment",
+]
+
+
+def model_list():
+    """Every model Stage 1 converts, in serial-run (manifest) order.
+
+    Returns list of (kit_label, source_path, filename, soviet_name, profile, role, miss_bucket).
+    """
+    models = []
+    for label, source_dir, kit_manifest, miss_bucket in KITS:
+        for filename, (soviet_name, profile, role) in kit_manifest.items():
+            models.append((label, source_dir / filename, filename, soviet_name,
+                           profile, role, miss_bucket))
+    return models
+
+
+def shard_models(models, index, count):
+    """Deterministic round-robin slice of the work list for shard `index` of `count`.
+
+    Round-robin (rather than contiguous blocks) spreads the heavy
+    suburban buildings and the tiny modular pieces evenly across shards.
+    """
+    return models[index::count]
+
+
+def parse_args():
+    """Parse args after Blender's `--`.
+
+    --shard INDEX/COUNT, --jobs N|auto, --assets a,b (soviet names),
+    --manifest-out PATH (partial manifest, used by --jobs children),
+    --shared-textures, --bundle-modular, --lods [--lod-ratios a,b]
+    [--lod-max-error E], --dedup-report, --instanced.
+    """
+    args = {"shard": None, "jobs": 1, "assets": None, "manifest_out": None,
+            "shared_textures": False, "bundle_modular": False, "lods": None,
+            "dedup_report": False, "instanced": False}
+    lod_ratios = LOD_SETTINGS.ratios
+    lod_max_error = LOD_SETTINGS.max_error
+
+    if "--" in sys.argv:
+        custom = sys.argv[sys.argv.index("--") + 1:]
+        i = 0
+        while i < len(custom):
+            if custom[i] == "--shard" and i + 1 < len(custom):
+                index, count = (int(v) for v in custom[i + 1].split("/"))
+                if count < 1 or not 0 <= index < count:
+                    print(f"ERROR: --shard expects INDEX/COUNT with 0 <= INDEX < COUNT, got {custom[i + 1]}")
+                    sys.exit(1)
+                args["shard"] = (index, count)
+                i += 2
+            elif custom[i] == "--jobs" and i + 1 < len(custom):
+                # "auto": one process per core (Draco export is single-threaded)
+                jobs = custom[i + 1]
+                args["jobs"] = (os.cpu_count() or 1) if jobs == "auto" else max(1, int(jobs))
+                i += 2
+            elif custom[i] == "--assets" and i + 1 < len(custom):
+                args["assets"] = set(custom[i + 1].split(","))
+                i += 2
+            elif custom[i] == "--manifest-out" and i + 1 < len(custom):
+                args["manifest_out"] = Path(custom[i + 1])
+                i += 2
+            elif custom[i] == "--shared-textures":
+                args["shared_textures"] = True
+                i += 1
+            elif custom[i] == "--bundle-modular":
+                args["bundle_modular"] = True
+                i += 1
+            elif custom[i] == "--lods":
+                args["lods"] = True
+                i += 1
+            elif custom[i] == "--dedup-report":
+                args["dedup_report"] = True
+                i += 1
+            elif custom[i] == "--instanced":
+                args["instanced"] = True
+                i += 1
+            elif custom[i] == "--lod-ratios" and i + 1 < len(custom):
+                lod_ratios = tuple(float(r) for r in custom[i + 1].split(","))
+                if not all(0 < r < 1 for r in lod_ratios):
+                    print(f"ERROR: --lod-ratios expects ratios in (0, 1), got {custom[i + 1]}")
+                    sys.exit(1)
+                i += 2
+            elif custom[i] == "--lod-max-error" and i + 1 < len(custom):
+                lod_max_error = float(custom[i + 1])
+                i += 2
+            else:
+                i += 1
+
+    if args["lods"]:
+        args["lods"] = LodSettings(tuple(sorted(lod_ratios, reverse=True)), lod_max_error)
+    return args
+
+
+def child_flags(args):
+    """Export-mode flags a --jobs parent passes on to its shards."""
+    flags = []
+    if args["shared_textures"]:
+        flags.append("--shared-textures")
+    if args["lods"]:
+        flags += ["--lods",
+                  "--lod-ratios", ",".join(str(r) for r in args["lods"].ratios),
+                  "--lod-max-error", str(args["lods"].max_error)]
+    return flags
+
+
+# ---------------------------------------------------------------------------
+# Model manifest
+# ---------------------------------------------------------------------------
+
+def build_model_manifest(manifest_data):
+    """Stage 1 manifest for BabylonJS / Stage 2, assets in work-list order."""
+    order = [m[3] for m in model_list()]
+    assets = {name: manifest_data[name] for name in order if name in manifest_data}
+    return {
+        "version": "1.0.0",
+        "generator": "sovietize_kenney.py",
+        "assets": assets,
+        "textures": collect_texture_sets(assets),
+        "bundles": collect_bundles(assets),
+        "instances": {
+            "file": f"models/soviet/{INSTANCE_GLB.name}",
+            "note": "Each asset's instances: node name in file + glTF translation",
+        } if any("instances" in v for v in assets.values()) else {},
+        "lod_thresholds": {
+            "metric": "screen_coverage",
+            "note": "Draw the coarsest LOD whose screen_coverage exceeds "
+                    "the model's bbox diagonal / viewport height",
+            "pixel_error": LOD_PIXEL_ERROR,
+            "reference_height": LOD_REFERENCE_HEIGHT,
+        } if any("lods" in v for v in assets.values()) else {},
+        "roles": {
+            role: [k for k, v in assets.items() if v["role"] == role]
+            for role in ROLES
+        },
+    }
+
+
+def merge_partial_manifest(manifest_path, manifest_data, run_names, bundle_nodes=None,
+                           instances=None):
+    """Fold a partial run's results into manifest.json (--shard / --assets).
+
+    Entries for the models this run covered are replaced (or dropped if
+    the model failed this time); everyone else's entries are kept. A
+    bundle or instance library rebuilt this run (bundle_nodes /
+    instances) re-points every model in it.
+    """
+    with manifest_io.locked(manifest_path):
+        existing = manifest_io.read_json(manifest_path, default={}).get("assets", {})
+        merged = {k: v for k, v in existing.items() if k not in run_names}
+        merged.update(manifest_data)
+        if bundle_nodes:
+            add_bundle_refs(merged, bundle_nodes)
+        if instances:
+            add_instance_refs(merged, instances)
+        manifest_io.write_json_atomic(manifest_path, build_model_manifest(merged))
+
+
+# ---------------------------------------------------------------------------
+# Pipeline orchestration
+# ---------------------------------------------------------------------------
+
+def process_models(models, shared_textures=False, lods=None):
+    """Sovietize a list of models. Returns (manifest_data, results)."""
     results = {"success": [], "failed": [], "skipped": []}
     manifest_data = {}
 
-    # Process Modular Buildings
-    print("\n--- Modular Buildings ---")
-    for filename, (soviet_name, profile, role) in BUILDING_MANIFEST.items():
-        source = MODULAR_BUILDINGS / filename
+    label = None
+    for kit_label, source, filename, soviet_name, profile, role, miss_bucket in models:
+        if kit_label != label:
+            label = kit_label
+            print(f"\n--- {label} ---")
+
         output = OUTPUT_DIR / f"{soviet_name}.glb"
         print(f"  Processing: {filename} -> {soviet_name}")
+        pipeline_metrics.begin_asset(soviet_name, source=filename, texture=profile.name)
 
-        if sovietize_model(source, output, profile, soviet_name):
+        extras = sovietize_model(source, output, profile, soviet_name, shared_textures,
+                                 lods if role not in LOD_SKIP_ROLES else None)
+        ok = extras is not False
+        pipeline_metrics.end_asset(status="ok" if ok else "missing")
+        if ok:
             results["success"].append(soviet_name)
             manifest_data[soviet_name] = {
                 "file": f"models/soviet/{soviet_name}.glb",
                 "source": filename,
                 "role": role,
                 "texture": profile.name,
+                **extras,
             }
         else:
-            results["failed"].append(soviet_name)
+            results[miss_bucket].append(soviet_name)
 
-    # Process City Kit Suburban
-    print("\n--- City Kit Suburban ---")
-    for filename, (soviet_name, profile, role) in SUBURBAN_MANIFEST.items():
-        source = CITY_KIT_SUBURBAN / filename
-        output = OUTPUT_DIR / f"{soviet_name}.glb"
-        print(f"  Processing: {filename} -> {soviet_name}")
+    return manifest_data, results
+
+
+def run_jobs(jobs, flags=()):
+    """Run `jobs` shards as child Blender processes and merge their partials.
+
+    The merged manifest is rebuilt from the partials alone (in work-list
+    order), so it is identical to what a serial run would write. If any
+    shard dies, manifest.json is left untouched.
+    """
+    SHARD_DIR.mkdir(parents=True, exist_ok=True)
+    shards = []
+    for index in range(jobs):
+        partial = SHARD_DIR / f"manifest-{index}-of-{jobs}.json"
+        log_path = SHARD_DIR / f"shard-{index}-of-{jobs}.log"
+        if partial.exists():
+            partial.unlink()
+        cmd = [
+            bpy.app.binary_path, "--background", "--factory-startup",
+            "--python", str(Path(__file__).resolve()),
+            "--",
+            "--shard", f"{index}/{jobs}",
+            "--manifest-out", str(partial),
+        ]
+        cmd += flags
+        log = open(log_path, "w")
+        proc = subprocess.Popen(cmd, stdout=log, stderr=subprocess.STDOUT)
+        shards.append({"index": index, "proc": proc, "log": log,
+                       "log_path": log_path, "partial": partial})
+        print(f"  Shard {index}/{jobs}: pid {proc.pid}  log {log_path.name}")
+
+    manifest_data = {}
+    results = {"success": [], "failed": [], "skipped": []}
+    broken = []
+    for shard in shards:
+        rc = shard["proc"].wait()
+        shard["log"].close()
+        partial = manifest_io.read_json(shard["partial"])
+        if rc != 0 or partial is None:
+            print(f"  ERROR: shard {shard['index']} exited {rc} — see {shard['log_path']}")
+            broken.append(shard["index"])
+            continue
+        manifest_data.update(partial["assets"])
+        for bucket, names in partial["results"].items():
+            results[bucket].extend(names)
+
+    if broken:
+        print(f"\nERROR: {len(broken)} shard(s) failed; manifest not written")
+        sys.exit(1)
+    return manifest_data, results
 
-        if sovietize_model(source, output, profile, soviet_name):
-            results["success"].append(soviet_name)
-            manifest_data[soviet_name] = {
-                "file": f"models/soviet/{soviet_name}.glb",
-                "source": filename,
-                "role": role,
-                "texture": profile.name,
-            }
-        else:
-            results["skipped"].append(soviet_name)
 
-    # Write asset manifest for BabylonJS to consume
+def run_pipeline():
+    """Execute the full retexturing pipeline (or one shard of it)."""
+    args = parse_args()
+
+    print("=" * 60)
+    print("SimSoviet Asset Pipeline: Kenney -> Soviet Retexturer")
+    if args["shard"]:
+        print(f"  Shard:  {args['shard'][0]}/{args['shard'][1]}")
+    if args["assets"]:
+        print(f"  Subset: {len(args['assets'])} models")
+    elif args["jobs"] > 1:
+        print(f"  Jobs:   {args['jobs']}")
+    if args["shared_textures"]:
+        print(f"  Shared: textures -> {TEXTURE_DIR}")
+    if args["bundle_modular"]:
+        print(f"  Bundle: {BUNDLE_GLB}")
+    if args["lods"]:
+        print(f"  LODs:   ratios {', '.join(map(str, args['lods'].ratios))}, "
+              f"max error {args['lods'].max_error}")
+    if args["instanced"]:
+        print(f"  Dedup:  instances -> {INSTANCE_GLB}")
+    elif args["dedup_report"]:
+        print("  Dedup:  report only, nothing exported")
+    print("=" * 60)
+
+    if args["dedup_report"] and not args["instanced"]:
+        run_instancing(export=False)
+        return None
+
     manifest_path = OUTPUT_DIR / "manifest.json"
-    manifest_path.parent.mkdir(parents=True, exist_ok=True)
-    with open(manifest_path, "w") as f:
-        json.dump(
-            {
-                "version": "1.0.0",
-                "generator": "sovietize_kenney.py",
-                "assets": manifest_data,
-                "roles": {
-                    "housing": [k for k, v in manifest_data.items() if v["role"] == "housing"],
-                    "government": [k for k, v in manifest_data.items() if v["role"] == "government"],
-                    "industry": [k for k, v in manifest_data.items() if v["role"] == "industry"],
-                    "services": [k for k, v in manifest_data.items() if v["role"] == "services"],
-                    "military": [k for k, v in manifest_data.items() if v["role"] == "military"],
-                    "culture": [k for k, v in manifest_data.items() if v["role"] == "culture"],
-                    "power": [k for k, v in manifest_data.items() if v["role"] == "power"],
-                    "agriculture": [k for k, v in manifest_data.items() if v["role"] == "agriculture"],
-                    "propaganda": [k for k, v in manifest_data.items() if v["role"] == "propaganda"],
-                    "transport": [k for k, v in manifest_data.items() if v["role"] == "transport"],
-                    "modular": [k for k, v in manifest_data.items() if v["role"] == "modular"],
-                    "utility": [k for k, v in manifest_data.items() if v["role"] == "utility"],
-                    "environment": [k for k, v in manifest_data.items() if v["role"] == "environment"],
-                },
-            },
-            f,
-            indent=2,
-        )
+    report_path = None
+
+    if args["jobs"] > 1 and not args["shard"] and not args["assets"]:
+        manifest_data, results = run_jobs(args["jobs"], child_flags(args))
+        if args["bundle_modular"]:
+            add_bundle_refs(manifest_data, run_bundle(args["shared_textures"]))
+        if args["instanced"]:
+            add_instance_refs(manifest_data, run_instancing(True, args["shared_textures"]))
+        # Same lock as the standalone --shard/--assets merges
+        with manifest_io.locked(manifest_path):
+            manifest_io.write_json_atomic(manifest_path, build_model_manifest(manifest_data))
+    else:
+        models = model_list()
+        report_stage = "sovietize_kenney"
+        if args["shard"]:
+            index, count = args["shard"]
+            models = shard_models(models, index, count)
+            report_stage += f".shard-{index}-of-{count}"
+        if args["assets"]:
+            models = [m for m in models if m[3] in args["assets"]]
+
+        manifest_data, results = process_models(models, args["shared_textures"], args["lods"])
+
+        # The bundle needs every piece, so --jobs children leave it to the
+        # parent; other runs rebuild it whenever one of their models is a piece
+        bundle_nodes = {}
+        if (args["bundle_modular"] and not args["manifest_out"]
+                and any(m[5] == BUNDLE_ROLE for m in models)):
+            bundle_nodes = run_bundle(args["shared_textures"])
+        # Likewise the dedup pass looks at every model, not just this run's
+        instances = {}
+        if args["instanced"] and not args["manifest_out"]:
+            instances = run_instancing(True, args["shared_textures"])
+        report_path, _ = pipeline_metrics.write_report(report_stage, REPORT_DIR)
+
+        # Write asset manifest for BabylonJS to consume. A shard launched
+        # by --jobs hands its partial back to the parent; a standalone
+        # shard or --assets subset merges itself into the shared manifest.
+        if args["manifest_out"]:
+            manifest_path = args["manifest_out"]
+            manifest_io.write_json_atomic(
+                manifest_path, {"assets": manifest_data, "results": results}
+            )
+        elif args["shard"] or args["assets"]:
+            merge_partial_manifest(manifest_path, manifest_data, {m[3] for m in models},
+                                   bundle_nodes, instances)
+        else:
+            add_bundle_refs(manifest_data, bundle_nodes)
+            add_instance_refs(manifest_data, instances)
+            with manifest_io.locked(manifest_path):
+                manifest_io.write_json_atomic(manifest_path, build_model_manifest(manifest_data))
 
     # Summary
     print("\n" + "=" * 60)
@@ -457,6 +1307,8 @@ def run_pipeline():
     print(f"  Failed:  {len(results['failed'])}")
     print(f"  Skipped: {len(results['skipped'])}")
     print(f"  Manifest: {manifest_path}")
+    if report_path:
+        print(f"  Report:   {report_path}")
     print("=" * 60)
 
     return results
@@ -0,0 +1,151 @@
+"""
+SimSoviet Asset Pipeline: Multi-Density Sprite Variants
+=======================================================
+
+Shared by render_sprites.py and render_hex_tiles.py.
+
+PIXELS_PER_UNIT = 80 is a retina (@2x) density, so low-end phones used
+to download and decode sprites several times larger than they draw.
+Each sprite is now rendered once at the highest density and every
+lower density is derived from that render:
+
+    school@3x.png   rendered, 3/2 x PIXELS_PER_UNIT
+    school.png      @2x, derived (the manifest's "sprite", as before)
+    school@1x.png   @1x, derived
+
+Downsampling is an exact area (box) filter in linear light with
+premultiplied alpha, so silhouettes don't pick up dark fringes from
+transparent pixels and non-integer ratios (3x -> 2x) stay sharp. The
+output grid keeps the top-left corner fixed; a pixel-index anchor `a`
+maps to floor((a + 0.5) * scale), the same rule for every density.
+
+Manifest entries gain, next to the @2x fields they always had:
+
+    "densities": {"1": {"sprite": ".../school@1x.png", "width": 42,
+                        "height": 79, "anchor_x": 20, "anchor_y": 69,
+                        "pixels_per_unit": 40}, "2": {...}, "3": {...}}
+
+Arrays here are (H, W, 4) float32 in PNG row order (row 0 = top);
+callers flip Blender's bottom-up buffers. Plain Python + NumPy — no bpy.
+"""
+
+import math
+from pathlib import Path
+
+import numpy as np
+
+from pixel_math import linear_to_srgb, srgb_to_linear
+
+# Densities written per sprite; the highest is the one actually rendered
+DENSITIES = (1, 2, 3)
+
+# Density of the plain "<name>.png" (PIXELS_PER_UNIT), kept for Stage 4
+# and for clients that don't read "densities"
+BASE_DENSITY = 2
+
+RENDER_DENSITY = max(DENSITIES)
+
+
+def render_ppu(base_ppu):
+    """Pixels per unit to render at so every density can be derived."""
+    return base_ppu * RENDER_DENSITY // BASE_DENSITY
+
+
+def variant_path(path, density):
+    """school.png -> school@1x.png (the base density keeps the plain name)."""
+    path = Path(path)
+    if density == BASE_DENSITY:
+        return path
+    return path.with_name(f"{path.stem}@{density}x{path.suffix}")
+
+
+def derived_densities():
+    """Densities written from the render rather than rendered themselves."""
+    return [d for d in DENSITIES if d != RENDER_DENSITY]
+
+
+def remove_variants(path):
+    """Delete the non-base density PNGs beside `path` (a draft writes none)."""
+    for d in DENSITIES:
+        if d != BASE_DENSITY:
+            variant_path(path, d).unlink(missing_ok=True)
+
+
+# ---------------------------------------------------------------------------
+# Resampling
+# ---------------------------------------------------------------------------
+
+def area_weights(n_src, scale):
+    """(n_dst, n_src) matrix averaging source pixels by covered area.
+
+    Destination pixel j covers source span [j / scale, (j + 1) / scale).
+    The last pixel may reach past the source; the missing part counts as
+    transparent, so its weights sum to less than 1.
+    """
+    n_dst = max(1, math.ceil(n_src * scale - 1e-9))
+    edges = np.arange(n_dst + 1) / scale
+    src = np.arange(n_src)
+    lo = np.maximum(edges[:-1, None], src[None, :])
+    hi = np.minimum(edges[1:, None], src[None, :] + 1)
+    return (np.clip(hi - lo, 0.0, None) * scale).astype(np.float32)
+
+
+def downsample(pixels, scale):
+    """Area-downsample straight-alpha sRGB RGBA by `scale` (< 1).
+
+    Filters premultiplied linear-light colour, then converts back to
+    straight-alpha sRGB.
+    """
+    h, w = pixels.shape[:2]
+    wy = area_weights(h, scale)
+    wx = area_weights(w, scale)
+
+    alpha = pixels[:, :, 3:4]
+    premul = np.concatenate([srgb_to_linear(pixels[:, :, :3]) * alpha, alpha], axis=2)
+
+    rows = np.tensordot(wy, premul, axes=(1, 0))                     # (h', w, 4)
+    out = np.tensordot(rows, wx, axes=(1, 1)).transpose(0, 2, 1)     # (h', w', 4)
+
+    a = out[:, :, 3:4]
+    rgb = np.divide(out[:, :, :3], a, out=np.zeros_like(out[:, :, :3]), where=a > 1e-6)
+    return np.concatenate([linear_to_srgb(rgb), np.clip(a, 0.0, 1.0)], axis=2).astype(np.float32)
+
+
+def scale_anchor(a, scale):
+    """Anchor pixel index at a lower density (pixel-center rule)."""
+    return int(math.floor((a + 0.5) * scale))
+
+
+def derive(pixels, anchor_x, anchor_y, density):
+    """Variant of a RENDER_DENSITY sprite at `density`.
+
+    Returns (pixels, anchor_x, anchor_y).
+    """
+    scale = density / RENDER_DENSITY
+    return (
+        downsample(pixels, scale),
+        scale_anchor(anchor_x, scale),
+        scale_anchor(anchor_y, scale),
+    )
+
+
+# ---------------------------------------------------------------------------
+# Manifest
+# ---------------------------------------------------------------------------
+
+def with_density_paths(entry, base_ppu):
+    """Fill each density's public "sprite" path and pixels_per_unit.
+
+    `entry` is a manifest entry whose "sprite" is the base-density path;
+    drafts (no "densities") pass through unchanged.
+    """
+    if "densities" not in entry:
+        return entry
+    densities = {}
+    for d, info in entry["densities"].items():
+        densities[d] = {
+            "sprite": variant_path(entry["sprite"], int(d)).as_posix(),
+            **info,
+            "pixels_per_unit": base_ppu * int(d) // BASE_DENSITY,
+        }
+    return {**entry, "densities": densities}
@@ -0,0 +1,40 @@
+"""Shared fixtures for the headless pipeline tests (no Blender needed).
+
+    python3 -m pytest scripts/tests                    # tests + benchmarks
+    python3 -m pytest scripts/tests --benchmark-skip   # tests only
+    python3 -m pytest scripts/tests --benchmark-only   # benchmarks only
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# The pipeline modules live beside this directory, not in a package
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+
+@pytest.fixture
+def rng():
+    return np.random.default_rng(1917)
+
+
+@pytest.fixture
+def colormap_512(rng):
+    """Synthetic 512x512 Kenney-style palette: flat colour swatches, black unused cells."""
+    swatches = rng.random((16, 16, 3), dtype=np.float32)
+    swatches[rng.random((16, 16)) < 0.25] = 0.0
+    rgb = np.repeat(np.repeat(swatches, 32, axis=0), 32, axis=1)
+    return np.concatenate([rgb, np.ones((512, 512, 1), np.float32)], axis=2)
+
+
+@pytest.fixture
+def render_2k(rng):
+    """Synthetic 2048x2048 sprite render: a soft-edged opaque blob on transparency."""
+    n = 2048
+    y, x = np.mgrid[0:n, 0:n].astype(np.float32)
+    dist = np.hypot(x - 900, (y - 1100) * 1.4)
+    alpha = np.clip((500 - dist) / 3, 0, 1)
+    rgb = rng.random((n, n, 3), dtype=np.float32) * 0.2 + 0.4
+    return np.concatenate([rgb, alpha[:, :, None]], axis=2)
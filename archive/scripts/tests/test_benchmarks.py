@@ -0,0 +1,55 @@
+"""Hot pixel paths at production sizes (512x512 colormaps, 2k x 2k renders).
+
+Compare runs with pytest-benchmark's --benchmark-autosave /
+--benchmark-compare.
+"""
+
+import numpy as np
+import pytest
+
+import pixel_math
+import sprite_densities
+
+pytest.importorskip("pytest_benchmark")
+
+
+@pytest.mark.parametrize("variant", ["winter", "mud", "summer"])
+def test_bench_soviet_colormap(benchmark, colormap_512, variant):
+    out = benchmark(pixel_math.create_soviet_colormap, colormap_512, variant)
+    assert out.shape == colormap_512.shape
+
+
+def test_bench_month_colormaps(benchmark, colormap_512):
+    grades = pixel_math.grades_for(pixel_math.MONTHS)
+    out = benchmark(pixel_math.grade_colormaps, colormap_512, grades)
+    assert out.shape == (12,) + colormap_512.shape
+
+
+def test_bench_crop_to_content(benchmark, render_2k):
+    cropped, _, _ = benchmark(pixel_math.crop_to_content, render_2k, 1024, 1024)
+    assert cropped.shape[0] < render_2k.shape[0]
+
+
+def test_bench_projected_extent(benchmark, rng):
+    world_co = rng.random((1_000_000, 3))
+    cam = np.eye(4)
+    width, height, _ = benchmark(pixel_math.projected_extent, world_co, cam)
+    assert 0 < width <= 1 and 0 < height <= 1
+
+
+def test_bench_recolor_from_passes(benchmark, render_2k, colormap_512, rng):
+    uv = rng.random(render_2k.shape, dtype=np.float32) * render_2k[:, :, 3:4]
+    glossy = render_2k * 0.1
+    out = benchmark(pixel_math.recolor_from_passes, render_2k, glossy, uv, render_2k[:, :, 3],
+                    colormap_512)
+    assert out.shape == render_2k.shape
+
+
+def test_bench_downsample_3x_to_2x(benchmark, render_2k):
+    out = benchmark(sprite_densities.downsample, render_2k, 2 / 3)
+    assert out.shape[:2] == (1366, 1366)
+
+
+def test_bench_ssim(benchmark, render_2k, rng):
+    noisy = render_2k + rng.normal(0, 0.01, render_2k.shape).astype(np.float32)
+    assert 0 < benchmark(pixel_math.ssim, noisy, render_2k) < 1
@@ -0,0 +1,92 @@
+import hashlib
+
+import pytest
+
+import glb_io
+
+
+def make_glb(path):
+    """GLB with an accessor, two images and a Draco primitive, interleaved."""
+    chunks = [b"\x01" * 12, b"colour-jpeg", b"draco", b"normal", b"\x02" * 8]
+    binary = b""
+    views = []
+    for data in chunks:
+        binary += b"\0" * (-len(binary) % 4)
+        views.append({"buffer": 0, "byteOffset": len(binary), "byteLength": len(data)})
+        binary += data
+    gltf = {
+        "asset": {"version": "2.0"},
+        "buffers": [{"byteLength": len(binary)}],
+        "bufferViews": views,
+        "accessors": [
+            {"bufferView": 0, "componentType": 5126, "count": 1, "type": "VEC3"},
+            {"bufferView": 4, "componentType": 5126, "count": 2, "type": "SCALAR"},
+        ],
+        "images": [
+            {"name": "Concrete022_1K-JPG_Color", "bufferView": 1, "mimeType": "image/jpeg"},
+            {"name": "Concrete022_1K-JPG_NormalGL", "bufferView": 3, "mimeType": "image/jpeg"},
+        ],
+        "meshes": [{"primitives": [{"attributes": {"POSITION": 0}, "extensions": {
+            "KHR_draco_mesh_compression": {"bufferView": 2, "attributes": {"POSITION": 0}},
+        }}]}],
+    }
+    glb_io.write_glb(path, gltf, binary)
+    return chunks
+
+
+def view_bytes(gltf, binary, index):
+    view = gltf["bufferViews"][index]
+    return binary[view["byteOffset"]:view["byteOffset"] + view["byteLength"]]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "a.glb"
+    chunks = make_glb(path)
+    gltf, binary = glb_io.read_glb(path)
+    assert len(path.read_bytes()) % 4 == 0
+    assert [view_bytes(gltf, binary, i) for i in range(5)] == chunks
+
+
+def test_rejects_non_glb(tmp_path):
+    path = tmp_path / "a.glb"
+    path.write_bytes(b"\0" * 20)
+    with pytest.raises(ValueError):
+        glb_io.read_glb(path)
+
+
+def test_externalize_compacts_and_renumbers(tmp_path):
+    path = tmp_path / "a.glb"
+    chunks = make_glb(path)
+    gltf, binary = glb_io.read_glb(path)
+
+    def uri_for(image):
+        return "textures/color.jpg" if image["name"].endswith("_Color") else None
+
+    binary, extracted = glb_io.externalize_images(gltf, binary, uri_for)
+    assert extracted == {"textures/color.jpg": b"colour-jpeg"}
+
+    color, normal = gltf["images"]
+    assert color["uri"] == "textures/color.jpg" and "bufferView" not in color
+    assert color["extras"]["sha256"] == hashlib.sha256(b"colour-jpeg").hexdigest()
+
+    # Views 2..4 moved down one; every reference follows its bytes
+    assert len(gltf["bufferViews"]) == 4
+    draco = gltf["meshes"][0]["primitives"][0]["extensions"]["KHR_draco_mesh_compression"]
+    assert view_bytes(gltf, binary, gltf["accessors"][0]["bufferView"]) == chunks[0]
+    assert view_bytes(gltf, binary, draco["bufferView"]) == chunks[2]
+    assert view_bytes(gltf, binary, normal["bufferView"]) == chunks[3]
+    assert view_bytes(gltf, binary, gltf["accessors"][1]["bufferView"]) == chunks[4]
+    assert all(v["byteOffset"] % 4 == 0 for v in gltf["bufferViews"])
+    assert gltf["buffers"][0]["byteLength"] == len(binary)
+
+    glb_io.write_glb(path, gltf, binary)
+    reread, _ = glb_io.read_glb(path)
+    assert reread == gltf
+
+
+def test_externalize_nothing_selected(tmp_path):
+    path = tmp_path / "a.glb"
+    make_glb(path)
+    gltf, binary = glb_io.read_glb(path)
+    out, extracted = glb_io.externalize_images(gltf, binary, lambda image: None)
+    assert out == binary and extracted == {}
@@ -0,0 +1,24 @@
+import manifest_io
+
+
+def test_merge_prunes_assets_that_no_longer_exist():
+    existing = {"school": {"w": 1}, "kiosk": {"w": 2}}
+    merged = manifest_io.merge_entries(existing, {}, valid_names={"school"})
+    assert merged == {"school": {"w": 1}}
+
+
+def test_merge_replaces_only_rerendered_entries():
+    existing = {"school": {"w": 1, "atlas": {"x": 0}}, "kiosk": {"w": 2}}
+    rendered = {"school": {"w": 3}, "barracks": {"w": 4}}
+    merged = manifest_io.merge_entries(existing, rendered, {"school", "kiosk", "barracks"})
+    # The stale atlas rect goes with the old entry; kiosk is untouched
+    assert merged == {"barracks": {"w": 4}, "kiosk": {"w": 2}, "school": {"w": 3}}
+    assert list(merged) == sorted(merged)
+
+
+def test_write_json_atomic_round_trips(tmp_path):
+    path = tmp_path / "manifest.json"
+    with manifest_io.locked(path):
+        manifest_io.write_json_atomic(path, {"sprites": {"school": {}}})
+    assert manifest_io.read_json(path) == {"sprites": {"school": {}}}
+    assert manifest_io.read_json(tmp_path / "missing.json", default={}) == {}
@@ -0,0 +1,62 @@
+import pytest
+
+import maxrects
+
+
+def random_sizes(rng, n, lo=4, hi=300):
+    return {f"s{i}": tuple(int(v) for v in rng.integers(lo, hi, 2)) for i in range(n)}
+
+
+def padded_overlap(a, b, padding, atlas):
+    """True if b's rect enters a's rect plus its trailing padding (clipped to the atlas)."""
+    ax, ay, aw, ah = a
+    bx, by, bw, bh = b
+    right = min(ax + aw + padding, atlas[0])
+    bottom = min(ay + ah + padding, atlas[1])
+    return ax < bx + bw and bx < right and ay < by + bh and by < bottom
+
+
+@pytest.mark.parametrize("padding", [0, 2])
+def test_pack_has_no_overlaps_and_stays_inside(rng, padding):
+    sizes = random_sizes(rng, 120)
+    atlases, placements = maxrects.pack(sizes, max_size=1024, padding=padding)
+    assert set(placements) == set(sizes)
+
+    by_atlas = {}
+    for name, (index, x, y, w, h) in placements.items():
+        assert (w, h) == sizes[name]
+        aw, ah = atlases[index]
+        assert 0 <= x and 0 <= y and x + w <= aw and y + h <= ah
+        by_atlas.setdefault(index, []).append((x, y, w, h))
+
+    for index, rects in by_atlas.items():
+        for i, a in enumerate(rects):
+            for b in rects[i + 1:]:
+                assert not padded_overlap(a, b, padding, atlases[index])
+                assert not padded_overlap(b, a, padding, atlases[index])
+
+
+def test_atlas_sizes_are_powers_of_two(rng):
+    atlases, _ = maxrects.pack(random_sizes(rng, 40), max_size=1024)
+    for w, h in atlases:
+        assert w & (w - 1) == 0 and h & (h - 1) == 0
+        assert w <= 1024 and h <= 1024
+    assert maxrects.next_pow2(0) == 1
+    assert maxrects.next_pow2(513) == 1024
+
+
+def test_oversized_rect_raises():
+    with pytest.raises(ValueError, match="big"):
+        maxrects.pack({"big": (300, 10)}, max_size=256)
+
+
+def test_spills_into_a_second_atlas():
+    sizes = {f"q{i}": (200, 200) for i in range(5)}
+    atlases, placements = maxrects.pack(sizes, max_size=256, padding=2)
+    assert len(atlases) == 5
+    assert sorted(p[0] for p in placements.values()) == [0, 1, 2, 3, 4]
+
+    sizes = {"a": (128, 256), "b": (128, 256), "c": (64, 64)}
+    atlases, placements = maxrects.pack(sizes, max_size=256, padding=0)
+    assert atlases == [(256, 256), (64, 64)]
+    assert placements["c"][0] == 1
@@ -0,0 +1,71 @@
+import numpy as np
+
+import mesh_dedup
+
+
+def quad(offset=(0.0, 0.0, 0.0)):
+    """Two triangles of a unit quad (positions, uvs), counter-clockwise."""
+    p = np.array([[0, 0, 0], [1, 0, 0], [1, 1, 0], [0, 1, 0]], np.float64) + offset
+    uv = np.array([[0, 0], [1, 0], [1, 1], [0, 1]], np.float64)
+    tris = np.array([[0, 1, 2], [0, 2, 3]])
+    return p[tris], uv[tris]
+
+
+def test_translation_and_order_invariant():
+    positions, uvs = quad()
+    base = mesh_dedup.canonical_primitive(positions, uvs)
+
+    moved = mesh_dedup.canonical_primitive(*quad((5.0, -2.0, 3.5)))
+    assert moved["hash"] == base["hash"]
+    np.testing.assert_allclose(moved["origin"], (5.0, -2.0, 3.5))
+
+    # Triangles listed in another order, corners rotated (same winding)
+    shuffled = mesh_dedup.canonical_primitive(positions[::-1][:, [1, 2, 0]],
+                                              uvs[::-1][:, [1, 2, 0]])
+    assert shuffled["hash"] == base["hash"]
+
+
+def test_winding_and_uvs_matter():
+    positions, uvs = quad()
+    base = mesh_dedup.canonical_primitive(positions, uvs)
+    flipped = mesh_dedup.canonical_primitive(positions[:, ::-1], uvs[:, ::-1])
+    assert flipped["hash"] != base["hash"]
+    assert mesh_dedup.canonical_primitive(positions, uvs * 2)["hash"] != base["hash"]
+    assert mesh_dedup.canonical_primitive(positions)["hash"] != base["hash"]
+
+
+def triangle_set(tris):
+    """Triangles (M, 3, 3) as a set, each rotated to start at its smallest corner."""
+    out = set()
+    for t in np.round(tris, 6):
+        corners = [tuple(c) for c in t]
+        i = corners.index(min(corners))
+        out.add(tuple(corners[i:] + corners[:i]))
+    return out
+
+
+def test_canonical_buffers_rebuild_the_geometry():
+    positions, uvs = quad((1.0, 2.0, 3.0))
+    prim = mesh_dedup.canonical_primitive(positions, uvs)
+    assert prim["vertices"].shape == (4, 3) and prim["indices"].shape == (2, 3)
+    rebuilt = prim["vertices"][prim["indices"]] + prim["origin"]
+    assert triangle_set(rebuilt) == triangle_set(positions)
+    assert mesh_dedup.primitive_bytes(prim) == 4 * 12 + 4 * 8 + 2 * 12
+
+
+def test_report_groups_duplicates():
+    records = [
+        {"hash": "a", "asset": "tower-a", "object": "wall", "material": "Concrete022",
+         "triangles": 10, "bytes": 400},
+        {"hash": "a", "asset": "tower-b", "object": "wall", "material": "Concrete015",
+         "triangles": 10, "bytes": 400},
+        {"hash": "b", "asset": "tower-b", "object": "roof", "material": "Concrete028",
+         "triangles": 2, "bytes": 80},
+    ]
+    report = mesh_dedup.build_report(records)
+    assert (report["primitives"], report["unique_primitives"]) == (3, 2)
+    assert (report["bytes"], report["unique_bytes"]) == (880, 480)
+    assert report["unique_triangles"] == 12
+    [dup] = report["duplicates"]
+    assert dup["hash"] == "a" and dup["count"] == 2 and dup["wasted_bytes"] == 400
+    assert dup["assets"] == ["tower-a", "tower-b"]
@@ -0,0 +1,264 @@
+import numpy as np
+import pytest
+
+import pixel_math
+
+
+def reference_colormap(original_pixels, variant):
+    """The original per-channel loop from render_hex_tiles.py."""
+    result = original_pixels.copy()
+    rgb = result[:, :, :3].copy()
+    lum = 0.299 * rgb[:, :, 0] + 0.587 * rgb[:, :, 1] + 0.114 * rgb[:, :, 2]
+    black_mask = (original_pixels[:, :, 0] < 0.01) & \
+                 (original_pixels[:, :, 1] < 0.01) & \
+                 (original_pixels[:, :, 2] < 0.01)
+    g = pixel_math.COLORMAP_GRADES[variant]
+    for c in range(3):
+        rgb[:, :, c] = lum + g["saturation"] * (rgb[:, :, c] - lum)
+    for c in range(3):
+        rgb[:, :, c] *= g["gain"][c]
+    rgb *= g["exposure"]
+    rgb = g["mid"] + g["contrast"] * (rgb - g["mid"])
+    rgb[black_mask] = 0
+    result[:, :, :3] = np.clip(rgb, 0, 1)
+    return result
+
+
+# ---------------------------------------------------------------------------
+# Colour
+# ---------------------------------------------------------------------------
+
+def test_srgb_round_trip():
+    c = np.linspace(0, 1, 1001)
+    np.testing.assert_allclose(pixel_math.linear_to_srgb(pixel_math.srgb_to_linear(c)), c,
+                               atol=1e-9)
+
+
+@pytest.mark.parametrize("variant", sorted(pixel_math.COLORMAP_GRADES))
+def test_colormap_matches_reference(colormap_512, variant):
+    out = pixel_math.create_soviet_colormap(colormap_512, variant)
+    assert out.dtype == colormap_512.dtype
+    np.testing.assert_allclose(out, reference_colormap(colormap_512, variant), atol=1e-5)
+
+
+def test_colormap_keeps_black_and_alpha(colormap_512):
+    colormap_512[:, :, 3] = 0.5
+    out = pixel_math.create_soviet_colormap(colormap_512, "winter")
+    black = np.all(colormap_512[:, :, :3] < 0.01, axis=2)
+    assert black.any()
+    assert not out[black, :3].any()
+    np.testing.assert_array_equal(out[:, :, 3], colormap_512[:, :, 3])
+    assert out.min() >= 0 and out.max() <= 1
+
+
+def test_colormap_unknown_variant_only_clamps(rng):
+    pixels = rng.random((8, 8, 4), dtype=np.float32) * 1.5
+    out = pixel_math.create_soviet_colormap(pixels, "spring")
+    np.testing.assert_array_equal(out[:, :, :3], np.clip(pixels[:, :, :3], 0, 1))
+
+
+def test_month_keyframes_match_seasons():
+    months = pixel_math.grades_for(["month-01", "month-04", "month-07", "month-10"])
+    seasons = pixel_math.grades_for(["winter", "mud", "summer", "mud"])
+    for field in pixel_math.GRADE_FIELDS:
+        np.testing.assert_allclose(months[field], seasons[field], rtol=1e-6)
+
+
+def test_grades_interpolate_and_wrap():
+    winter, mud = (pixel_math.COLORMAP_GRADES[s] for s in ("winter", "mud"))
+    march = pixel_math.grades_for(["month-03"])
+    assert march["exposure"][0] == pytest.approx((winter["exposure"] + mud["exposure"]) / 2)
+    np.testing.assert_allclose(march["gain"][0],
+                               (np.add(winter["gain"], mud["gain"])) / 2, rtol=1e-6)
+    # 1 January sits between the December and February winter keyframes
+    for field, values in pixel_math.grades_at([0.0, 1.0]).items():
+        np.testing.assert_allclose(values, [winter[field]] * 2, rtol=1e-6)
+
+
+def test_grade_colormaps_batches_variants(colormap_512):
+    names = ["winter", "month-03", "spring"]
+    batch = pixel_math.grade_colormaps(colormap_512, pixel_math.grades_for(names))
+    assert batch.shape == (3,) + colormap_512.shape
+    assert batch.dtype == np.float32
+    for i, name in enumerate(names):
+        np.testing.assert_array_equal(batch[i], pixel_math.create_soviet_colormap(colormap_512, name))
+
+
+# ---------------------------------------------------------------------------
+# Crop + anchor
+# ---------------------------------------------------------------------------
+
+def test_content_bbox_empty():
+    assert pixel_math.content_bbox(np.zeros((4, 4))) is None
+
+
+def test_content_bbox_threshold():
+    alpha = np.zeros((10, 12))
+    alpha[2, 3] = 0.5
+    alpha[7, 9] = 0.005  # below threshold
+    assert pixel_math.content_bbox(alpha) == (2, 2, 3, 3)
+
+
+def test_crop_rebases_anchor():
+    h, w = 40, 30
+    pixels = np.zeros((h, w, 4), np.float32)
+    pixels[10:20, 5:15, 3] = 1.0
+    # Mark the anchor texel; anchors are PNG coords (top-down), buffer is bottom-up
+    anchor_x, anchor_y = 8, 25
+    pixels[h - 1 - anchor_y, anchor_x, 0] = 0.75
+
+    cropped, ax, ay = pixel_math.crop_to_content(pixels, anchor_x, anchor_y, pad=2)
+    assert cropped.shape[:2] == (14, 14)
+    assert cropped[cropped.shape[0] - 1 - ay, ax, 0] == 0.75
+
+
+def test_crop_pad_clamps_at_frame_edge():
+    pixels = np.zeros((8, 8, 4), np.float32)
+    pixels[0, 0, 3] = 1.0
+    cropped, ax, ay = pixel_math.crop_to_content(pixels, 0, 7, pad=2)
+    assert cropped.shape[:2] == (3, 3)
+    assert (ax, ay) == (0, 2)
+
+
+def test_crop_fully_transparent_is_untouched():
+    pixels = np.zeros((5, 6, 4), np.float32)
+    cropped, ax, ay = pixel_math.crop_to_content(pixels, 3, 2)
+    assert cropped is pixels
+    assert (ax, ay) == (3, 2)
+
+
+# ---------------------------------------------------------------------------
+# Projection
+# ---------------------------------------------------------------------------
+
+def test_projected_extent_translated_camera():
+    world_co = np.array([[0, 0, 0], [4, 2, 9], [1, -2, 3]], dtype=np.float64)
+    world_to_camera = np.eye(4)
+    world_to_camera[:2, 3] = (-1, 0.5)
+    width, height, center = pixel_math.projected_extent(world_co, world_to_camera)
+    assert (width, height) == (4, 4)
+    np.testing.assert_allclose(center, (1, 0.5))
+
+
+def test_project_to_pixels_and_region():
+    # NDC = world x/y for an identity matrix: [-1, 1] spans the frame
+    world_co = np.array([[-0.5, -0.5, 0], [0.5, 0.25, 0]])
+    px, py = pixel_math.project_to_pixels(world_co, np.eye(4), 200, 100)
+    np.testing.assert_allclose(px, (50, 150))
+    np.testing.assert_allclose(py, (25, 62.5))
+
+    assert pixel_math.silhouette_region(px, py, 200, 100, reach=0.75, pad=2) == (47, 153, 22, 66)
+    # Clamped to the frame
+    assert pixel_math.silhouette_region(px, py, 140, 60, reach=0.75, pad=30) == (19, 140, 0, 60)
+
+
+def box_coverage(res_x, res_y, lo, hi):
+    """Antialiased RGBA frame (Blender rows) of the rectangle lo..hi in pixel space."""
+    def axis(n, a, b):
+        edges = np.arange(n + 1, dtype=np.float64)
+        return np.clip(np.minimum(edges[1:], b) - np.maximum(edges[:-1], a), 0, 1)
+    alpha = np.outer(axis(res_y, lo[1], hi[1]), axis(res_x, lo[0], hi[0]))
+    return np.concatenate([np.ones((res_y, res_x, 3)), alpha[:, :, None]], axis=2)
+
+
+def content_origin(pixels):
+    """PNG-space (x, y) of the top-left visible pixel of a Blender-row buffer."""
+    rmin, rmax, cmin, _ = pixel_math.content_bbox(pixels[::-1, :, 3])
+    return cmin, rmin
+
+
+@pytest.mark.parametrize("lo,hi", [
+    ((40.3, 20.6), (121.8, 77.2)),
+    ((60.0, 30.0), (90.0, 50.0)),    # edges on pixel boundaries
+    ((0.4, 3.1), (55.5, 79.9)),      # region clamped by the frame
+])
+def test_border_region_matches_trimmed_crop(lo, hi):
+    res_x, res_y, pad = 160, 80, 2
+    frame = box_coverage(res_x, res_y, lo, hi)
+    px, py = np.array([lo[0], hi[0]]), np.array([lo[1], hi[1]])
+    # Base centre of the footprint, in full-frame PNG coordinates
+    anchor_x = round((lo[0] + hi[0]) / 2)
+    anchor_y = round(res_y - lo[1])
+
+    # --no-border: render everything, trim afterwards
+    trimmed, tx, ty = pixel_math.crop_to_content(frame, anchor_x, anchor_y, pad=pad)
+
+    # Border: render only the region (Blender's crop-to-border output)
+    region = pixel_math.silhouette_region(px, py, res_x, res_y, reach=0.75, pad=pad)
+    x0, x1, y0, y1 = region
+    rendered = frame[y0:y1, x0:x1]
+    bx, by, w, h = pixel_math.crop_to_region(anchor_x, anchor_y, region, res_y)
+    assert rendered.shape[:2] == (h, w)
+    np.testing.assert_allclose(rendered[:, :, 3].sum(), frame[:, :, 3].sum())
+
+    # Same anchor relative to the content in both outputs ...
+    (tcx, tcy), (bcx, bcy) = content_origin(trimmed), content_origin(rendered)
+    assert (tx - tcx, ty - tcy) == (bx - bcx, by - bcy)
+    # ... and the border output is at most a pixel larger per edge
+    assert 0 <= w - trimmed.shape[1] <= 2
+    assert 0 <= h - trimmed.shape[0] <= 2
+
+
+# ---------------------------------------------------------------------------
+# Recolour
+# ---------------------------------------------------------------------------
+
+def test_recolor_from_passes_samples_colormap():
+    colormap = np.zeros((4, 4, 4), np.float32)
+    colormap[1, 2, :3] = (1.0, 0.5, 0.0)   # row 1 (v), column 2 (u)
+    alpha = np.full((3, 3), 0.5, np.float32)
+    diffuse = np.full((3, 3, 4), 0.5, np.float32)
+    glossy = np.full((3, 3, 4), 0.1, np.float32)
+    uv = np.zeros((3, 3, 4), np.float32)
+    uv[:, :, 0] = 2.5 / 4 * 0.5  # coverage-weighted u
+    uv[:, :, 1] = 1.5 / 4 * 0.5
+
+    out = pixel_math.recolor_from_passes(diffuse, glossy, uv, alpha, colormap)
+    # Specular is added untinted, not multiplied by the swatch
+    expected = 0.5 * pixel_math.srgb_to_linear(np.array([1.0, 0.5, 0.0])) + 0.1
+    np.testing.assert_allclose(out[1, 1, :3], expected, rtol=1e-6)
+    np.testing.assert_array_equal(out[:, :, 3], alpha)
+
+
+def test_recolor_erodes_blended_uvs():
+    # Two faces on swatches 0 and 2 of a 1x4 colormap, with an
+    # antialiased column between them whose averaged UV lands on swatch 1
+    colormap = np.zeros((1, 4, 4), np.float32)
+    colormap[0, :, :3] = [(1, 0, 0), (0, 1, 0), (0, 0, 1), (1, 1, 1)]
+    u = np.array([0.125] * 3 + [0.375] + [0.625] * 3, np.float32)
+    uv = np.zeros((5, 7, 4), np.float32)
+    uv[:, :, 0] = u
+    alpha = np.ones((5, 7), np.float32)
+    light = np.ones((5, 7, 4), np.float32)
+
+    out = pixel_math.recolor_from_passes(light, np.zeros_like(light), uv, alpha, colormap)
+    green = np.all(np.isclose(out[:, :, :3], (0, 1, 0)), axis=2)
+    assert not green.any()
+    np.testing.assert_allclose(out[:, :3, :3], np.broadcast_to((1, 0, 0), (5, 3, 3)))
+    np.testing.assert_allclose(out[:, 4:, :3], np.broadcast_to((0, 0, 1), (5, 3, 3)))
+
+
+def test_pure_texels_keep_lines_and_silhouettes():
+    cells = np.full((5, 5), -1)
+    cells[1:4, 1:4] = 7
+    cells[2, 1:4] = 3   # a one-pixel line through the face
+    pure = pixel_math.pure_texels(cells)
+    np.testing.assert_array_equal(pure, cells >= 0)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+
+def test_psnr_known_mse():
+    a = np.zeros((10, 10))
+    assert pixel_math.psnr(a, a) == float("inf")
+    assert pixel_math.psnr(a + 0.1, a) == pytest.approx(20.0)
+
+
+def test_ssim_orders_noise(rng):
+    clean = rng.random((64, 64, 4))
+    slight = clean + rng.normal(0, 0.01, clean.shape)
+    heavy = clean + rng.normal(0, 0.1, clean.shape)
+    assert pixel_math.ssim(clean, clean) == pytest.approx(1.0)
+    assert 1.0 > pixel_math.ssim(slight, clean) > pixel_math.ssim(heavy, clean)
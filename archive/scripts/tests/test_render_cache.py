@@ -0,0 +1,36 @@
+import render_cache
+
+PARAMS = {"ppu": 80, "padding": 4, "engine": "CYCLES", "samples": 64}
+
+
+def test_cache_key_is_stable(tmp_path):
+    glb = tmp_path / "school.glb"
+    glb.write_bytes(b"glTF" + bytes(64))
+    reordered = dict(reversed(list(PARAMS.items())))
+    assert render_cache.cache_key(glb, PARAMS) == render_cache.cache_key(glb, reordered)
+
+
+def test_cache_key_changes_with_params_and_source(tmp_path):
+    glb = tmp_path / "school.glb"
+    glb.write_bytes(b"glTF" + bytes(64))
+    key = render_cache.cache_key(glb, PARAMS)
+    assert render_cache.cache_key(glb, {**PARAMS, "samples": 128}) != key
+    glb.write_bytes(b"glTF" + bytes(65))
+    assert render_cache.cache_key(glb, PARAMS) != key
+
+
+def test_store_then_fetch_needs_every_extra(tmp_path):
+    cache = tmp_path / "cache"
+    out = tmp_path / "school.png"
+    out.write_bytes(b"png@2x")
+    (tmp_path / "school@1x.png").write_bytes(b"png@1x")
+    render_cache.store(cache, "ab" * 32, out, {"width": 10},
+                       extras={"@1x": tmp_path / "school@1x.png"})
+
+    dest = tmp_path / "out" / "school.png"
+    assert render_cache.fetch(cache, "ab" * 32, dest,
+                              extras={"@1x": dest.with_name("school@1x.png")}) == {"width": 10}
+    assert dest.read_bytes() == b"png@2x"
+    assert dest.with_name("school@1x.png").read_bytes() == b"png@1x"
+    assert render_cache.fetch(cache, "ab" * 32, dest, extras={"@3x": dest}) is None
+    assert render_cache.fetch(cache, "cd" * 32, dest) is None
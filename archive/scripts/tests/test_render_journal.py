@@ -0,0 +1,48 @@
+import render_journal
+
+
+def entry(densities=("1", "2", "3")):
+    return {"sprite": "sprites/soviet/school.png", "width": 10,
+            "densities": {d: {"width": 10} for d in densities}}
+
+
+def test_journal_lives_under_cache(tmp_path):
+    path = render_journal.journal_path(tmp_path / "app" / "public" / "sprites" / "soviet")
+    assert path.parent == render_journal.JOURNAL_DIR
+    assert "public" not in path.parts
+
+
+def test_resumable_needs_every_density_file(tmp_path):
+    journal = tmp_path / "j.jsonl"
+    out = tmp_path / "school.png"
+    render_journal.append(journal, "school", "h1", out, entry())
+    for name in ("school.png", "school@3x.png"):
+        (tmp_path / name).write_bytes(b"png")
+
+    records = render_journal.load(journal)
+    # Killed before the @1x variant was written
+    assert render_journal.resumable(records, "school", "h1") is None
+    (tmp_path / "school@1x.png").write_bytes(b"png")
+    assert render_journal.resumable(records, "school", "h1") == entry()
+    assert render_journal.resumable(records, "school", "h2") is None
+
+
+def test_draft_entries_need_only_the_base_png(tmp_path):
+    journal = tmp_path / "j.jsonl"
+    out = tmp_path / "school.png"
+    out.write_bytes(b"png")
+    draft = {"sprite": "sprites/soviet/school.png", "draft": True}
+    render_journal.append(journal, "school", "h1", out, draft)
+    assert render_journal.resumable(render_journal.load(journal), "school", "h1") == draft
+
+
+def test_load_ignores_a_torn_final_line(tmp_path):
+    journal = tmp_path / "j.jsonl"
+    out = tmp_path / "school.png"
+    render_journal.append(journal, "school", "h1", out, entry())
+    with open(journal, "a") as f:
+        f.write('{"key": "kiosk", "input_ha')  # killed mid-write
+
+    records = render_journal.load(journal)
+    assert set(records) == {"school"}
+    assert records["school"]["input_hash"] == "h1"
@@ -0,0 +1,62 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import sprite_densities as sd
+
+
+@pytest.mark.parametrize("n_src,scale", [(9, 1 / 3), (10, 2 / 3), (7, 0.5)])
+def test_area_weights_conserve_coverage(n_src, scale):
+    w = sd.area_weights(n_src, scale)
+    # Every source pixel is spread over the output exactly once
+    np.testing.assert_allclose(w.sum(axis=0), scale, rtol=1e-6)
+    # Full output pixels average; only the last may hang past the edge
+    np.testing.assert_allclose(w.sum(axis=1)[:-1], 1.0, rtol=1e-6)
+
+
+def test_downsample_ignores_colour_under_transparency():
+    pixels = np.zeros((6, 6, 4), np.float32)
+    pixels[:, :, :3] = (1.0, 0.0, 0.0)     # red, but invisible
+    pixels[:, 3:, :] = (0.2, 0.4, 0.6, 1.0)
+    out = sd.downsample(pixels, 1 / 2)
+    assert out.shape == (3, 3, 4)
+    np.testing.assert_allclose(out[:, 0, 3], 0.0, atol=1e-6)
+    # The edge column is half covered, with no red bleeding in
+    np.testing.assert_allclose(out[:, 1], [(0.2, 0.4, 0.6, 0.5)] * 3, atol=1e-5)
+
+
+def test_derive_scales_anchor_and_size():
+    pixels = np.zeros((90, 61, 4), np.float32)
+    pixels[..., 3] = 1.0
+    variant, ax, ay = sd.derive(pixels, 30, 80, 2)
+    assert variant.shape[:2] == (60, 41)
+    assert (ax, ay) == (20, 53)
+    variant, ax, ay = sd.derive(pixels, 30, 80, 1)
+    assert variant.shape[:2] == (30, 21)
+    assert (ax, ay) == (10, 26)
+
+
+def test_variant_path():
+    assert sd.variant_path("a/school.png", sd.BASE_DENSITY) == Path("a/school.png")
+    assert sd.variant_path("a/school.png", 1) == Path("a/school@1x.png")
+
+
+def test_remove_variants(tmp_path):
+    base = tmp_path / "school.png"
+    for d in sd.DENSITIES:
+        sd.variant_path(base, d).write_bytes(b"png")
+    sd.remove_variants(base)
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["school.png"]
+    sd.remove_variants(base)  # nothing left to remove
+
+
+def test_with_density_paths():
+    entry = {"sprite": "sprites/soviet/school.png",
+             "densities": {"1": {"width": 10}, "2": {"width": 20}}}
+    out = sd.with_density_paths(entry, 80)
+    assert out["densities"]["1"] == {"sprite": "sprites/soviet/school@1x.png",
+                                     "width": 10, "pixels_per_unit": 40}
+    assert out["densities"]["2"]["sprite"] == "sprites/soviet/school.png"
+    assert sd.with_density_paths({"sprite": "x.png", "draft": True}, 80) == \
+        {"sprite": "x.png", "draft": True}